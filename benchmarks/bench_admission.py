@@ -0,0 +1,91 @@
+"""주문 처리 입장 제한 시뮬레이션
+
+    python benchmarks/bench_admission.py [--buyers 300] [--seconds 10] [--duration 3.8]
+                                         [--max-active 50] [--max-queue 200]
+
+seconds 초 동안 구매자 buyers 명이 고르게 "주문하기" 를 누르고, 입장한 주문 처리는
+duration 초(CHECKOUT_PROFILE "fast" 의 연출 시간) 동안 자리를 차지한다고 보고
+AdmissionController 를 가상 시계로 돌린다. 대기 중인 세션은 CHECKOUT_TICK 마다
+poll 한다. 제한 없음(무제한)과 비교해 동시 진행 수 최대값, 바로 입장 / 대기 / 거절
+수, 대기 시간 분포를 출력하고, acquire / poll 한 번에 드는 실제 시간도 잰다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_load import summarize  # noqa: E402
+from universe_store.rate_limit import ADMITTED, QUEUED, AdmissionController  # noqa: E402
+
+TICK = 0.5
+
+
+def simulate(args, max_active, max_queue):
+    controller = AdmissionController(max_active, max_queue, 1 / 20, 3, lease_ttl=30)
+    arrivals = [i * args.seconds / args.buyers for i in range(args.buyers)]
+    waiting = {}  # ticket -> 누른 시각
+    running = {}  # ticket -> 끝나는 시각
+    waits, calls, spent = [], 0, 0.0
+    outcome = {"immediate": 0, "queued": 0, "rejected": 0}
+    peak, now, i = 0, 0.0, 0
+    while i < len(arrivals) or waiting or running:
+        for ticket, ends in list(running.items()):
+            if ends <= now:
+                del running[ticket]
+                controller.release(ticket, now=now)
+        while i < len(arrivals) and arrivals[i] <= now:
+            ticket = f"buyer-{i}"
+            began = time.perf_counter()
+            result, _ = controller.acquire(ticket, ticket, now=now)
+            spent += time.perf_counter() - began
+            calls += 1
+            if result == ADMITTED:
+                outcome["immediate"] += 1
+                running[ticket] = now + args.duration
+                waits.append(0.0)
+            elif result == QUEUED:
+                outcome["queued"] += 1
+                waiting[ticket] = arrivals[i]
+            else:
+                outcome["rejected"] += 1
+            i += 1
+        for ticket, pressed in list(waiting.items()):
+            began = time.perf_counter()
+            result, _ = controller.poll(ticket, now=now)
+            spent += time.perf_counter() - began
+            calls += 1
+            if result == ADMITTED:
+                del waiting[ticket]
+                running[ticket] = now + args.duration
+                waits.append(now - pressed)
+        peak = max(peak, len(running))
+        now += TICK
+    return {"peak_active": peak, **outcome, "wait": summarize(waits), "call_us": spent / calls * 1e6,
+            "finished_at": now}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--buyers", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=3.8)
+    parser.add_argument("--max-active", type=int, default=50)
+    parser.add_argument("--max-queue", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.buyers} buyers over {args.seconds}s, checkout holds a slot for {args.duration}s")
+    print(f"{'limit':<14}{'peak':>6}{'now':>6}{'queued':>8}{'rejected':>10}"
+          f"{'wait p50':>10}{'wait p95':>10}{'wait max':>10}{'call µs':>9}")
+    for name, max_active, max_queue in [("unlimited", args.buyers, 0),
+                                        (f"{args.max_active}/{args.max_queue}", args.max_active, args.max_queue)]:
+        r = simulate(args, max_active, max_queue)
+        w = r["wait"]
+        print(f"{name:<14}{r['peak_active']:>6}{r['immediate']:>6}{r['queued']:>8}{r['rejected']:>10}"
+              f"{w['p50_ms'] / 1000:>9.1f}s{w['p95_ms'] / 1000:>9.1f}s{w['max_ms'] / 1000:>9.1f}s{r['call_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
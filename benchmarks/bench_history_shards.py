@@ -0,0 +1,104 @@
+"""주문 내역 한 페이지 비용: 전체 저장소에서 고객 주문 찾기 vs 고객별 샤드
+
+    python benchmarks/bench_history_shards.py [--sizes 10000 100000] [--customers 5000]
+                                              [--page-size 20] [--viewers 200] [--shards 16]
+
+전체 주문 size 건을 고객 customers 명에게 고르게 나눠 저장소(SQLite)와 고객별
+샤드에 넣고, 고객 한 명이 주문 내역을 열 때 드는 시간을 잰다.
+
+  global  저장소 전체를 읽으며 그 고객의 주문을 골라냄 (샤드 전 구조에서 고객 주문만
+          보여 주려면 필요한 일. 전체 주문 수에 비례)
+  shard   디렉터리 색인으로 샤드를 찾아 주문 수 + 한 페이지 (고객 주문 수에만 비례)
+
+운영자 조회(전체 최근 주문 한 페이지, 샤드별 통계)는 샤드를 스레드 1개로 차례로
+읽을 때와 여러 스레드로 동시에 읽을 때를 비교한다.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_load import git_commit, make_order, summarize  # noqa: E402
+from universe_store.customer_shards import CustomerShards  # noqa: E402
+from universe_store.order_store import SqliteOrderStore  # noqa: E402
+
+
+def seed(store, shards, size, customers):
+    start = datetime.now() - timedelta(days=30)
+    step = timedelta(days=29) / max(size, 1)
+    batch = []
+    for i in range(size):
+        order = make_order(i, start + step * i)
+        order["customer"] = f"cid:{i % customers:06d}"
+        batch.append(order)
+        if len(batch) == 5000:
+            store.append_many(batch)
+            shards.append_many(batch)
+            batch = []
+    if batch:
+        store.append_many(batch)
+        shards.append_many(batch)
+
+
+def global_lookup(store, customer, page_size):
+    mine = [order for order in store.iter_orders() if order.customer == customer]
+    return len(mine), mine[::-1][:page_size]
+
+
+def shard_lookup(shards, customer, page_size):
+    return shards.count(customer), shards.page(customer, page_size)[0]
+
+
+def timed(fn, *args):
+    began = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - began
+
+
+def run(size, args):
+    rng = random.Random(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteOrderStore(os.path.join(tmp, "orders_history.db"), fsync=False)
+        shards = CustomerShards(os.path.join(tmp, "orders_by_customer"), shard_count=args.shards,
+                                workers=args.shards, fsync=False)
+        seed(store, shards, size, args.customers)
+        viewers = [f"cid:{rng.randrange(args.customers):06d}" for _ in range(args.viewers)]
+        result = {
+            # 전체 읽기는 느리므로 고객 몇 명만
+            "global": summarize([timed(global_lookup, store, v, args.page_size) for v in viewers[:5]]),
+            "shard": summarize([timed(shard_lookup, shards, v, args.page_size) for v in viewers]),
+        }
+        sequential = CustomerShards(shards.directory, shard_count=args.shards, workers=1, fsync=False)
+        for name, target in [("fan-out x1", sequential), (f"fan-out x{args.shards}", shards)]:
+            target.recent(args.page_size)  # 연결 열기
+            result[f"{name} recent"] = summarize([timed(target.recent, args.page_size) for _ in range(20)])
+            result[f"{name} stats"] = summarize([timed(target.stats) for _ in range(20)])
+        sequential.close()
+        shards.close()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--viewers", type=int, default=200)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{args.customers} customers, page {args.page_size}, {args.shards} shards · commit {git_commit()}")
+    print(f"{'orders':>8}  {'case':<20}{'p50 ms':>10}{'p95 ms':>10}")
+    for size in args.sizes:
+        for name, stats in run(size, args).items():
+            print(f"{size:>8}  {name:<20}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""주문 저장/조회/주문내역 렌더링/주문하기 부하 테스트
+
+    python benchmarks/bench_load.py [--sizes 1000 10000 100000] [--backend sqlite]
+                                    [--sessions 50] [--concurrency 8] [--json out.json]
+
+저장된 주문 수(sizes)마다 임시 디렉터리에 주문을 채워 넣고 다음을 잰다.
+
+  save_order      writer 스레드 여러 개가 동시에 저장소에 주문 추가
+  customer_shards 저장소로 고객 샤드 채우기 (처음 켤 때) / 고객 주문 내역 한 페이지 읽기
+  history_render  AppTest 로 주문내역 페이지 전체 실행 (seed 주문의 고객으로 접속)
+  checkout        AppTest 세션 N 개가 프로세스 여러 개에서 동시에 주문하기
+                  (지연 없음, 텔레그램은 로컬 스텁)
+
+각 항목의 p50/p95/p99 (ms) 와 처리량(ops/s) 을 출력하고, --json 을 주면 커밋
+해시와 함께 JSON 으로 저장해서 커밋 간 비교에 쓸 수 있다.
+미리 채우는 주문은 모두 벤치마크 세션의 고객(CUSTOMER) 주문이다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from universe_store.customer_shards import CustomerShards  # noqa: E402
+from universe_store.order_store import JsonlOrderStore, SqliteOrderStore  # noqa: E402
+from telegram_stub import TelegramStub  # noqa: E402
+
+CUSTOMER = "bench"
+PAGE_SIZE = 10  # 주문 내역 페이지 기본 크기 (settings.PAGE_SIZE. settings 는 앱 밖에서 못 읽음)
+
+
+def summarize(samples, elapsed=None):
+    samples = sorted(samples)
+    n = len(samples)
+
+    def pct(p):
+        return samples[min(n - 1, int(round(p / 100 * (n - 1))))] * 1000
+
+    result = {
+        "n": n,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": samples[-1] * 1000,
+    }
+    if elapsed:
+        result["ops_per_sec"] = n / elapsed
+    return result
+
+
+def make_order(i, date, status="배송 완료 ✨"):
+    return {
+        "order_num": f"UNIVERSE-LOAD{i:010d}", "item": "미리 감사", "address": "서울시 우주구",
+        "delivery_request": "없음", "state": "평온한 확신", "price": "50,000,000원",
+        "price_krw": 50000000, "date": date.strftime("%Y-%m-%d %H:%M:%S"), "status": status,
+        "customer": f"cid:{CUSTOMER}",
+    }
+
+
+def open_store(backend):
+    if backend == "jsonl":
+        return JsonlOrderStore("orders_history.jsonl")
+    return SqliteOrderStore("orders_history.db")
+
+
+def seed(store, size):
+    start = datetime.now() - timedelta(days=30)
+    step = timedelta(days=29) / max(size, 1)
+    batch = []
+    for i in range(size):
+        batch.append(make_order(i, start + step * i))
+        if len(batch) == 5000:
+            store.append_many(batch)
+            batch = []
+    if batch:
+        store.append_many(batch)
+
+
+# ==========================================
+# 측정 항목
+# ==========================================
+def bench_save(backend, writers, per_writer):
+    latencies = []
+    lock = threading.Lock()
+
+    def writer(w):
+        store = open_store(backend)
+        local = []
+        for i in range(per_writer):
+            order = make_order(10_000_000 + w * per_writer + i, datetime.now(), "배송 중 🚀")
+            t = time.perf_counter()
+            store.append(order)
+            local.append(time.perf_counter() - t)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def bench_shards(store, repeat):
+    # 앱과 같은 경로 (get_customer_shards 의 backfill, load_customer_page 의 page)
+    backfill, page = [], []
+    for _ in range(repeat):
+        shutil.rmtree("bench_shards", ignore_errors=True)
+        shards = CustomerShards("bench_shards", fsync=False)
+        t = time.perf_counter()
+        shards.backfill(store.iter_orders())
+        backfill.append(time.perf_counter() - t)
+        for _ in range(repeat):
+            t = time.perf_counter()
+            orders, _ = shards.page(f"cid:{CUSTOMER}", PAGE_SIZE)
+            page.append(time.perf_counter() - t)
+        shards.close()
+    assert len(orders) == min(store.count(), PAGE_SIZE), len(orders)
+    return {"backfill": summarize(backfill), "page": summarize(page)}
+
+
+def make_app(stub_url):
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=120)
+    at.secrets["TELEGRAM_TOKEN"] = "bench"
+    at.secrets["CHAT_ID"] = "0"
+    at.secrets["CHECKOUT_PROFILE"] = "instant"
+    at.secrets["TELEGRAM_API_URL"] = stub_url
+    return at
+
+
+def bench_history(stub_url, backend, repeat, size):
+    at = make_app(stub_url)
+    at.secrets["ORDER_BACKEND"] = backend
+    at.query_params["cid"] = CUSTOMER
+    at.run()
+    at.switch_page("universe_store/pages/history.py").run()
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t)
+    # 빈 페이지("아직 주문 내역이 없습니다")를 재지 않도록 실제로 그린 주문 수 확인
+    rows = [m for m in at.markdown if m.value.startswith("📦")]
+    assert f"**총 {size}개의 주문**" in [m.value for m in at.markdown], "seed 주문이 주문 내역에 없음"
+    assert len(rows) == min(size, PAGE_SIZE), len(rows)
+    return summarize(samples)
+
+
+def _checkout_worker(stub_url, backend, sessions, results):
+    # AppTest 는 st.secrets 등 전역 상태를 쓰므로 세션 동시 실행은 프로세스 단위로
+    samples = []
+    try:
+        for _ in range(sessions):
+            at = make_app(stub_url)
+            at.secrets["ORDER_BACKEND"] = backend
+            at.run()
+            at.switch_page("universe_store/pages/order.py").run()
+            at.text_input[0].set_value("서울시 우주구").run()
+            at.checkbox[0].check().run()
+            button = next(b for b in at.button if "주문하기" in b.label)
+            t = time.perf_counter()
+            button.click().run()
+            samples.append(time.perf_counter() - t)
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+    finally:
+        results.put(samples)
+
+
+def bench_checkout(stub_url, backend, sessions, concurrency):
+    per_worker = max(1, sessions // concurrency)
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_checkout_worker, args=(stub_url, backend, per_worker, results))
+               for _ in range(concurrency)]
+    for w in workers:
+        w.start()
+    per_worker_samples = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+    # 처리량: 세션 준비(앱 첫 실행 등)를 뺀 "주문하기" 클릭 구간 기준
+    samples = [s for ws in per_worker_samples for s in ws]
+    return summarize(samples, max(sum(ws) for ws in per_worker_samples))
+
+
+# ==========================================
+# 실행
+# ==========================================
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backend", choices=["sqlite", "jsonl"], default="sqlite")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--per-writer", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--json")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    stub = TelegramStub().start()
+    report = {"commit": git_commit(), "backend": args.backend, "time": datetime.now().isoformat(), "sizes": {}}
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            st.cache_resource.clear()
+            st.cache_data.clear()
+            store = open_store(args.backend)
+            seed(store, size)
+
+            result = {
+                "customer_shards": bench_shards(store, max(3, args.repeat // 4)),
+                "history_render": bench_history(stub.url, args.backend, args.repeat, size),
+                "save_order": bench_save(args.backend, args.writers, args.per_writer),
+                "checkout": bench_checkout(stub.url, args.backend, args.sessions, args.concurrency),
+            }
+            report["sizes"][size] = result
+            os.chdir(ROOT)
+
+        print(f"\n== {size:,} orders ({args.backend}) ==")
+        for name, stats in result.items():
+            for label, s in (stats.items() if "n" not in stats else [("", stats)]):
+                rate = f"{s['ops_per_sec']:>10,.0f} ops/s" if "ops_per_sec" in s else ""
+                print(f"  {name + (' ' + label if label else ''):<26} p50 {s['p50_ms']:9.2f}  "
+                      f"p95 {s['p95_ms']:9.2f}  p99 {s['p99_ms']:9.2f} ms  {rate}")
+
+    time.sleep(2)
+    report["telegram_stub_calls"] = stub.calls
+    stub.stop()
+    print(f"\ntelegram stub received {stub.calls} calls")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""주문번호 생성기 처리량 / 중복 검사
+
+    python benchmarks/bench_order_id.py [--per-worker 500000] [--threads 4] [--procs 4]
+
+스레드 여러 개와 프로세스 여러 개에서 동시에 ID 를 만들고, 초당 생성 수와
+전체 중복 개수를 출력한다.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe_store.order_id import OrderIdGenerator  # noqa: E402
+
+
+def _generate(gen, n, out):
+    next_int = gen.next_int
+    out.extend(next_int() for _ in range(n))
+
+
+def run_threads(gen, threads, per_worker):
+    results = [[] for _ in range(threads)]
+    workers = [threading.Thread(target=_generate, args=(gen, per_worker, results[i])) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    ids = [i for r in results for i in r]
+    return ids, elapsed
+
+
+def _process_worker(args):
+    threads, per_worker = args
+    ids, elapsed = run_threads(OrderIdGenerator(), threads, per_worker)
+    return ids, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-worker", type=int, default=500_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--procs", type=int, default=4)
+    args = parser.parse_args()
+
+    gen = OrderIdGenerator()
+    start = time.perf_counter()
+    _generate(gen, args.per_worker, [])
+    single = args.per_worker / (time.perf_counter() - start)
+    print(f"single thread   : {single:,.0f} ids/s")
+
+    ids, elapsed = run_threads(gen, args.threads, args.per_worker)
+    ordered = all(a < b for a, b in zip(ids, ids[1:args.per_worker]))
+    print(f"{args.threads} threads       : {len(ids) / elapsed:,.0f} ids/s, "
+          f"duplicates={len(ids) - len(set(ids))}, per-thread monotonic={ordered}")
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.procs) as pool:
+        results = pool.map(_process_worker, [(args.threads, args.per_worker)] * args.procs)
+    elapsed = time.perf_counter() - start
+    all_ids = [i for ids, _ in results for i in ids]
+    inner = sum(len(ids) / t for ids, t in results)
+    print(f"{args.procs} procs x {args.threads} thr : {inner:,.0f} ids/s (in-process sum), "
+          f"{len(all_ids) / elapsed:,.0f} ids/s wall, duplicates={len(all_ids) - len(set(all_ids))}")
+
+
+if __name__ == "__main__":
+    main()
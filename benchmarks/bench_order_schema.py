@@ -0,0 +1,122 @@
+"""주문 레코드 버전 1 (dict + 문자열) vs 버전 2 (Order, epoch 초 / 정수 / 상태 코드)
+
+    python benchmarks/bench_order_schema.py [--orders 100000] [--repeat 3]
+
+주문 orders 건을 버전 1 / 버전 2 JSONL 로 만들어
+  - 한 건당 저장 크기
+  - 파싱 시간: 버전 1 은 json.loads + 주문일 strptime (예전 history_rows 경로),
+    버전 1 을 Order 로 읽기, 버전 2 를 Order 로 읽기 (decode_order)
+  - 메모리: 전부 읽어 리스트로 들고 있을 때 한 건당 바이트 (tracemalloc)
+  - migrate: orders_history.json 배열을 스트리밍으로 바꿀 때 시간과 최대 메모리
+를 출력한다. 파싱 시간은 repeat 번 중 가장 빠른 값.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_load import git_commit, make_order  # noqa: E402
+from universe_store.order_record import (DATE_FORMAT, STATUS_DELIVERED, STATUS_SHIPPING,  # noqa: E402
+                                         decode_order, encode_order, migrate_json_file)
+
+
+def make_orders(n):
+    start = datetime(2025, 1, 1)
+    orders = []
+    for i in range(n):
+        status = STATUS_SHIPPING if i % 10 == 0 else STATUS_DELIVERED
+        orders.append(make_order(i, start + timedelta(seconds=i * 37), status))
+    return orders
+
+
+def best_of(repeat, fn, lines):
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn(lines)
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def parse_v1_dict(lines):
+    for line in lines:
+        order = json.loads(line)
+        datetime.strptime(order["date"], DATE_FORMAT)
+
+
+def parse_orders(lines):
+    for line in lines:
+        decode_order(line).ts
+
+
+def memory_per_order(lines, load):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    held = [load(line) for line in lines]
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used / len(held)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders)
+    v1 = [json.dumps(o, ensure_ascii=False) for o in orders]
+    v2 = [encode_order(o) for o in orders]
+    n = args.orders
+    print(f"{n} orders · commit {git_commit()}")
+
+    size1 = sum(len(line.encode()) + 1 for line in v1)
+    size2 = sum(len(line.encode()) + 1 for line in v2)
+    print(f"{'bytes/order':<28}{'v1':>10}{'v2':>10}")
+    print(f"{'':<28}{size1 / n:>10.0f}{size2 / n:>10.0f}   ({1 - size2 / size1:.0%} smaller)")
+
+    print(f"\n{'parse':<28}{'total s':>10}{'µs/order':>10}")
+    results = [
+        ("v1 json.loads + strptime", best_of(args.repeat, parse_v1_dict, v1)),
+        ("v1 -> Order", best_of(args.repeat, parse_orders, v1)),
+        ("v2 -> Order", best_of(args.repeat, parse_orders, v2)),
+    ]
+    for name, elapsed in results:
+        print(f"{name:<28}{elapsed:>10.3f}{elapsed / n * 1e6:>10.2f}")
+    print(f"v2 vs v1 dict: {results[0][1] / results[2][1]:.1f}x faster")
+
+    print(f"\n{'memory (held list)':<28}{'B/order':>10}")
+    mem1 = memory_per_order(v1, json.loads)
+    mem2 = memory_per_order(v2, decode_order)
+    print(f"{'v1 dict':<28}{mem1:>10.0f}")
+    print(f"{'v2 Order':<28}{mem2:>10.0f}   ({1 - mem2 / mem1:.0%} less)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders_history.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(orders, f, ensure_ascii=False, indent=2)
+        size_v1 = os.path.getsize(path)
+        del orders, v1, v2
+        began = time.perf_counter()
+        count = migrate_json_file(path)
+        elapsed = time.perf_counter() - began
+        # 메모리는 tracemalloc 이 느리게 만들어 시간과 따로 한 번 더 잰다
+        os.replace(path + ".v1", path)
+        tracemalloc.start()
+        migrate_json_file(path, backup=False)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"\nmigrate {count} orders: {elapsed:.2f}s, peak {peak / 1024:.0f} KiB "
+              f"({size_v1 / 1024 / 1024:.1f} -> {os.path.getsize(path) / 1024 / 1024:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""버튼 클릭 한 번당 스크립트 실행 시간: 앱 전체 재실행 vs fragment 재실행
+
+    python benchmarks/bench_reruns.py [--repeat 20] [--orders 200] [--in-flight 5] [--json out.json]
+
+fragment 도입 전에는 "장바구니 담기", "삭제", "상세 보기" 를 누를 때마다 main.py
+전체가 다시 실행됐다 (full). 지금은 해당 fragment 만 다시 실행된다 (fragment).
+AppTest 는 클릭 시 항상 앱 전체를 실행하므로, full 은 그 실행 시간을 재고
+fragment 는 같은 실행 안에서 timed_region 이 기록한 해당 영역 실행 시간을 쓴다.
+"history: 배송 추적 갱신" 은 주문내역 한 페이지(50건, 그중 배송 중 in-flight 건)를
+새로고침할 때(full)와 실시간 추적 fragment 가 배송 중 주문만 다시 그릴 때를 비교한다.
+주문은 모두 벤치마크 세션의 고객(장바구니 토큰 CUSTOMER)으로 넣는다.
+임시 디렉터리에서 실행하므로 실제 주문/장바구니 파일은 건드리지 않는다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from universe_store.order_store import SqliteOrderStore  # noqa: E402
+
+CUSTOMER = "bench"
+
+
+def make_app():
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=60)
+    at.secrets["TELEGRAM_TOKEN"] = "bench"
+    at.secrets["CHAT_ID"] = "0"
+    at.secrets["CHECKOUT_PROFILE"] = "instant"
+    at.query_params["cid"] = CUSTOMER
+    return at
+
+
+def timed(action, at, region):
+    start = time.perf_counter()
+    action()
+    full = time.perf_counter() - start
+    return full, at.session_state["region_timings"][region]
+
+
+def seed_orders(n, in_flight):
+    # 앞의 n 건은 배송 완료 (3시간 전보다 오래됨), 마지막 in_flight 건은 배송 중
+    now = datetime.now()
+    dates = [now - timedelta(hours=3, minutes=n - i) for i in range(n)]
+    dates += [now - timedelta(minutes=in_flight - i) for i in range(in_flight)]
+    SqliteOrderStore("orders_history.db").append_many([
+        {
+            "order_num": f"UNIVERSE-BENCH{i:08d}", "item": "미리 감사", "address": "서울",
+            "delivery_request": "없음", "state": "평온한 확신", "price": "50,000,000원",
+            "price_krw": 50000000, "status": "배송 완료 ✨" if i < n else "배송 중 🚀",
+            "date": date.strftime("%Y-%m-%d %H:%M:%S"), "customer": f"cid:{CUSTOMER}",
+        }
+        for i, date in enumerate(dates)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--in-flight", type=int, default=5)
+    parser.add_argument("--json")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        seed_orders(args.orders, args.in_flight)
+        at = make_app()
+        at.run()
+
+        samples = [timed(lambda: at.button(key="cart_0").click().run(), at, "render_product_card")
+                   for _ in range(args.repeat)]
+        results["home: 장바구니 담기"] = samples
+
+        at.switch_page("universe_store/pages/cart.py").run()
+        samples = [timed(lambda: at.button(key="remove_0").click().run(), at, "render_cart_contents")
+                   for _ in range(args.repeat - 1)]
+        results["cart: 삭제"] = samples
+
+        at.switch_page("universe_store/pages/history.py").run()
+        # 배송 중 주문은 추적 영역에 있으므로 첫 번째 배송 완료 주문을 펼침
+        open_key = f"open_{args.in_flight}"
+        samples = [timed(lambda: at.button(key=open_key).click().run(), at, "render_history_row")
+                   for _ in range(args.repeat)]
+        results["history: 상세 보기"] = samples
+
+        at.selectbox(key="history_page_size").set_value(50).run()
+        samples = [timed(at.run, at, "live_tracker") for _ in range(args.repeat)]
+        results["history: 배송 추적 갱신"] = samples
+
+    report = {}
+    print(f"{'interaction':<26} {'full (ms)':>10} {'fragment (ms)':>14} {'speedup':>8}")
+    for name, samples in results.items():
+        full = statistics.median(s[0] for s in samples) * 1000
+        frag = statistics.median(s[1] for s in samples) * 1000
+        report[name] = {"full_ms": full, "fragment_ms": frag}
+        print(f"{name:<26} {full:>10.2f} {frag:>14.2f} {full / frag:>7.1f}x")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""첫 실행(cold start) 시간과 페이지별 재실행 시간
+
+    python benchmarks/bench_startup.py [--cold 5] [--repeat 30] [--json out.json]
+
+cold: 새 파이썬 프로세스에서 AppTest 로 앱을 처음 실행하는 데 걸린 시간
+      (universe_store 모듈 import, 저장소/스케줄러 생성 포함, streamlit 자체
+      import 는 제외). 프로세스를 새로 띄워 --cold 번 잰 중앙값.
+rerun: 페이지를 연 뒤 아무것도 바꾸지 않고 다시 실행한 시간의 중앙값.
+       페이지마다 st.navigation 이 해당 페이지 파일만 실행한다.
+임시 디렉터리에서 실행하므로 실제 주문/장바구니 파일은 건드리지 않는다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+PAGES = ["home", "order", "cart", "history", "info"]
+
+
+def make_app():
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=60)
+    at.secrets["TELEGRAM_TOKEN"] = "bench"
+    at.secrets["CHAT_ID"] = "0"
+    at.secrets["TELEGRAM_API_URL"] = "http://127.0.0.1:9"  # 발송은 하지 않음
+    return at
+
+
+def cold_start():
+    at = make_app()
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def page_reruns(repeat):
+    at = make_app()
+    at.run()
+    results = {}
+    for name in PAGES:
+        at.switch_page(f"universe_store/pages/{name}.py").run()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        results[name] = statistics.median(samples) * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cold", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--json")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    os.chdir(tempfile.mkdtemp())
+    if args.child:
+        print(cold_start())
+        return
+
+    cold = [
+        float(subprocess.check_output([sys.executable, os.path.abspath(__file__), "--child"],
+                                      text=True, stderr=subprocess.DEVNULL).strip().splitlines()[-1])
+        for _ in range(args.cold)
+    ]
+    report = {"cold_start_ms": statistics.median(cold) * 1000, "rerun_ms": page_reruns(args.repeat)}
+
+    print(f"{'cold start':<12} {report['cold_start_ms']:>8.1f} ms")
+    for name, ms in report["rerun_ms"].items():
+        print(f"{'rerun ' + name:<12} {ms:>8.1f} ms")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
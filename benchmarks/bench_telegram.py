@@ -0,0 +1,118 @@
+"""텔레그램 알림 발송: 한 통씩(outbox) vs 묶어 보내기(digest)
+
+    python benchmarks/bench_telegram.py [--orders 60] [--seconds 10] [--window 2]
+                                        [--chat-rate 1] [--timeout 120]
+
+로컬 스텁이 Bot API 의 채팅방별 한도(초당 chat-rate 통, 넘으면 429 + retry_after)를
+흉내 낸다. seconds 초 동안 주문 orders 건이 고르게 들어오고 주문마다 알림 세 통
+(접수, 배송 시작, 영수증) 을 같은 채팅방으로 넣는다. 방식마다 실제 API 호출 수,
+429 응답 수, 주문당 호출 수, 주문의 마지막 알림이 도착하기까지 걸린 시간을 출력한다.
+timeout 초 안에 다 보내지 못하면 남은 알림 수를 같이 출력한다.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_load import summarize  # noqa: E402
+from telegram_stub import TelegramStub  # noqa: E402
+from universe_store.outbox import Outbox  # noqa: E402
+from universe_store.telegram_client import TelegramClient  # noqa: E402
+from universe_store.telegram_digest import DigestOutbox  # noqa: E402
+
+CHAT_ID = "1000"
+STAGES = ["🎊 **주문 접수 완료**", "🚀 **배송 시작**", "🎊 **Universe Store 주문 영수증**"]
+
+
+def order_messages(i):
+    order_num = f"UNIVERSE-BENCH{i:06d}"
+    return order_num, [
+        f"{stage}\n━━━━━━━━━━━━━\n📦 주문번호: {order_num}\n🛍️ 상품: 미리 감사\n"
+        f"🏠 배송지: 서울시 우주구\n━━━━━━━━━━━━━\n💌 Universe Store"
+        for stage in STAGES
+    ]
+
+
+def run_mode(mode, args):
+    stub = TelegramStub(chat_rate=args.chat_rate, chat_burst=3, retry_after=1).start()
+    client = TelegramClient("bench", base_url=stub.url)
+    delivered = {}
+    lock = threading.Lock()
+
+    def send(payload):
+        result = client.send_message(payload)
+        now = time.perf_counter()
+        with lock:
+            for order_num in re.findall(r"UNIVERSE-BENCH\d+", payload["text"]):
+                delivered[order_num] = now  # 마지막 알림이 도착한 시각
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.db")
+        if mode == "digest":
+            outbox = DigestOutbox(path, send, window=args.window)
+        else:
+            outbox = Outbox(path, send)
+        outbox.start()
+
+        enqueued = {}
+        start = time.perf_counter()
+        for i in range(args.orders):
+            time.sleep(max(0.0, start + i * args.seconds / args.orders - time.perf_counter()))
+            order_num, messages = order_messages(i)
+            for message in messages:
+                outbox.enqueue({"chat_id": CHAT_ID, "text": message, "parse_mode": "Markdown"}, order_num)
+            enqueued[order_num] = time.perf_counter()
+
+        deadline = start + args.timeout
+        while outbox.pending_count() and time.perf_counter() < deadline:
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+        remaining = outbox.pending_count()
+        outbox.stop()
+
+    stub.stop()
+    texts = [parse_qs(body.decode("utf-8"))["text"][0] for body in stub.messages]
+    delays = [delivered[n] - enqueued[n] for n in enqueued if n in delivered]
+    return {
+        "messages": args.orders * len(STAGES),
+        "api_calls": stub.calls,
+        "rate_limited": stub.limited,
+        "calls_per_order": stub.calls / args.orders,
+        "max_length": max((len(t) for t in texts), default=0),
+        "elapsed_s": elapsed,
+        "remaining": remaining,
+        "delay": summarize(delays) if delays else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--chat-rate", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--modes", nargs="+", choices=["outbox", "digest"], default=["outbox", "digest"])
+    args = parser.parse_args()
+
+    print(f"{args.orders} orders x {len(STAGES)} messages over {args.seconds}s, "
+          f"chat limit {args.chat_rate}/s, digest window {args.window}s")
+    print(f"{'mode':<8}{'calls':>7}{'429':>6}{'calls/order':>13}{'max len':>9}"
+          f"{'delay p50':>11}{'delay max':>11}{'done at':>9}{'left':>6}")
+    for mode in args.modes:
+        r = run_mode(mode, args)
+        delay = r["delay"] or {"p50_ms": 0, "max_ms": 0}
+        print(f"{mode:<8}{r['api_calls']:>7}{r['rate_limited']:>6}{r['calls_per_order']:>13.2f}{r['max_length']:>9}"
+              f"{delay['p50_ms'] / 1000:>10.1f}s{delay['max_ms'] / 1000:>10.1f}s{r['elapsed_s']:>8.0f}s{r['remaining']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""주문 저장 처리량: fsync / 그룹 커밋 설정별
+
+    python benchmarks/bench_writes.py [--backends jsonl sqlite] [--procs 2] [--threads 8]
+                                      [--seconds 3] [--json out.json]
+
+프로세스 procs 개가 각자 저장소 하나를 열고, 그 안의 스레드 threads 개가 주문을
+한 건씩 seconds 초 동안 저장한다 (앱에서 세션 스레드들이 공용 저장소에 주문하는
+상황). 설정마다 초당 저장 수, append 지연 p50/p99, fsync 1회당 묶인 주문 수를
+출력하고, 끝나면 저장된 주문 수와 중복이 없는지 확인한다.
+
+  off        fsync 없음 (전원 장애 시 최근 주문 유실 가능, 비교 기준)
+  fsync      주문마다 fsync
+  group      fsync 하는 동안 들어온 주문을 다음 fsync 한 번으로 (앱 기본값)
+  group-Nms  리더가 N ms 더 기다렸다가 모아서 fsync
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_load import git_commit, summarize  # noqa: E402
+from universe_store.order_store import JsonlOrderStore, SqliteOrderStore  # noqa: E402
+
+MODES = [
+    ("off", False, None),
+    ("fsync", True, None),
+    ("group", True, 0),
+    ("group-1ms", True, 1),
+    ("group-5ms", True, 5),
+]
+
+
+def open_store(backend, path, fsync, group_commit_ms):
+    if backend == "jsonl":
+        return JsonlOrderStore(path, fsync=fsync, group_commit_ms=group_commit_ms)
+    return SqliteOrderStore(path, fsync=fsync, group_commit_ms=group_commit_ms)
+
+
+def make_order(order_num):
+    return {
+        "order_num": order_num, "item": "미리 감사", "address": "서울시 우주구", "delivery_request": "없음",
+        "state": "평온한 확신", "price": "50,000,000원", "price_krw": 50000000,
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "status": "배송 중 🚀",
+    }
+
+
+def _writer_process(backend, path, fsync, group_commit_ms, proc, threads, seconds, start_at, results):
+    store = open_store(backend, path, fsync, group_commit_ms)
+    latencies = []
+    lock = threading.Lock()
+
+    def writer(t):
+        local = []
+        i = 0
+        while time.time() < start_at:
+            time.sleep(0.001)
+        deadline = start_at + seconds
+        while time.time() < deadline:
+            order = make_order(f"BENCH-{proc}-{t}-{i}")
+            began = time.perf_counter()
+            store.append(order)
+            local.append(time.perf_counter() - began)
+            i += 1
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=writer, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    results.put((latencies, store._commit.stats["commits"]))
+
+
+def bench_mode(backend, fsync, group_commit_ms, procs, threads, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders_history.jsonl" if backend == "jsonl" else "orders_history.db")
+        open_store(backend, path, fsync, group_commit_ms)  # 스키마/파일 먼저 만듦
+        results = multiprocessing.Queue()
+        start_at = time.time() + 0.5
+        processes = [
+            multiprocessing.Process(target=_writer_process, args=(
+                backend, path, fsync, group_commit_ms, p, threads, seconds, start_at, results))
+            for p in range(procs)
+        ]
+        for p in processes:
+            p.start()
+        latencies, commits = [], 0
+        for _ in processes:
+            lat, c = results.get()
+            latencies.extend(lat)
+            commits += c
+        for p in processes:
+            p.join()
+
+        store = open_store(backend, path, fsync, None)
+        order_nums = [o["order_num"] for o in store.iter_orders()]
+        assert len(order_nums) == len(latencies) == store.count(), (len(order_nums), len(latencies))
+        assert len(set(order_nums)) == len(order_nums), "중복 주문"
+    result = summarize(latencies, seconds)
+    result["orders_per_commit"] = len(latencies) / commits if commits and group_commit_ms is not None else 1.0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", choices=["jsonl", "sqlite"], default=["jsonl", "sqlite"])
+    parser.add_argument("--modes", nargs="+", choices=[m[0] for m in MODES], default=[m[0] for m in MODES])
+    parser.add_argument("--procs", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--json")
+    args = parser.parse_args()
+
+    report = {"commit": git_commit(), "procs": args.procs, "threads": args.threads, "results": {}}
+    print(f"writers: {args.procs} procs x {args.threads} threads, {args.seconds}s each")
+    print(f"{'backend':<8}{'mode':<11}{'orders/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'per fsync':>11}")
+    for backend in args.backends:
+        for name, fsync, group_commit_ms in MODES:
+            if name not in args.modes:
+                continue
+            r = bench_mode(backend, fsync, group_commit_ms, args.procs, args.threads, args.seconds)
+            report["results"][f"{backend}/{name}"] = r
+            print(f"{backend:<8}{name:<11}{r['ops_per_sec']:>10.0f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                  f"{r['orders_per_commit']:>11.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
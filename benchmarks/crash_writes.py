@@ -0,0 +1,155 @@
+"""주문 저장 강제 종료(crash) 시험
+
+    python benchmarks/crash_writes.py [--backend jsonl|sqlite] [--rounds 30] [--procs 2] [--threads 4]
+
+라운드마다 쓰기 프로세스 procs 개를 띄워 (스레드 threads 개, 그룹 커밋) 주문을
+계속 저장하게 하고, 무작위 시점에 SIGKILL 로 죽인다. 스레드는 append 가 돌아온
+(= 확정된) 주문번호만 ack 파일에 적는다. JSONL 은 일부 라운드에서 잠금을 잡고
+주문 반 줄만 쓴 채 죽는 경우(쓰기 도중 종료)도 만든다.
+
+모든 라운드가 끝나면 저장소를 다시 열어 확인한다.
+  - 확정된 주문은 모두 있어야 한다 (유실 0)
+  - 같은 주문번호가 두 번 있으면 안 된다 (중복 0)
+  - 모든 줄이 JSON 으로 읽히고 인덱스 건수와 주문 수가 같아야 한다
+확정 전에 죽은 주문은 있을 수도 없을 수도 있다. 하나라도 어기면 종료 코드 1.
+(프로세스 종료만 흉내 낸다. 전원 장애는 fsync 가 막아 주는 범위)
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe_store.durable import file_lock  # noqa: E402
+from universe_store.order_store import JsonlOrderStore, SqliteOrderStore  # noqa: E402
+
+
+def open_store(backend, path, group_commit_ms=None):
+    if backend == "jsonl":
+        return JsonlOrderStore(path, group_commit_ms=group_commit_ms)
+    return SqliteOrderStore(path, group_commit_ms=group_commit_ms)
+
+
+def make_order(order_num):
+    return {"order_num": order_num, "item": "미리 감사", "address": "서울시 우주구", "delivery_request": "없음",
+            "state": "평온한 확신", "price": "50,000,000원", "price_krw": 50000000,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"), "status": "배송 중 🚀"}
+
+
+# ==========================================
+# 쓰기 프로세스 (--child)
+# ==========================================
+def child(backend, path, ack_path, prefix, threads, tear_after):
+    store = open_store(backend, path, group_commit_ms=0)
+    ack = os.open(ack_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+
+    def writer(t):
+        i = 0
+        while True:
+            order_nums = [f"{prefix}-{t}-{i}"]
+            if i % 5 == 0:  # 장바구니 주문처럼 여러 건 한 번에
+                order_nums.append(f"{prefix}-{t}-{i}b")
+            store.append_many([make_order(n) for n in order_nums])
+            os.write(ack, "".join(n + "\n" for n in order_nums).encode())
+            i += 1
+
+    for t in range(threads):
+        threading.Thread(target=writer, args=(t,), daemon=True).start()
+    if tear_after is not None:
+        # 쓰기 도중 종료: 잠금을 잡은 채 주문 반 줄만 쓰고 죽음
+        time.sleep(tear_after)
+        line = json.dumps(make_order(f"{prefix}-torn"), ensure_ascii=False).encode("utf-8")
+        with file_lock(store.lock_path):
+            with open(store.path, "ab") as log:
+                log.write(line[:len(line) // 2])
+                log.flush()
+                os._exit(137)
+    threading.Event().wait()
+
+
+# ==========================================
+# 시험
+# ==========================================
+def run(args):
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "orders_history.jsonl" if args.backend == "jsonl" else "orders_history.db")
+    ack_path = os.path.join(tmp, "acks.txt")
+    open_store(args.backend, path)
+    rnd = random.Random(args.seed)
+    torn_rounds = 0
+    for r in range(args.rounds):
+        procs = []
+        for p in range(args.procs):
+            tear = None
+            if args.backend == "jsonl" and p == 0 and rnd.random() < 0.3:
+                tear = rnd.uniform(0.02, 0.3)
+                torn_rounds += 1
+            cmd = [sys.executable, __file__, "--child", "--backend", args.backend, "--path", path,
+                   "--ack", ack_path, "--prefix", f"R{r}P{p}", "--threads", str(args.threads)]
+            if tear is not None:
+                cmd += ["--tear-after", str(tear)]
+            procs.append(subprocess.Popen(cmd))
+        time.sleep(rnd.uniform(0.3, 0.8))
+        for proc in procs:
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGKILL)
+        for proc in procs:
+            proc.wait()
+
+    with open(ack_path) as f:
+        acked = [line.strip() for line in f if line.strip()]
+    store = open_store(args.backend, path)  # 다시 열면서 반쪽 줄 정리 / 인덱스 확인
+    try:
+        stored = [o["order_num"] for o in store.iter_orders()]
+    except ValueError as e:
+        print(f"FAIL: 읽을 수 없는 주문 줄 ({e})")
+        sys.exit(1)
+    stored_set = set(stored)
+    lost = [n for n in acked if n not in stored_set]
+    duplicates = len(stored) - len(stored_set)
+    index_ok = store.count() == len(stored)
+    lines_ok = True
+    if args.backend == "jsonl":
+        with open(path, "rb") as f:
+            data = f.read()
+        lines_ok = data.endswith(b"\n") and all(json.loads(line) for line in data.splitlines())
+
+    print(f"backend={args.backend} rounds={args.rounds} procs={args.procs} threads={args.threads} "
+          f"torn_writes={torn_rounds}")
+    print(f"확정 {len(acked)}건 · 저장 {len(stored)}건 (확정 전 종료분 {len(stored_set) - len(set(acked))}건) · "
+          f"유실 {len(lost)} · 중복 {duplicates} · 인덱스 {'OK' if index_ok else 'MISMATCH'} · "
+          f"로그 {'OK' if lines_ok else 'CORRUPT'}")
+    if lost or duplicates or not index_ok or not lines_ok:
+        print("FAIL", lost[:5])
+        sys.exit(1)
+    print("OK")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["jsonl", "sqlite"], default="jsonl")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--procs", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--ack", help=argparse.SUPPRESS)
+    parser.add_argument("--prefix", help=argparse.SUPPRESS)
+    parser.add_argument("--tear-after", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.backend, args.path, args.ack, args.prefix, args.threads, args.tear_after)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""부하 테스트용 로컬 텔레그램 Bot API 스텁
+
+sendMessage 요청을 받아 세기만 하고 {"ok": true} 로 답한다. latency 를 주면
+응답 전에 그만큼 기다린다 (느린 api.telegram.org 흉내). chat_rate 를 주면
+채팅방마다 초당 chat_rate 통 (처음 chat_burst 통은 바로) 을 넘는 요청에
+429 와 retry_after 로 답한다 (Bot API 의 채팅방별 한도 흉내).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class TelegramStub:
+    def __init__(self, latency=0.0, status=200, chat_rate=None, chat_burst=3, retry_after=1):
+        self.latency = latency
+        self.status = status
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_after = retry_after
+        self.calls = 0
+        self.limited = 0
+        self.messages = []
+        self._allowance = {}  # chat_id -> (남은 허용량, 마지막 시각)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status = stub.status
+                with stub._lock:
+                    stub.calls += 1
+                    if stub._over_limit(body):
+                        stub.limited += 1
+                        status = 429
+                    else:
+                        stub.messages.append(body)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if status == 429:
+                    payload = json.dumps({"ok": False, "error_code": 429,
+                                          "parameters": {"retry_after": stub.retry_after}}).encode()
+                else:
+                    payload = json.dumps({"ok": status == 200}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _over_limit(self, body):
+        if not self.chat_rate:
+            return False
+        chat_id = parse_qs(body.decode("utf-8")).get("chat_id", [""])[0]
+        now = time.monotonic()
+        allowance, last = self._allowance.get(chat_id, (float(self.chat_burst), now))
+        allowance = min(self.chat_burst, allowance + (now - last) * self.chat_rate)
+        if allowance < 1:
+            self._allowance[chat_id] = (allowance, now)
+            return True
+        self._allowance[chat_id] = (allowance - 1, now)
+        return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
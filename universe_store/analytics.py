@@ -0,0 +1,149 @@
+import threading
+
+import numpy as np
+
+# ==========================================
+# 매출 집계 뷰 (NumPy)
+# ==========================================
+# SalesRollup 의 (시간, 상품) 행을 열 단위 배열로 메모리에 들고 있는다.
+# refresh() 는 마지막으로 본 뒤 바뀐 행만 읽어 제자리에서 고치거나 뒤에
+# 붙이고, 임의 구간 집계는 hour 배열에서 searchsorted 로 구간을 자른 뒤
+# np.add.at 으로 상품별/시간대별 합계를 한 번에 낸다. 비용은 구간 안의 행 수에만
+# 비례하고 주문 이력 길이와는 무관하다.
+
+
+def _sum_by(index, values, size):
+    # bincount(weights=) 는 float64 라 큰 매출 합계에서 원 단위가 틀어질 수 있음
+    out = np.zeros(size, dtype=np.int64)
+    np.add.at(out, index, values)
+    return out
+
+
+class SalesCube:
+    def __init__(self, rollup):
+        self.rollup = rollup
+        self._lock = threading.Lock()
+        self._reset()
+        self.stats = {"hits": 0, "incremental": 0, "reloads": 0}
+
+    def _reset(self):
+        self.items = []
+        self._item_index = {}
+        self._rows = {}
+        self._size = 0
+        self._sorted = True
+        self.hour = np.zeros(1024, dtype=np.int64)
+        self.item = np.zeros(1024, dtype=np.int32)
+        self.orders = np.zeros(1024, dtype=np.int64)
+        self.revenue = np.zeros(1024, dtype=np.int64)
+        self.delivered = np.zeros(1024, dtype=np.int64)
+        self._epoch = None
+        self._version = 0
+
+    def _grow(self):
+        for name in ("hour", "item", "orders", "revenue", "delivered"):
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def refresh(self):
+        with self._lock:
+            epoch, version = self.rollup.version()
+            if epoch == self._epoch and version == self._version:
+                self.stats["hits"] += 1
+                return
+            if epoch != self._epoch:
+                self._reset()
+                self.stats["reloads"] += 1
+            else:
+                self.stats["incremental"] += 1
+            for hour, item, orders, revenue, delivered in self.rollup.changed_since(self._version):
+                self._set(hour, item, orders, revenue, delivered)
+            self._epoch = epoch
+            self._version = version
+
+    def _set(self, hour, item, orders, revenue, delivered):
+        item_id = self._item_index.get(item)
+        if item_id is None:
+            item_id = self._item_index[item] = len(self.items)
+            self.items.append(item)
+        row = self._rows.get((hour, item_id))
+        if row is None:
+            if self._size == len(self.hour):
+                self._grow()
+            row = self._rows[(hour, item_id)] = self._size
+            if row and hour < self.hour[row - 1]:
+                self._sorted = False
+            self._size += 1
+            self.hour[row] = hour
+            self.item[row] = item_id
+        self.orders[row] = orders
+        self.revenue[row] = revenue
+        self.delivered[row] = delivered
+
+    def _sort(self):
+        n = self._size
+        order = np.argsort(self.hour[:n], kind="stable")
+        for name in ("hour", "item", "orders", "revenue", "delivered"):
+            column = getattr(self, name)
+            column[:n] = column[:n][order]
+        self._rows = {(int(h), int(i)): row for row, (h, i) in enumerate(zip(self.hour[:n], self.item[:n]))}
+        self._sorted = True
+
+    # ---------- 조회 ----------
+    def span(self):
+        """집계된 첫 시간과 마지막 시간 (없으면 None)"""
+        self.refresh()
+        with self._lock:
+            if not self._size:
+                return None
+            if not self._sorted:
+                self._sort()
+            return int(self.hour[0]), int(self.hour[self._size - 1])
+
+    def summary(self, start_hour, end_hour, bucket_hours=1):
+        """[start_hour, end_hour) 구간 합계.
+        by_item: 상품별 (주문 수, 매출), series: bucket_hours 단위 (주문 수, 매출)"""
+        self.refresh()
+        with self._lock:
+            if not self._sorted:
+                self._sort()
+            hours = self.hour[:self._size]
+            lo, hi = np.searchsorted(hours, [start_hour, end_hour])
+            item = self.item[lo:hi]
+            orders = self.orders[lo:hi]
+            revenue = self.revenue[lo:hi]
+            delivered = self.delivered[lo:hi]
+            bucket = (hours[lo:hi] - start_hour) // bucket_hours
+            n_items = len(self.items)
+            n_buckets = max(0, -(-(end_hour - start_hour) // bucket_hours))
+            items = list(self.items)
+            by_item_orders = _sum_by(item, orders, n_items)
+            by_item_revenue = _sum_by(item, revenue, n_items)
+            series_orders = _sum_by(bucket, orders, n_buckets)
+            series_revenue = _sum_by(bucket, revenue, n_buckets)
+            total_orders = int(orders.sum())
+            total_delivered = int(delivered.sum())
+            total_revenue = int(revenue.sum())
+        return {
+            "orders": total_orders,
+            "revenue": total_revenue,
+            "delivered": total_delivered,
+            "pending": total_orders - total_delivered,
+            "by_item": {
+                name: (int(n), int(won))
+                for name, n, won in zip(items, by_item_orders, by_item_revenue) if n
+            },
+            "series": [
+                (start_hour + i * bucket_hours, int(n), int(won))
+                for i, (n, won) in enumerate(zip(series_orders, series_revenue))
+            ],
+        }
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["rows"] = self._size
+            stats["items"] = len(self.items)
+        return stats
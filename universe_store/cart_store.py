@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .catalog import CartTotals
+
+# ==========================================
+# 서버 측 장바구니 저장소
+# ==========================================
+# 장바구니를 고객 키(로그인 사용자 또는 URL 에 남는 장바구니 토큰)별로
+# SQLite 에 저장해서 재접속해도 그대로 남는다. 자주 쓰는 장바구니는 메모리에
+# LRU 로 최대 max_cached 개까지만 들고 있고, ttl 초 동안 손대지 않은
+# 장바구니는 메모리와 파일에서 모두 지운다.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS carts (
+    key        TEXT PRIMARY KEY,
+    items      TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_carts_updated ON carts(updated_at);
+"""
+
+
+class Cart:
+    __slots__ = ("items", "totals", "touched_at")
+
+    def __init__(self, items=()):
+        self.items = []
+        self.totals = CartTotals()
+        self.touched_at = time.time()
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        self.items.append(item)
+        self.totals.add(item["product"], item["price"])
+
+    def remove(self, index):
+        item = self.items.pop(index)
+        self.totals.remove(item["product"], item["price"])
+        return item
+
+    def clear(self):
+        self.items = []
+        self.totals.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class CartStore:
+    def __init__(self, path, ttl=7 * 24 * 3600, max_cached=1000, sweep_interval=600):
+        self.path = path
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self.sweep_interval = sweep_interval
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        conn = self._conn()
+        with conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        self._maybe_sweep(now)
+        with self._lock:
+            cart = self._cache.get(key)
+            if cart is not None and now - cart.touched_at <= self.ttl:
+                self._cache.move_to_end(key)
+                return cart
+        row = self._conn().execute(
+            "SELECT items, updated_at FROM carts WHERE key = ?", (key,)
+        ).fetchone()
+        if row and now - row[1] <= self.ttl:
+            cart = Cart(json.loads(row[0]))
+        else:
+            cart = Cart()
+        with self._lock:
+            # 다른 스레드가 먼저 올려 둔 살아 있는 장바구니가 있으면 그것을 쓴다 (같은 고객의
+            # 여러 탭). 만료된 장바구니가 남아 있으면 새로 읽은 것으로 바꾼다
+            cached = self._cache.get(key)
+            if cached is not None and now - cached.touched_at <= self.ttl:
+                cart = cached
+            else:
+                self._cache[key] = cart
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return cart
+
+    def save(self, key, cart):
+        cart.touched_at = time.time()
+        conn = self._conn()
+        with conn:
+            if cart.items:
+                conn.execute(
+                    "INSERT INTO carts (key, items, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET items = excluded.items, updated_at = excluded.updated_at",
+                    (key, json.dumps(cart.items, ensure_ascii=False), cart.touched_at),
+                )
+            else:
+                conn.execute("DELETE FROM carts WHERE key = ?", (key,))
+
+    def _maybe_sweep(self, now):
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        cutoff = now - self.ttl
+        with self._lock:
+            for key in [k for k, c in self._cache.items() if c.touched_at < cutoff]:
+                del self._cache[key]
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM carts WHERE updated_at < ?", (cutoff,))
+
+    def cached_count(self):
+        return len(self._cache)
@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+
+# ==========================================
+# 상품 카탈로그
+# ==========================================
+# catalog.json 의 상품을 __slots__ 레코드로 읽는다. 가격은 원 단위 정수로
+# 보관하고, 화면에 쓰는 문자열(가격 표기, 선택 목록 라벨, 상품 카드 HTML)은
+# 불러올 때 한 번만 만들어 둔다. 파일이 바뀌면 (mtime) 다음 조회 때 다시 읽는다.
+
+
+def format_krw(amount):
+    return f"{amount:,}원"
+
+
+class Product:
+    __slots__ = ("name", "desc", "emoji", "price", "price_display", "label", "card_html")
+
+    def __init__(self, name, desc, emoji, price):
+        self.name = name
+        self.desc = desc
+        self.emoji = emoji
+        self.price = int(price)
+        self.price_display = format_krw(self.price)
+        self.label = f"{emoji} {name}"
+        self.card_html = f"""
+            <div class="product-card">
+                <h3>{emoji} {name}</h3>
+                <p>{desc}</p>
+                <p><strong>💳 Price:</strong> {self.price_display}</p>
+            </div>
+            """
+
+
+class Catalog:
+    __slots__ = ("products", "names", "version")
+
+    def __init__(self, products, version=0):
+        self.products = {p.name: p for p in products}
+        self.names = list(self.products)
+        self.version = version
+
+    def __getitem__(self, name):
+        return self.products[name]
+
+    def __contains__(self, name):
+        return name in self.products
+
+    def __iter__(self):
+        return iter(self.products.values())
+
+
+def load_catalog(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return Catalog(
+        [Product(p["name"], p["desc"], p["emoji"], p["price"]) for p in data],
+        version=os.path.getmtime(path),
+    )
+
+
+class CatalogLoader:
+    """catalog.json 을 지켜보다가 바뀌면 다시 읽는다 (잘못된 파일이면 이전 카탈로그 유지)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._catalog = load_catalog(path)
+
+    def get(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._catalog.version:
+            with self._lock:
+                if mtime != self._catalog.version:
+                    try:
+                        self._catalog = load_catalog(self.path)
+                    except (ValueError, KeyError):
+                        pass
+        return self._catalog
+
+
+# ==========================================
+# 장바구니 합계
+# ==========================================
+class CartTotals:
+    """상품을 담고 뺄 때마다 합계와 상품별 수량/금액을 바로 갱신"""
+
+    __slots__ = ("total", "count", "quantities", "sums")
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+        self.quantities = {}
+        self.sums = {}
+
+    def add(self, product, price):
+        self.total += price
+        self.count += 1
+        self.quantities[product] = self.quantities.get(product, 0) + 1
+        self.sums[product] = self.sums.get(product, 0) + price
+
+    def remove(self, product, price):
+        self.total -= price
+        self.count -= 1
+        self.quantities[product] -= 1
+        self.sums[product] -= price
+        if not self.quantities[product]:
+            del self.quantities[product]
+            del self.sums[product]
+
+    def clear(self):
+        self.total = 0
+        self.count = 0
+        self.quantities.clear()
+        self.sums.clear()
+
+    @property
+    def total_display(self):
+        return format_krw(self.total)
@@ -0,0 +1,71 @@
+import random
+
+# ==========================================
+# 주문 처리 상태 머신
+# ==========================================
+# 주문 처리 연출(카드 확인 → 결제 승인 → ... → 배송 시작)을 time.sleep 으로
+# 스크립트 스레드를 붙잡지 않고, session_state 에 저장된 상태를 주기적으로
+# 다시 실행되는 fragment 가 현재 시각 기준으로 한 칸씩 진행시킨다.
+#
+#   running ──(모든 단계 시간 경과)──▶ done ──(주문 저장/알림)──▶ complete
+
+CHECKOUT_STEPS = [
+    ("💳 카드 정보 확인 중...", 5),
+    ("🏦 결제 승인 요청 중...", 5),
+    ("✅ 결제 승인 완료", 3),
+    ("🌌 우주 재고 확인 중...", 10),
+    ("📦 상품 포장 중...", 5),
+    ("🚀 타임라인 배송 시작...", 10),
+]
+RETRY_STEP = ("⚠️ 일시적 오류 발생. 재시도 중...", 2)
+RETRY_RATE = 0.05
+
+# 단계별 지연 배율. "instant" 는 부하 테스트용 (지연 없음)
+DELAY_PROFILES = {
+    "demo": 1.0,
+    "fast": 0.1,
+    "instant": 0.0,
+}
+
+
+def start_checkout(order_input, now, profile="demo", rng=random):
+    scale = DELAY_PROFILES.get(profile, 1.0)
+    steps = [(label, delay * scale) for label, delay in CHECKOUT_STEPS]
+    retried = rng.random() < RETRY_RATE
+    if retried:
+        steps.append((RETRY_STEP[0], RETRY_STEP[1] * scale))
+    return {
+        "phase": "running",
+        "steps": steps,
+        "step": 0,
+        "step_started": now,
+        "retried": retried,
+        "input": order_input,
+        "order": None,
+    }
+
+
+def advance(state, now):
+    """경과 시간만큼 단계를 진행시킨다. 진행된 상태(state)를 그대로 돌려준다"""
+    if state["phase"] != "running":
+        return state
+    steps = state["steps"]
+    while state["step"] < len(steps):
+        deadline = state["step_started"] + steps[state["step"]][1]
+        if now < deadline:
+            return state
+        state["step"] += 1
+        state["step_started"] = deadline
+    state["phase"] = "done"
+    return state
+
+
+def current_step(state):
+    if state["phase"] != "running":
+        return None
+    return state["steps"][state["step"]][0]
+
+
+def progress(state):
+    total = len(state["steps"])
+    return 1.0 if not total else min(1.0, state["step"] / total)
@@ -0,0 +1,212 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from .catalog import format_krw
+from .checkout import advance, current_step, progress as checkout_progress, start_checkout
+from .delivery_scheduler import STATUS_SHIPPING
+from .notifier import get_delivery_scheduler, send_bulk_receipt, send_delivery_notification, send_telegram_msg
+from .orders import get_order_id_generator, save_order, save_orders
+from .rate_limit import ADMITTED, QUEUED, RATE_LIMITED, AdmissionController
+from .settings import (CHECKOUT_LEASE_TTL, CHECKOUT_MAX_ACTIVE, CHECKOUT_MAX_QUEUE, CHECKOUT_PROFILE,
+                       CHECKOUT_SESSION_BURST, CHECKOUT_SESSION_RATE, CHECKOUT_TICK)
+from .shop import clear_cart, get_customer_key
+
+# ==========================================
+# 주문 처리 입장 제한
+# ==========================================
+@st.cache_resource
+def get_admission():
+    return AdmissionController(CHECKOUT_MAX_ACTIVE, CHECKOUT_MAX_QUEUE, CHECKOUT_SESSION_RATE,
+                               CHECKOUT_SESSION_BURST, lease_ttl=CHECKOUT_LEASE_TTL)
+
+def _begin(state_key, order_input, ticket):
+    checkout_state = start_checkout(order_input, time.time(), CHECKOUT_PROFILE)
+    checkout_state['ticket'] = ticket
+    st.session_state[state_key] = checkout_state
+
+def request_checkout(state_key, order_input):
+    # 자리가 있으면 바로 시작, 없으면 대기 상태로 둔다. 둘 중 하나면 True
+    ticket = uuid.uuid4().hex
+    result, value = get_admission().acquire(ticket, get_customer_key())
+    if result == ADMITTED:
+        _begin(state_key, order_input, ticket)
+    elif result == QUEUED:
+        st.session_state[state_key] = {"phase": "queued", "ticket": ticket, "input": order_input}
+    elif result == RATE_LIMITED:
+        st.warning(f"⏳ 주문 요청이 너무 잦습니다. {value:.0f}초 후에 다시 시도해주세요.")
+    else:
+        st.error(f"🚦 지금 주문이 몰려 대기열이 가득 찼습니다 (대기 {value}명). 잠시 후 다시 시도해주세요.")
+    return result in (ADMITTED, QUEUED)
+
+@st.fragment(run_every=CHECKOUT_TICK)
+def admission_waiter(state_key='checkout'):
+    # 대기 중에는 이 영역만 CHECKOUT_TICK 마다 다시 실행해 순번을 확인
+    waiting = st.session_state[state_key]
+    admission = get_admission()
+    result, position = admission.poll(waiting['ticket'])
+    if result == ADMITTED:
+        _begin(state_key, waiting['input'], waiting['ticket'])
+        st.rerun()
+    if result != QUEUED:  # 오래 소식이 없어 대기열에서 빠짐
+        del st.session_state[state_key]
+        st.rerun()
+
+    st.info(f"🚦 주문이 몰려 순서를 기다리고 있습니다 · 대기 {position}번째")
+    st.caption("차례가 되면 바로 주문 처리가 시작됩니다. 이 화면을 닫으면 대기가 취소됩니다.")
+    if st.button("대기 취소", key=f"{state_key}_cancel"):
+        admission.release(waiting['ticket'])
+        del st.session_state[state_key]
+        st.rerun()
+
+def release_checkout(checkout_state):
+    if checkout_state.get('ticket'):
+        get_admission().release(checkout_state['ticket'])
+
+# ==========================================
+# 주문 처리 (상태 머신)
+# ==========================================
+
+def finalize_checkout(checkout_state):
+    # 주문은 저장 전에 상태에 적어 둔다. 저장 뒤에 오류가 나 다시 실행돼도 같은 주문번호로
+    # 이어서 처리 (저장소/스케줄러는 이미 있는 주문번호를 건너뜀)
+    order_input = checkout_state['input']
+    retry = checkout_state['order'] is not None
+    if not retry:
+        checkout_state['order'] = {
+            "order_num": get_order_id_generator().next_id(),
+            "item": order_input['item'],
+            "address": order_input['address'],
+            "delivery_request": order_input['delivery_request'],
+            "state": order_input['state'],
+            "price": order_input['price'],
+            "price_krw": order_input['price_krw'],
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": STATUS_SHIPPING,
+            "customer": get_customer_key()
+        }
+    order_data = checkout_state['order']
+    order_num = order_data['order_num']
+    save_order(order_data, retry)
+    get_delivery_scheduler().schedule(order_data)
+    checkout_state['phase'] = 'complete'
+    release_checkout(checkout_state)
+
+    # 배송 알림 발송 (outbox 에 넣기만 함)
+    send_delivery_notification(order_num, order_data['item'], "order_received")
+    send_delivery_notification(order_num, order_data['item'], "shipping_started")
+
+    try:
+        send_telegram_msg(order_data['item'], order_data['address'], order_data['delivery_request'], order_data['price'], order_num)
+    except Exception as e:
+        st.warning(f"텔레그램 전송 오류: {e}")
+
+def finalize_cart_checkout(checkout_state):
+    # 장바구니 전체를 한 번에: ID 한 묶음, 저장소 쓰기 한 번, 텔레그램 한 통.
+    # 단건 주문과 같이 주문을 먼저 상태에 적어 두고 다시 실행되면 그대로 이어서 처리
+    order_input = checkout_state['input']
+    retry = checkout_state.get('orders') is not None
+    if not retry:
+        items = order_input['items']
+        order_nums = get_order_id_generator().next_ids(len(items))
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        customer = get_customer_key()
+        checkout_state['orders'] = [
+            {
+                "order_num": order_num,
+                "item": item['product'],
+                "address": order_input['address'],
+                "delivery_request": order_input['delivery_request'],
+                "state": order_input['state'],
+                "price": item['price_display'],
+                "price_krw": item['price'],
+                "date": date,
+                "status": STATUS_SHIPPING,
+                "customer": customer
+            }
+            for order_num, item in zip(order_nums, items)
+        ]
+    orders = checkout_state['orders']
+    save_orders(orders, retry)
+    scheduler = get_delivery_scheduler()
+    for order in orders:
+        scheduler.schedule(order)
+    checkout_state['phase'] = 'complete'
+    release_checkout(checkout_state)
+    clear_cart()
+
+    send_bulk_receipt(orders)
+
+@st.fragment(run_every=CHECKOUT_TICK)
+def checkout_runner(state_key='checkout'):
+    # 스레드를 재우지 않고 CHECKOUT_TICK 마다 이 영역만 다시 실행해 단계를 진행
+    checkout_state = st.session_state[state_key]
+    advance(checkout_state, time.time())
+    if checkout_state['phase'] != 'running':
+        st.rerun()
+    get_admission().touch(checkout_state.get('ticket'))
+
+    st.progress(checkout_progress(checkout_state))
+    st.info(f"⏳ {current_step(checkout_state)}")
+
+def render_order_complete(checkout_state):
+    order = checkout_state['order']
+    order_input = checkout_state['input']
+
+    if checkout_state['retried']:
+        st.success("✅ 재시도 성공!")
+
+    st.success("✨ 주문이 우주로 전송되었습니다. 타임라인 배송이 시작되었습니다.")
+
+    st.markdown(f"""
+    <div class="order-number">
+        📋 주문번호: {order['order_num']}
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown(f"""
+    ### ✅ 주문 완료
+    - **상품:** {order['item']}
+    - **배송지:** {order['address']}
+    - **배송요청사항:** {order['delivery_request']}
+    - **마음 상태:** {order['state']}
+    - **결제 수단:** {order_input['payment_method']}
+    - **결제 금액:** {order['price']}
+    ---
+
+    ### 🚀 배송 진행 상황
+    """)
+
+    delivery_steps = [
+        ("✅ 주문 접수 완료", True),
+        ("✅ 우주 창고 출발", True),
+        ("🔄 양자 터널 통과 중", True),
+        ("⏳ 현실화 프로세스 진행 중", False),
+        ("📍 배송 완료 (타임라인 도착)", False)
+    ]
+
+    for step, completed in delivery_steps:
+        if completed:
+            st.success(step)
+        else:
+            st.info(step)
+
+    st.markdown("---")
+    st.info("💌 잠시 후 텔레그램으로 영수증이 발송됩니다.")
+    st.markdown("**💡 Tip:** 이제 주문을 잊고 천천히 일상을 즐기세요. 타임라인 배송은 이미 완료되었습니다.")
+
+def render_cart_order_complete(checkout_state):
+    orders = checkout_state['orders']
+
+    if checkout_state['retried']:
+        st.success("✅ 재시도 성공!")
+
+    st.success(f"✨ {len(orders)}개 상품이 한 번에 우주로 전송되었습니다. 타임라인 배송이 시작되었습니다.")
+
+    for order in orders:
+        st.markdown(f"- 📋 **{order['order_num']}** · {order['item']} · {order['price']}")
+
+    st.markdown(f"**💰 총 결제 금액:** {format_krw(sum(o['price_krw'] for o in orders))}")
+    st.info("💌 잠시 후 텔레그램으로 영수증 한 통이 발송됩니다.")
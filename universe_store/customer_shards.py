@@ -0,0 +1,334 @@
+import heapq
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .order_record import Order, OrderStatus, decode_order, encode_order
+from .search_index import normalize, order_text
+
+# ==========================================
+# 고객별 주문 샤드
+# ==========================================
+# 주문 내역 페이지는 보고 있는 고객의 주문만 필요하다. 주문을 고객 키(로그인
+# 계정 / 장바구니 토큰) 기준으로 shard_count 개의 SQLite 파일(shard-00.db ...)에
+# 나눠 담고, 고객이 어느 샤드에 있는지는 작은 디렉터리 색인(directory.db:
+# 고객 키 -> 샤드 번호)에 적어 둔다. 샤드 안에서는 (customer, seq) 색인으로 그
+# 고객의 주문만 최신순으로 읽으므로, 주문 내역 비용은 전체 주문 수가 아니라
+# 그 고객의 주문 수에만 달려 있다.
+#
+# 새 고객은 처음 주문할 때 고객 키 해시로 샤드를 정해 디렉터리에 적고, 이후로는
+# 디렉터리만 본다 (샤드 수를 늘려도 기존 고객은 원래 샤드에 남음). 주문이 없는
+# 방문자는 디렉터리에 들어가지 않는다. 고객별 주문 수 / 버전(페이지 캐시 키)은
+# 샤드 안 customers 표에 주문과 같은 트랜잭션으로 적는다.
+#
+# 저장소(orders_history.*)가 여전히 원본이고 샤드는 고객별로 나눈 사본이다.
+# 보관소(orders_archive/)로 옮겨진 주문도 샤드에는 본문째 남는다. 보관 세그먼트는
+# 하루치 전체 고객 주문을 통째로 압축한 것이라, 고객 한 명의 페이지를 그리려고
+# 풀면 비용이 다시 전체 주문 수를 따라가기 때문이다. 저장소를 배송 중 / 최근 주문만
+# 남게 줄이는 것은 보관소 정리가 하고, 샤드는 고객별 전체 내역을 맡는다.
+# 정리 때는 옮긴 주문을 배송 완료로 맞추고 샤드에 빠진 주문을 채운다 (record_archived).
+# 고객 키가 없는 예전 주문은 LEGACY_CUSTOMER 로 모아 두고, 주문 내역 페이지에서
+# 누구나 따로 볼 수 있다 (고객을 구분하기 전처럼).
+# 운영자 조회(전체 최근 주문, 샤드별 통계)는 샤드마다 스레드 하나씩 나눠 읽고 합친다.
+
+LEGACY_CUSTOMER = "legacy"
+
+_DIRECTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    customer TEXT PRIMARY KEY,
+    shard    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_SHARD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    customer  TEXT NOT NULL,
+    order_num TEXT NOT NULL UNIQUE,
+    ts        INTEGER NOT NULL,
+    status    INTEGER NOT NULL,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer, seq);
+CREATE INDEX IF NOT EXISTS idx_orders_ts ON orders(ts, order_num);
+CREATE TABLE IF NOT EXISTS customers (
+    customer TEXT PRIMARY KEY,
+    orders   INTEGER NOT NULL DEFAULT 0,
+    version  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def customer_of(order):
+    return order.customer or LEGACY_CUSTOMER
+
+
+class CustomerShards:
+    def __init__(self, directory, shard_count=16, workers=8, max_cached=10000, fsync=True):
+        """fsync: 저장소와 같이 커밋마다 디스크에 확정"""
+        self.directory = directory
+        self.fsync = fsync
+        self.shard_count = shard_count
+        self.max_cached = max_cached
+        self.directory_path = os.path.join(directory, "directory.db")
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._shard_cache = OrderedDict()  # customer -> 샤드 번호 (한 번 정해지면 바뀌지 않음)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, min(workers, shard_count)),
+                                        thread_name_prefix="customer-shard")
+        with self._conn(None) as conn:
+            conn.executescript(_DIRECTORY_SCHEMA)
+        for shard in range(shard_count):
+            with self._conn(shard) as conn:
+                conn.executescript(_SHARD_SCHEMA)
+
+    def shard_path(self, shard):
+        return os.path.join(self.directory, f"shard-{shard:02d}.db")
+
+    def _conn(self, shard):
+        """shard=None 은 디렉터리 색인. 스레드마다 파일별 연결 하나"""
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(shard)
+        if conn is None:
+            path = self.directory_path if shard is None else self.shard_path(shard)
+            conn = sqlite3.connect(path, timeout=10, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            conns[shard] = conn
+        return conn
+
+    # ---------- 디렉터리 ----------
+    def shard_of(self, customer, create=False):
+        """고객의 샤드 번호. 주문한 적 없는 고객이면 None (create=True 면 새로 배정)"""
+        with self._lock:
+            shard = self._shard_cache.get(customer)
+            if shard is not None:
+                self._shard_cache.move_to_end(customer)
+                return shard
+        conn = self._conn(None)
+        if create:
+            with conn:  # 여러 프로세스가 동시에 배정해도 먼저 적힌 쪽을 따름
+                conn.execute("INSERT OR IGNORE INTO customers (customer, shard) VALUES (?, ?)",
+                             (customer, zlib.crc32(customer.encode("utf-8")) % self.shard_count))
+        row = conn.execute("SELECT shard FROM customers WHERE customer = ?", (customer,)).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._shard_cache[customer] = row[0]
+            while len(self._shard_cache) > self.max_cached:
+                self._shard_cache.popitem(last=False)
+        return row[0]
+
+    def customer_count(self):
+        return self._conn(None).execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+
+    def is_empty(self):
+        return self._conn(None).execute("SELECT 1 FROM customers LIMIT 1").fetchone() is None
+
+    # ---------- 쓰기 ----------
+    def _by_shard(self, orders):
+        groups = {}
+        for order in orders:
+            customer = order["customer"] or LEGACY_CUSTOMER
+            groups.setdefault(self.shard_of(customer, create=True), []).append(order)
+        return groups
+
+    def append_many(self, orders):
+        """주문을 고객 샤드에 나눠 넣는다 (샤드마다 트랜잭션 한 번). 이미 있는 주문번호는
+        건너뛰므로 같은 주문을 다시 넣어도 된다. 새로 들어간 건수를 돌려준다"""
+        orders = [Order.from_dict(order) for order in orders]
+        groups = self._by_shard({"customer": customer_of(o), "order": o} for o in orders)
+        added = 0
+        for shard, items in groups.items():
+            conn = self._conn(shard)
+            with conn:
+                counts = {}
+                for item in items:
+                    order = item["order"]
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO orders (customer, order_num, ts, status, data) VALUES (?, ?, ?, ?, ?)",
+                        (item["customer"], order.order_num, order.ts, int(order.status), encode_order(order)))
+                    counts[item["customer"]] = counts.get(item["customer"], 0) + cur.rowcount
+                # 이미 있던 주문만 다시 들어온 고객은 버전(페이지 캐시 키)을 올리지 않음
+                self._bump(conn, {customer: n for customer, n in counts.items() if n})
+            added += sum(counts.values())
+        return added
+
+    def _bump(self, conn, counts):
+        """counts: 고객 -> 늘어난 주문 수. 0 이면 상태만 바뀐 고객 (mark_delivered / record_archived)"""
+        conn.executemany(
+            "INSERT INTO customers (customer, orders, version) VALUES (?, ?, 1) "
+            "ON CONFLICT(customer) DO UPDATE SET orders = orders + excluded.orders, version = version + 1",
+            list(counts.items()))
+
+    def mark_delivered(self, orders):
+        """배송 스케줄러가 넘긴 {"order_num", "customer"} 목록의 상태를 배송 완료로"""
+        delivered = int(OrderStatus.DELIVERED)
+        for shard, items in self._by_shard(orders).items():
+            conn = self._conn(shard)
+            with conn:
+                nums = [item["order_num"] for item in items]
+                marks = ",".join("?" * len(nums))
+                customers = {row[0]: 0 for row in conn.execute(
+                    f"SELECT DISTINCT customer FROM orders WHERE order_num IN ({marks}) AND status != ?",
+                    nums + [delivered])}
+                conn.execute(
+                    f"UPDATE orders SET status = ?, data = json_set(data, '$.status', ?) "
+                    f"WHERE order_num IN ({marks}) AND status != ?", [delivered, delivered] + nums + [delivered])
+                self._bump(conn, customers)
+
+    def _set_bodies(self, orders, where):
+        """where 조건에 맞는 행만 주문 본문/상태를 다시 쓴다. 바뀐 고객의 버전을 올린다"""
+        changed = 0
+        for shard, items in self._by_shard({"customer": customer_of(o), "order": o} for o in orders).items():
+            conn = self._conn(shard)
+            with conn:
+                customers = {}
+                for item in items:
+                    order = item["order"]
+                    cur = conn.execute(f"UPDATE orders SET data = ?, status = ? WHERE order_num = ? AND ({where})",
+                                       (encode_order(order), int(order.status), order.order_num))
+                    if cur.rowcount:
+                        customers[item["customer"]] = 0
+                        changed += 1
+                self._bump(conn, customers)
+        return changed
+
+    def record_archived(self, orders):
+        """보관소로 옮겨진 주문 (배송 완료). 샤드에 빠져 있던 주문은 넣고, 배송 완료 표시가
+        늦은 주문은 상태를 맞춘다. 맞춘 건수를 돌려준다"""
+        orders = [Order.from_dict(order) for order in orders]
+        self.append_many(orders)
+        return self._set_bodies(orders, f"status != {int(OrderStatus.DELIVERED)} OR data = ''")
+
+    def restore_bodies(self, orders, batch_size=5000):
+        """예전 버전이 보관소로 옮기며 비워 둔 본문(data = '')을 보관소 주문으로 되살린다.
+        디렉터리에 한 번 했다고 적어 두고 다음부터는 orders 를 읽지 않는다"""
+        conn = self._conn(None)
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'bodies_restored'").fetchone():
+            return 0
+        restored, batch = 0, []
+        for order in orders:
+            batch.append(Order.from_dict(order))
+            if len(batch) >= batch_size:
+                restored += self._set_bodies(batch, "data = ''")
+                batch = []
+        if batch:
+            restored += self._set_bodies(batch, "data = ''")
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('bodies_restored', 1)")
+        return restored
+
+    def backfill(self, orders, batch_size=5000):
+        """기존 주문 이력(저장소 + 보관소)으로 샤드를 채운다. 넣은 건수를 돌려준다"""
+        added, batch = 0, []
+        for order in orders:
+            batch.append(order)
+            if len(batch) >= batch_size:
+                added += self.append_many(batch)
+                batch = []
+        if batch:
+            added += self.append_many(batch)
+        return added
+
+    # ---------- 고객 조회 ----------
+    def _customer_row(self, customer):
+        shard = self.shard_of(customer)
+        if shard is None:
+            return None, (0, 0)
+        row = self._conn(shard).execute(
+            "SELECT orders, version FROM customers WHERE customer = ?", (customer,)).fetchone()
+        return shard, row or (0, 0)
+
+    def count(self, customer):
+        return self._customer_row(customer)[1][0]
+
+    def version(self, customer):
+        """이 고객의 주문이 추가되거나 상태가 바뀔 때마다 증가 (페이지 캐시 키)"""
+        return self._customer_row(customer)[1][1]
+
+    def page(self, customer, limit, cursor=None):
+        """고객 주문 한 페이지 (최신순). (주문 목록, 다음 커서) 를 돌려준다"""
+        shard = self.shard_of(customer)
+        if shard is None:
+            return [], None
+        rows = self._conn(shard).execute(
+            "SELECT seq, data FROM orders WHERE customer = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+            (customer, cursor if cursor is not None else 2 ** 63 - 1, limit + 1)).fetchall()
+        orders = [decode_order(data) for _, data in rows[:limit]]
+        return orders, (rows[limit - 1][0] if len(rows) > limit else None)
+
+    def search(self, customer, query, limit, cursor=None, chunk_size=500):
+        """고객 주문 안에서 상품명/배송지/배송요청사항/주문번호에 검색어가 들어간 주문 (최신순)"""
+        shard = self.shard_of(customer)
+        needle = normalize(query.strip())
+        if shard is None or not needle:
+            return [], None
+        cur = self._conn(shard).execute(
+            "SELECT seq, data FROM orders WHERE customer = ? AND seq < ? ORDER BY seq DESC",
+            (customer, cursor if cursor is not None else 2 ** 63 - 1))
+        found, last_seq = [], None
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return found, None
+            for seq, data in rows:
+                order = decode_order(data)
+                if needle in order_text(order):
+                    if len(found) == limit:
+                        return found, last_seq
+                    found.append(order)
+                    last_seq = seq
+
+    # ---------- 운영자 조회 (샤드 병렬) ----------
+    def fan_out(self, fn):
+        """fn(shard) 를 샤드마다 스레드 풀에서 실행해 샤드 순서대로 결과 목록을 돌려준다"""
+        return list(self._pool.map(fn, range(self.shard_count)))
+
+    def recent(self, limit, cursor=None):
+        """전체 고객의 최근 주문 (주문일 최신순). 커서는 마지막 주문의 (ts, 주문번호)"""
+        ts, order_num = cursor if cursor is not None else (2 ** 63 - 1, "")
+
+        def top(shard):
+            return self._conn(shard).execute(
+                "SELECT ts, order_num, data FROM orders WHERE ts < ? OR (ts = ? AND order_num < ?) "
+                "ORDER BY ts DESC, order_num DESC LIMIT ?", (ts, ts, order_num, limit + 1)).fetchall()
+
+        # 합친 뒤 보여 줄 limit 건만 디코딩
+        merged = list(heapq.merge(*self.fan_out(top), reverse=True))
+        orders = [decode_order(data) for _, _, data in merged[:limit]]
+        return orders, (tuple(merged[limit - 1][:2]) if len(merged) > limit else None)
+
+    def stats(self):
+        """샤드별 고객 수 / 주문 수 / 배송 중 주문 수 / 파일 크기"""
+        def shard_stats(shard):
+            conn = self._conn(shard)
+            customers, orders = conn.execute("SELECT COUNT(*), COALESCE(SUM(orders), 0) FROM customers").fetchone()
+            shipping = conn.execute("SELECT COUNT(*) FROM orders WHERE status = ?",
+                                    (int(OrderStatus.SHIPPING),)).fetchone()[0]
+            size = sum(os.path.getsize(p) for p in (self.shard_path(shard), self.shard_path(shard) + "-wal")
+                       if os.path.exists(p))
+            return {"shard": shard, "customers": customers, "orders": orders, "shipping": shipping, "bytes": size}
+
+        return self.fan_out(shard_stats)
+
+    def top_customers(self, limit=10):
+        """주문이 많은 고객 (샤드마다 상위 limit 명을 모아 합침)"""
+        def top(shard):
+            return self._conn(shard).execute(
+                "SELECT customer, orders FROM customers ORDER BY orders DESC LIMIT ?", (limit,)).fetchall()
+
+        return heapq.nlargest(limit, (row for rows in self.fan_out(top) for row in rows), key=lambda r: r[1])
+
+    def close(self):
+        self._pool.shutdown(wait=False)
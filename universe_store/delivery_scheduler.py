@@ -0,0 +1,141 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime
+
+from .order_record import STATUS_DELIVERED, STATUS_SHIPPING, Order
+
+# ==========================================
+# 배송 완료 스케줄러
+# ==========================================
+# 배송 중인 주문을 (배송 완료 시각, 주문번호) 최소 힙에 넣어 두고, 백그라운드
+# 스레드가 힙 맨 앞의 완료 시각까지만 잠들었다가 깨어난다. 한 번 깨어날
+# 때는 시각이 지난 주문만 꺼내므로 대기 주문이 10만 건이어도 전체를 훑지
+# 않는다 (push/pop 모두 O(log n)).
+#
+# 꺼낸 주문은 저장소에서 한꺼번에 "배송 완료" 로 바꾸고, 실제로 상태가
+# 바뀐 주문만 on_delivered 로 넘긴다. 상태 변경이 조건부 UPDATE 라서
+# 재시작하거나 여러 프로세스가 같이 돌아도 주문마다 한 번만 처리된다.
+# 그래서 상태를 바꾼 뒤의 콜백은 다시 불리지 않으므로, 알림(on_delivered)을 먼저
+# 넘기고 콜백마다 오류를 따로 잡아 하나가 실패해도 나머지는 실행한다.
+
+DELIVERY_HOURS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryScheduler:
+    def __init__(self, store, on_delivered, delivery_seconds=DELIVERY_HOURS * 3600,
+                 notify_grace=3600, max_sleep=60.0, batch_size=500, on_status_changed=None):
+        """on_delivered(orders): 배송 완료된 주문 목록을 받아 알림을 넘기는 함수.
+        완료 시각이 notify_grace 초 이상 지난 주문(서버가 꺼져 있던 동안의 주문)은
+        상태만 바꾸고 알림은 보내지 않는다.
+        on_status_changed(orders): 알림 여부와 관계없이 상태가 바뀐 주문 전체 (집계용)"""
+        self.store = store
+        self.on_delivered = on_delivered
+        self.on_status_changed = on_status_changed
+        self.delivery_seconds = delivery_seconds
+        self.notify_grace = notify_grace
+        self.max_sleep = max_sleep
+        self.batch_size = batch_size
+        self._heap = []
+        self._scheduled = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+        self.stats = {"scheduled": 0, "delivered": 0, "notified": 0, "callback_errors": 0}
+
+    def due_at(self, order):
+        return Order.from_dict(order).ts + self.delivery_seconds
+
+    # ---------- 등록 ----------
+    def load_pending(self):
+        for order in self.store.pending_orders(STATUS_SHIPPING):
+            self.schedule(order, wake=False)
+        self._wakeup.set()
+        return self
+
+    def schedule(self, order, wake=True):
+        order_num = order["order_num"]
+        with self._lock:
+            if order_num in self._scheduled:
+                return
+            self._scheduled.add(order_num)
+            heapq.heappush(self._heap, (self.due_at(order), order_num, order["item"], order.get("customer")))
+            self.stats["scheduled"] += 1
+            is_next = self._heap[0][1] == order_num
+        if wake and is_next:
+            self._wakeup.set()
+
+    def pending_count(self):
+        return len(self._heap)
+
+    # ---------- 워커 ----------
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="delivery-scheduler", daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.fire_due(time.time())
+                min_sleep = 0.0
+            except Exception:
+                min_sleep = 1.0  # 저장소 오류: 잠시 뒤 같은 묶음을 다시 시도
+            with self._lock:
+                sleep = self._heap[0][0] - time.time() if self._heap else self.max_sleep
+            sleep = max(sleep, min_sleep)
+            self._wakeup.wait(max(0.0, min(sleep, self.max_sleep)))
+            self._wakeup.clear()
+
+    def fire_due(self, now):
+        """완료 시각이 지난 주문을 batch_size 단위로 처리. 처리한 주문 수를 돌려준다"""
+        fired = 0
+        while True:
+            with self._lock:
+                batch = []
+                while self._heap and self._heap[0][0] <= now and len(batch) < self.batch_size:
+                    batch.append(heapq.heappop(self._heap))
+            if not batch:
+                return fired
+            try:
+                changed = set(self.store.update_status(
+                    [num for _, num, _, _ in batch], STATUS_SHIPPING, STATUS_DELIVERED))
+            except Exception:
+                with self._lock:
+                    for entry in batch:
+                        heapq.heappush(self._heap, entry)
+                raise
+            with self._lock:
+                self._scheduled.difference_update(num for _, num, _, _ in batch)
+            delivered = [
+                {"order_num": num, "item": item, "customer": customer, "due_at": due,
+                 "date": datetime.fromtimestamp(due - self.delivery_seconds).strftime("%Y-%m-%d %H:%M:%S")}
+                for due, num, item, customer in batch if num in changed
+            ]
+            notify = [order for order in delivered if now - order["due_at"] <= self.notify_grace]
+            if notify:
+                self._callback(self.on_delivered, notify)
+            if delivered and self.on_status_changed:
+                self._callback(self.on_status_changed, delivered)
+            self.stats["delivered"] += len(delivered)
+            self.stats["notified"] += len(notify)
+            fired += len(batch)
+
+    def _callback(self, fn, orders):
+        try:
+            fn(orders)
+        except Exception:
+            self.stats["callback_errors"] += 1
+            logger.exception("배송 완료 콜백 %s 실패 (주문 %d건)", getattr(fn, "__name__", fn), len(orders))
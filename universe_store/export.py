@@ -0,0 +1,239 @@
+"""주문 내역 내보내기 / 가져오기
+
+    python -m universe_store.export export orders.csv [--format csv|jsonl|parquet]
+    python -m universe_store.export import backfill.jsonl [--format ...]
+
+저장소에서 batch_size 건씩 읽어 바로 파일에 쓰므로 주문이 몇 건이든 메모리에는
+한 묶음만 올라온다 (CLI. 관리자 페이지 다운로드 버튼은 파일 전체를 메모리에 만든다).
+가져오기도 같은 크기 묶음으로 append_many 하고, 저장소에 이미 있는 주문번호는 묶음마다
+한 번 찾아 건너뛴다 (같은 파일을 두 번 가져와도 됨). Parquet 는 pyarrow 가 설치되어
+있을 때만 쓸 수 있다.
+내보낸 파일은 사람이 읽는 예전(버전 1) 모양 (주문일/가격 문자열, 상태 라벨) 이고,
+가져올 때는 버전 1 / 2 어느 쪽이든 받는다. 주문 내역에 그대로 보여 주는 값(주문번호,
+주문일, 상품명, 배송지, 마음 상태)이 빈 주문이 있으면 그 자리에서 멈춘다 (CSV 는 빈 칸을
+값이 없는 것으로 읽음).
+"""
+import argparse
+import csv
+import importlib.util
+import io
+import itertools
+import json
+import os
+import sys
+
+from .customer_shards import CustomerShards
+from .order_archive import OrderArchive
+from .order_record import Order, is_current
+from .order_store import JsonlOrderStore, SqliteOrderStore
+from .sales_rollup import SalesRollup, order_price
+from .search_index import append_docs
+
+FORMATS = ["csv", "jsonl", "parquet"]
+FIELDS = ["order_num", "date", "item", "price_krw", "price", "status", "address", "delivery_request", "state",
+          "customer"]
+REQUIRED_FIELDS = ("order_num", "item", "address", "state")  # + 주문일 (버전 1: date, 버전 2: ts)
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None  # 무거우므로 실제로 쓸 때만 import
+
+
+def available_formats():
+    return FORMATS if PARQUET_AVAILABLE else FORMATS[:2]
+
+
+def guess_format(path):
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    if ext not in FORMATS:
+        raise ValueError(f"확장자로 형식을 알 수 없습니다: {path} (--format 으로 지정)")
+    return ext
+
+
+def _batches(orders, batch_size):
+    batch = []
+    for order in orders:
+        batch.append(order)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _row(order):
+    row = {field: order.get(field) for field in FIELDS}
+    row["price_krw"] = order_price(order)
+    return row
+
+
+# ==========================================
+# 내보내기
+# ==========================================
+def write_export(orders, fmt, out, batch_size=5000):
+    """orders(이터러블) 를 바이너리 파일 객체 out 에 fmt 형식으로 쓰고 건수를 돌려준다"""
+    count = 0
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(f, pa.int64() if f == "price_krw" else pa.string()) for f in FIELDS])
+        with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+            for batch in _batches(orders, batch_size):
+                writer.write_table(pa.Table.from_pylist([_row(o) for o in batch], schema=schema))
+                count += len(batch)
+        return count
+
+    if fmt == "csv":
+        out.write("\ufeff".encode("utf-8"))  # 엑셀에서 한글이 깨지지 않도록 BOM
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, FIELDS, extrasaction="ignore")
+        writer.writeheader()
+    for batch in _batches(orders, batch_size):
+        if fmt == "csv":
+            writer.writerows(_row(o) for o in batch)
+            out.write(buf.getvalue().encode("utf-8"))
+            buf.seek(0)
+            buf.truncate()
+        elif fmt == "jsonl":
+            out.write("".join(json.dumps(Order.from_dict(o).to_legacy(), ensure_ascii=False) + "\n"
+                              for o in batch).encode("utf-8"))
+        else:
+            raise ValueError(f"지원하지 않는 형식: {fmt}")
+        count += len(batch)
+    if fmt == "csv" and buf.tell():
+        out.write(buf.getvalue().encode("utf-8"))
+    return count
+
+
+def export_bytes(orders, fmt, batch_size=5000):
+    """내보낸 내용 전체를 bytes 로 (st.download_button 용). 다운로드 버튼은 어차피 내용
+    전체를 메모리에 올려 보내므로, 메모리가 한 묶음으로 묶이는 것은 CLI 경로뿐이다"""
+    out = io.BytesIO()
+    write_export(orders, fmt, out, batch_size)
+    return out.getvalue()
+
+
+# ==========================================
+# 가져오기
+# ==========================================
+def read_orders(source, fmt, batch_size=5000):
+    """바이너리 파일 객체(또는 경로)에서 주문 dict 를 하나씩 스트리밍"""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+            for row in batch.to_pylist():
+                yield {k: v for k, v in row.items() if v is not None}
+        return
+
+    f = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+        if fmt == "jsonl":
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+        elif fmt == "csv":
+            for row in csv.DictReader(text):
+                order = {k: v for k, v in row.items() if k and v != ""}
+                if "price_krw" in order:
+                    order["price_krw"] = int(order["price_krw"])
+                yield order
+        else:
+            raise ValueError(f"지원하지 않는 형식: {fmt}")
+        text.detach()
+    finally:
+        if f is not source:
+            f.close()
+
+
+def import_orders(orders, store, rollup=None, search_path=None, batch_size=5000, shards=None):
+    """주문을 batch_size 건씩 저장소에 넣고 (매출 집계, 검색 색인, 고객별 샤드도 같이)
+    (가져온 건수, 이미 있어서 건너뛴 건수) 를 돌려준다. 보관소로 옮겨진 주문은 확인하지 않는다"""
+    count = skipped = 0
+    for batch in _batches(orders, batch_size):
+        records = []
+        for i, order in enumerate(batch, count + skipped + 1):
+            required = REQUIRED_FIELDS + (("ts",) if is_current(order) else ("date",))
+            missing = [f for f in required if not order.get(f)]
+            if missing:
+                raise ValueError(f"{i}번째 주문에 {', '.join(missing)} 값이 없습니다")
+            try:
+                records.append(Order.from_dict(order))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"{i}번째 주문을 읽을 수 없습니다: {e}") from None
+        # 저장소에 있는 주문번호는 한 번에 찾고, 파일 안에서 겹치는 번호는 처음 것만
+        seen = {order.order_num for order in store.get_many([order.order_num for order in records])}
+        batch = []
+        for order in records:
+            if order.order_num not in seen:
+                seen.add(order.order_num)
+                batch.append(order)
+        skipped += len(records) - len(batch)
+        if not batch:
+            continue
+        store.append_many(batch)
+        if rollup is not None:
+            rollup.record_orders(batch)
+        if search_path is not None:
+            append_docs(search_path, batch)
+        if shards is not None:
+            shards.append_many(batch)
+        count += len(batch)
+    return count, skipped
+
+
+# ==========================================
+# CLI
+# ==========================================
+def open_store(backend, path):
+    if backend == "jsonl":
+        return JsonlOrderStore(path or "orders_history.jsonl")
+    return SqliteOrderStore(path or "orders_history.db")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m universe_store.export")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", help="내보낼 파일 / 가져올 파일 (- 는 표준 출력/입력)")
+    parser.add_argument("--format", choices=FORMATS, help="생략하면 확장자로 판단")
+    parser.add_argument("--backend", choices=["sqlite", "jsonl"], default="sqlite")
+    parser.add_argument("--store", help="주문 저장소 파일 (기본: orders_history.db / .jsonl)")
+    parser.add_argument("--archive", default="orders_archive", help="내보낼 때 함께 읽을 보관소 디렉터리")
+    parser.add_argument("--rollup", default="sales_rollup.db", help="가져올 때 함께 갱신할 매출 집계 DB")
+    parser.add_argument("--search", help="가져올 때 함께 갱신할 검색 색인 (기본: 저장소 파일 + .search)")
+    parser.add_argument("--shards", default="orders_by_customer", help="가져올 때 함께 갱신할 고객별 주문 샤드")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or guess_format(args.file)
+    except ValueError as e:
+        parser.error(str(e))
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        parser.error("Parquet 를 쓰려면 pyarrow 를 설치하세요")
+    store = open_store(args.backend, args.store)
+
+    if args.command == "export":
+        orders = store.iter_orders()
+        if os.path.isdir(args.archive):  # 보관된 (배송 완료) 주문 먼저
+            orders = itertools.chain(OrderArchive(args.archive).iter_orders(), orders)
+        if args.file == "-":
+            count = write_export(orders, fmt, sys.stdout.buffer, args.batch_size)
+        else:
+            with open(args.file, "wb") as out:
+                count = write_export(orders, fmt, out, args.batch_size)
+        print(f"{count}건 내보냄 ({fmt})", file=sys.stderr)
+    else:
+        source = sys.stdin.buffer if args.file == "-" else args.file
+        # 집계/색인/샤드가 아직 없으면 앱이 처음 켜질 때 저장소 전체로 만들므로 건드리지 않음
+        rollup = SalesRollup(args.rollup) if os.path.exists(args.rollup) else None
+        search_path = args.search or store.path + ".search"
+        if not os.path.exists(search_path):
+            search_path = None
+        shards = CustomerShards(args.shards) if os.path.isdir(args.shards) else None
+        count, skipped = import_orders(read_orders(source, fmt, args.batch_size), store, rollup, search_path,
+                                       args.batch_size, shards)
+        print(f"{count}건 가져옴, 이미 있는 {skipped}건 건너뜀 ({fmt})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import bisect
+import collections
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ==========================================
+# 운영 지표 (히스토그램 / 카운터)
+# ==========================================
+# 프로세스 안에서만 모으는 가벼운 지표. 관측값은 고정 버킷 히스토그램에
+# 누적되므로 메모리는 지표 종류 수에만 비례한다. render_prometheus() 는
+# Prometheus 텍스트 형식으로 내보낸다 (지표마다 # HELP / # TYPE 줄, 설명은 describe 로 등록).
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = collections.Counter()
+        self.help = {}
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self._lock:
+            hists = {
+                key: (h.count, h.sum, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+                for key, h in self.histograms.items()
+            }
+            counters = dict(self.counters)
+        return hists, counters
+
+    def _header(self, lines, name, kind):
+        if name in self.help:
+            lines.append(f"# HELP {name} {self.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            previous = None
+            for name, labels in sorted(self.counters):
+                if name != previous:
+                    self._header(lines, name, "counter")
+                    previous = name
+                lines.append(f"{name}{_labels(labels)} {self.counters[(name, labels)]}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name != previous:
+                    self._header(lines, name, "histogram")
+                    previous = name
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {h.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+describe = REGISTRY.describe
+observe = REGISTRY.observe
+inc = REGISTRY.inc
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+
+# ==========================================
+# 샘플링 프로파일러
+# ==========================================
+# 켜져 있는 동안 interval 초마다 모든 스레드의 현재 스택을 찍어
+# "파일:함수:줄" 단위로 센다. 끄면 스레드가 멈추고 결과는 남는다.
+# 샘플은 프로파일러 스레드가 쓰고 관리자 페이지가 읽으므로 잠금 안에서 복사해 읽는다.
+class SamplingProfiler:
+    def __init__(self, interval=0.005, max_depth=30):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = collections.Counter()
+        self.total = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1)
+
+    def clear(self):
+        with self._lock:
+            self.samples.clear()
+            self.total = 0
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                stacks.append(";".join(reversed(stack)))
+            with self._lock:
+                self.samples.update(stacks)
+                self.total += len(stacks)
+
+    def snapshot(self):
+        """(스택별 샘플 수 복사본, 전체 샘플 수)"""
+        with self._lock:
+            return collections.Counter(self.samples), self.total
+
+    def top_functions(self, n=20):
+        """스택 맨 위(실제로 실행 중이던) 함수 기준 상위 n 개"""
+        leaf = collections.Counter()
+        for stack, count in self.snapshot()[0].items():
+            leaf[stack.rsplit(";", 1)[-1]] += count
+        return leaf.most_common(n)
+
+    def collapsed(self):
+        """flamegraph.pl / speedscope 로 열 수 있는 collapsed stack 형식"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.snapshot()[0].most_common())
+
+
+PROFILER = SamplingProfiler()
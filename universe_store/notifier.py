@@ -0,0 +1,162 @@
+import streamlit as st
+
+from . import metrics
+from .catalog import format_krw
+from .delivery_scheduler import DeliveryScheduler
+from .orders import get_customer_shards, get_order_store, get_sales_rollup
+from .outbox import Outbox
+from .settings import CHAT_ID, OUTBOX_DB, TELEGRAM_API_URL, TELEGRAM_DIGEST_WINDOW, TELEGRAM_TOKEN
+from .telegram_client import TELEGRAM_API, TelegramClient, TelegramError
+from .telegram_digest import DigestOutbox
+
+metrics.describe("telegram_send_seconds", "텔레그램 API 호출 한 번에 걸린 시간")
+metrics.describe("telegram_errors_total", "텔레그램 발송 실패 횟수 (kind: 예외 종류)")
+
+# ==========================================
+# 텔레그램 발송
+# ==========================================
+@st.cache_resource
+def get_telegram_client():
+    return TelegramClient(TELEGRAM_TOKEN, base_url=TELEGRAM_API_URL or TELEGRAM_API)
+
+@st.cache_resource
+def get_outbox():
+    # 백그라운드 워커만 실제로 발송. 실패(서킷 열림 포함) 시 outbox 가 재시도.
+    # TELEGRAM_DIGEST_WINDOW 동안 쌓인 알림은 주문별/채팅방별로 합쳐 한 통으로 보냄
+    client = get_telegram_client()
+
+    def send(payload):
+        with metrics.timer("telegram_send_seconds"):
+            try:
+                return client.send_message(payload)
+            except TelegramError as e:
+                metrics.inc("telegram_errors_total", kind=type(e).__name__)
+                raise
+
+    if TELEGRAM_DIGEST_WINDOW:
+        return DigestOutbox(OUTBOX_DB, send, window=TELEGRAM_DIGEST_WINDOW).start()
+    return Outbox(OUTBOX_DB, send).start()
+
+def telegram_payload(message):
+    return {"chat_id": CHAT_ID, "text": message, "parse_mode": "Markdown"}
+
+def enqueue_telegram(message, order_num=None):
+    # 같은 주문번호의 알림은 digest 에서 한 덩어리로 합쳐짐
+    get_outbox().enqueue(telegram_payload(message), order_num)
+
+def send_telegram_msg(item, address, delivery_request, cost, order_num):
+    message = f"""
+🎊 **Universe Store 주문 영수증**
+━━━━━━━━━━━━━━━
+📦 **상품명:** {item}
+🏷️ **주문번호:** {order_num}
+🏠 **배송지:** {address}
+📝 **배송요청사항:** {delivery_request}
+💳 **결제수단:** KB국민카드(간편결제)
+💰 **결제금액:** {cost}
+━━━━━━━━━━━━━━━
+✅ **결제완료**
+🚀 **배송상태:** 배송 시작됨
+
+⏰ 예상 도착: 타임라인에 이미 도착함
+
+**All is done**
+━━━━━━━━━━━━━━━━━━━━━━━━━
+💌 Universe Fulfillment Center
+    """
+
+    enqueue_telegram(message, order_num)
+
+def send_bulk_receipt(orders):
+    """장바구니 전체 주문: 상품 수와 관계없이 영수증 메시지 한 통"""
+    lines = "\n".join(f"📦 {o['item']} ({o['order_num']}) - {o['price']}" for o in orders)
+    total = format_krw(sum(o['price_krw'] for o in orders))
+    first = orders[0]
+    message = f"""
+🎊 **Universe Store 장바구니 주문 영수증**
+━━━━━━━━━━━━━━━
+{lines}
+━━━━━━━━━━━━━━━
+🏠 **배송지:** {first['address']}
+📝 **배송요청사항:** {first['delivery_request']}
+💳 **결제수단:** KB국민카드(간편결제)
+💰 **총 결제금액:** {total}
+━━━━━━━━━━━━━━━
+✅ **결제완료**
+🚀 **배송상태:** {len(orders)}건 모두 배송 시작됨
+
+**All is done**
+━━━━━━━━━━━━━━━━━━━━━━━━━
+💌 Universe Fulfillment Center
+    """
+
+    enqueue_telegram(message, first['order_num'])
+
+# ==========================================
+# 배송 알림 시스템
+# ==========================================
+def delivery_message(order_num, item, stage):
+    """배송 단계별 알림 문구"""
+    messages = {
+        "order_received": f"""
+🎊 **주문 접수 완료**
+━━━━━━━━━━━━━
+📦 주문번호: {order_num}
+🛍️ 상품: {item}
+✅ 주문이 접수되었습니다.
+🚀 곧 배송이 시작됩니다!
+━━━━━━━━━━━━━
+💌 Universe Store
+        """,
+
+        "shipping_started": f"""
+🚀 **배송 시작**
+━━━━━━━━━━━━━
+📦 주문번호: {order_num}
+🛍️ 상품: {item}
+🌌 우주 창고에서 출발했습니다!
+⏰ 3시간 후 타임라인 도착 예정
+━━━━━━━━━━━━━
+💌 Universe Store
+        """,
+
+        "delivery_complete": f"""
+✨ **배송 완료**
+━━━━━━━━━━━━━
+📦 주문번호: {order_num}
+🛍️ 상품: {item}
+🎉 타임라인 배송이 완료되었습니다!
+💫 이미 당신의 것입니다.
+━━━━━━━━━━━━━
+💌 Universe Store
+        """
+    }
+
+    return messages.get(stage, "")
+
+def send_delivery_notification(order_num, item, stage):
+    """배송 단계별 알림 발송 (outbox 에 넣고 바로 반환)"""
+    message = delivery_message(order_num, item, stage)
+    if message:
+        enqueue_telegram(message, order_num)
+
+@st.cache_resource
+def get_delivery_scheduler():
+    # 서버 시작 시 배송 중인 주문을 모두 등록하고, 주문일 + 3시간에 한 번씩
+    # 상태를 "배송 완료" 로 바꾼 뒤 배송 완료 알림을 outbox 에 넣음
+    outbox = get_outbox()
+
+    def on_delivered(orders):
+        for order in orders:
+            message = delivery_message(order['order_num'], order['item'], "delivery_complete")
+            outbox.enqueue(telegram_payload(message), order['order_num'])
+
+    rollup, shards = get_sales_rollup(), get_customer_shards()
+
+    def on_status_changed(orders):
+        # 매출 집계와 고객별 주문 샤드에도 배송 완료를 반영
+        rollup.record_delivered(orders)
+        shards.mark_delivered(orders)
+
+    return DeliveryScheduler(get_order_store(), on_delivered,
+                             on_status_changed=on_status_changed).load_pending().start()
@@ -0,0 +1,344 @@
+"""배송 완료 주문 보관 (압축 세그먼트)
+
+    python -m universe_store.order_archive compact [--backend sqlite|jsonl] [--store ...]
+    python -m universe_store.order_archive stats
+
+배송이 끝난 주문은 다시 바뀌지 않는다. 그래서 주문일 하루 단위로 묶어 압축한
+세그먼트 파일(zstd, 없으면 gzip)로 옮기고 저장소에는 배송 중인 주문만 남긴다.
+세그먼트는 한 번 쓰면 고치지 않으며, 늦게 배송 완료된 주문은 같은 날짜의 새
+세그먼트가 된다.
+
+세그먼트 목록(index.json)에는 파일마다 주문일 범위, 주문번호 범위, 건수, 크기만
+적혀 있다. 주문번호 조회(주문 내역 / 검색)는 이 목록만 보고 주문번호 범위가 맞는
+세그먼트만 연다 (주문번호는 시간순 정렬). 세그먼트에는 그날 모든 고객의 주문이
+섞여 있으므로 고객 주문 내역은 여기서 읽지 않고 고객 샤드(on_archived 로 맞춤)에서 읽는다.
+
+옮기는 순서: 세그먼트 쓰기 -> index.json 에 세그먼트와 "옮기는 중" 주문번호를 함께
+기록 (여기서 확정) -> 저장소에서 삭제 -> "옮기는 중" 비움. 도중에 꺼지면 다음
+정리 때 index.json 의 "옮기는 중" 주문을 저장소에서 마저 지운다.
+
+세그먼트의 주문은 버전 2 레코드 (order_record). upgrade 는 버전 1 로 쓰인 예전
+세그먼트를 새 세그먼트로 다시 써서 바꿔 끼운다 (python -m universe_store.order_record migrate).
+"""
+import argparse
+import gzip
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from . import metrics
+from .delivery_scheduler import DELIVERY_HOURS, STATUS_DELIVERED
+from .durable import file_lock, fsync_dir
+from .order_record import Order, decode_order, encode_order, is_current
+
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None  # 없으면 gzip
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+metrics.describe("archive_segment_load_seconds", "보관 세그먼트 하나를 풀어 읽는 시간 (캐시 미스)")
+metrics.describe("archive_compact_seconds", "보관소 정리 한 번에 걸린 시간")
+metrics.describe("archived_orders_total", "보관소로 옮긴 주문 수")
+
+
+def _compress(data, compression):
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, file):
+    if file.endswith(".zst"):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class OrderArchive:
+    def __init__(self, directory="orders_archive", compression=None, cache_segments=8):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock_path = os.path.join(directory, "index.lock")
+        self.compression = compression or ("zstd" if ZSTD_AVAILABLE else "gzip")
+        self.cache_segments = cache_segments
+        self._lock = threading.Lock()
+        self._index = {"segments": [], "pending": []}
+        self._index_mtime = None
+        self._cache = OrderedDict()  # 파일명 -> 주문 목록 (세그먼트는 바뀌지 않으므로 무효화 없음)
+        os.makedirs(directory, exist_ok=True)
+
+    # ---------- 세그먼트 목록 ----------
+    def _read_index(self):
+        """다른 프로세스가 바꿨을 때만 index.json 을 다시 읽는다"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return self._index
+        with self._lock:
+            if mtime != self._index_mtime:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+                self._index_mtime = mtime
+            return self._index
+
+    def _write_index(self, index):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+        fsync_dir(self.index_path)
+        with self._lock:
+            self._index = index
+            self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    def segments(self):
+        """세그먼트 요약 목록 (오래된 순)"""
+        return self._read_index()["segments"]
+
+    def count(self):
+        return sum(segment["count"] for segment in self.segments())
+
+    def version(self):
+        """세그먼트가 추가될 때마다 달라지는 값 (페이지 캐시 키)"""
+        return len(self.segments())
+
+    def stats(self):
+        segments = self.segments()
+        size = sum(s["bytes"] for s in segments)
+        raw = sum(s["raw_bytes"] for s in segments)
+        return {
+            "segments": len(segments), "orders": sum(s["count"] for s in segments),
+            "bytes": size, "raw_bytes": raw, "ratio": raw / size if size else 0.0,
+            "cached_segments": len(self._cache),
+        }
+
+    # ---------- 쓰기 ----------
+    def _write_segment(self, day, orders):
+        orders.sort(key=lambda o: (o.ts, o.order_num))
+        raw = "".join(encode_order(o) + "\n" for o in orders).encode("utf-8")
+        data = _compress(raw, self.compression)
+        ext = "zst" if self.compression == "zstd" else "gz"
+        file = f"{day.replace('-', '')}-{time.time_ns():x}.jsonl.{ext}"
+        path = os.path.join(self.directory, file)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        order_nums = [o.order_num for o in orders]
+        return {
+            "file": file, "day": day,
+            "first_date": orders[0].date, "last_date": orders[-1].date,
+            "min_order_num": min(order_nums), "max_order_num": max(order_nums),
+            "count": len(orders), "bytes": len(data), "raw_bytes": len(raw),
+        }
+
+    def add(self, orders):
+        """주문을 날짜별 세그먼트로 쓰고 index.json 에 확정한다.
+        확정된 주문번호는 clear_pending 전까지 "옮기는 중" 으로 남는다"""
+        orders = [Order.from_dict(o) for o in orders]
+        by_day = {}
+        for order in orders:
+            by_day.setdefault(order.date[:10], []).append(order)
+        added = [self._write_segment(day, day_orders) for day, day_orders in sorted(by_day.items())]
+        index = self._read_index()
+        segments = sorted(index["segments"] + added, key=lambda s: (s["last_date"], s["file"]))
+        self._write_index({"segments": segments, "pending": [o.order_num for o in orders]})
+        return added
+
+    def pending(self):
+        return self._read_index()["pending"]
+
+    def clear_pending(self):
+        self._write_index({"segments": self.segments(), "pending": []})
+
+    # ---------- 읽기 ----------
+    def load_segment(self, file):
+        """세그먼트 하나의 주문 목록 (오래된 순). 최근 연 cache_segments 개는 메모리에 둔다"""
+        with self._lock:
+            orders = self._cache.get(file)
+            if orders is not None:
+                self._cache.move_to_end(file)
+                return orders
+        with metrics.timer("archive_segment_load_seconds"):
+            with open(os.path.join(self.directory, file), "rb") as f:
+                raw = _decompress(f.read(), file)
+            orders = [decode_order(line) for line in raw.splitlines() if line]
+        with self._lock:
+            self._cache[file] = orders
+            while len(self._cache) > self.cache_segments:
+                self._cache.popitem(last=False)
+        return orders
+
+    def iter_orders(self):
+        """오래된 세그먼트부터 스트리밍 (캐시에 올리지 않음)"""
+        for segment in self.segments():
+            path = os.path.join(self.directory, segment["file"])
+            if segment["file"].endswith(".zst"):
+                import zstandard
+
+                with open(path, "rb") as f:
+                    stream = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(f), encoding="utf-8")
+                    for line in stream:
+                        yield decode_order(line)
+            else:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        yield decode_order(line)
+
+    def get_many(self, order_nums):
+        """주문번호 목록 순서대로 (없는 번호는 빠짐). 주문번호 범위가 맞는 세그먼트만 연다"""
+        wanted = set(order_nums)
+        found = {}
+        for segment in reversed(self.segments()):
+            if not wanted:
+                break
+            if not any(segment["min_order_num"] <= n <= segment["max_order_num"] for n in wanted):
+                continue
+            for order in self.load_segment(segment["file"]):
+                if order.order_num in wanted:
+                    found[order.order_num] = order
+                    wanted.discard(order.order_num)
+        return [found[n] for n in order_nums if n in found]
+
+    def upgrade(self):
+        """버전 1 세그먼트를 버전 2 로 다시 써서 바꿔 끼운다. 바꾼 주문 수를 돌려준다.
+        세그먼트 하나씩 (새 세그먼트 쓰기 -> index.json 교체 -> 예전 파일 삭제)"""
+        changed = 0
+        with file_lock(self.lock_path):
+            for segment in list(self.segments()):
+                path = os.path.join(self.directory, segment["file"])
+                with open(path, "rb") as f:
+                    lines = _decompress(f.read(), segment["file"]).splitlines()
+                if not lines or is_current(json.loads(lines[0])):
+                    continue
+                new = self._write_segment(segment["day"], [decode_order(line) for line in lines if line])
+                index = self._read_index()
+                segments = [new if s["file"] == segment["file"] else s for s in index["segments"]]
+                self._write_index({"segments": segments, "pending": index["pending"]})
+                os.remove(path)
+                changed += new["count"]
+        return changed
+
+
+# ==========================================
+# 정리 작업 (저장소 -> 보관소)
+# ==========================================
+def archive_cutoff(now, grace):
+    """주문일이 이 값보다 이르면 배송 완료 후 grace 초가 지난 주문"""
+    cutoff = datetime.fromtimestamp(now) - timedelta(hours=DELIVERY_HOURS, seconds=grace)
+    return cutoff.strftime(DATE_FORMAT)
+
+
+def compact(store, archive, grace=3600, now=None, batch_size=10000, on_archived=None):
+    """배송 완료 후 grace 초 지난 주문을 보관소로 옮기고 옮긴 건수를 돌려준다.
+    on_archived(주문 목록) 는 저장소에서 지운 뒤 묶음마다 불린다 (고객 샤드 정리용)"""
+    cutoff = archive_cutoff(time.time() if now is None else now, grace)
+    moved = 0
+    with file_lock(archive.lock_path), metrics.timer("archive_compact_seconds"):
+        pending = archive.pending()
+        if pending:  # 지난번 정리가 저장소 삭제 전에 중단됨
+            store.remove(pending)
+            archive.clear_pending()
+            if on_archived:
+                on_archived(archive.get_many(pending))
+        while True:
+            orders = store.archivable(STATUS_DELIVERED, cutoff, batch_size)
+            if not orders:
+                break
+            archive.add(orders)
+            store.remove([o.order_num for o in orders])
+            archive.clear_pending()
+            if on_archived:
+                on_archived(orders)
+            moved += len(orders)
+            if len(orders) < batch_size:
+                break
+    if moved:
+        metrics.inc("archived_orders_total", moved)
+    return moved
+
+
+class ArchiveCompactor:
+    """interval 초마다 compact 를 실행하는 백그라운드 스레드"""
+
+    def __init__(self, store, archive, interval=600, grace=3600, on_archived=None):
+        self.store = store
+        self.archive = archive
+        self.interval = interval
+        self.grace = grace
+        self.on_archived = on_archived
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self.stats = {"runs": 0, "moved": 0, "errors": 0, "last_run": None}
+
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="archive-compactor", daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def run_now(self):
+        """관리자 페이지의 "지금 정리" 버튼용 (워커를 깨우지 않고 호출한 스레드에서 실행)"""
+        return self._compact()
+
+    def _compact(self):
+        moved = compact(self.store, self.archive, self.grace, on_archived=self.on_archived)
+        self.stats["runs"] += 1
+        self.stats["moved"] += moved
+        self.stats["last_run"] = datetime.now().strftime(DATE_FORMAT)
+        return moved
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._compact()
+            except Exception:
+                self.stats["errors"] += 1  # 다음 주기에 다시 시도 (옮기는 중 기록으로 이어서 처리)
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+
+# ==========================================
+# CLI
+# ==========================================
+def main(argv=None):
+    from .export import open_store
+
+    parser = argparse.ArgumentParser(prog="python -m universe_store.order_archive")
+    parser.add_argument("command", choices=["compact", "stats"])
+    parser.add_argument("--backend", choices=["sqlite", "jsonl"], default="sqlite")
+    parser.add_argument("--store", help="주문 저장소 파일 (기본: orders_history.db / .jsonl)")
+    parser.add_argument("--archive", default="orders_archive", help="보관소 디렉터리")
+    parser.add_argument("--grace", type=int, default=3600, help="배송 완료 후 저장소에 더 둘 시간 (초)")
+    args = parser.parse_args(argv)
+
+    archive = OrderArchive(args.archive)
+    if args.command == "compact":
+        moved = compact(open_store(args.backend, args.store), archive, args.grace)
+        print(f"{moved}건 보관", file=sys.stderr)
+    stats = archive.stats()
+    print(f"세그먼트 {stats['segments']}개 · 주문 {stats['orders']}건 · "
+          f"{stats['bytes'] / 1e6:.1f}MB (원본 {stats['raw_bytes'] / 1e6:.1f}MB, {stats['ratio']:.1f}배 압축)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+
+# ==========================================
+# 주문번호 생성기
+# ==========================================
+# Snowflake 방식의 정수 ID 를 고정 폭 16진수로 표기한다 (문자열 정렬 = 시간순).
+#
+#   | 밀리초 타임스탬프 44 | 노드(프로세스) 22 | 스레드 슬롯 16 | 시퀀스 12 |
+#
+# 표기할 때는 24자리(96비트)의 맨 위 비트를 켜서 첫 자리가 8 이 되게 한다. 예전
+# 주문번호(UNIVERSE-<unix초>, "17…")보다 뒤에 정렬되어 주문번호 순서가 시간순으로
+# 이어진다. 이 표시 없이 만든 초기 ID ("00…") 는 예전 주문번호보다 앞에 정렬되므로,
+# 시간순이 필요한 곳은 주문번호가 아니라 주문일(ts)로 정렬한다.
+#
+# 시퀀스 상태는 스레드마다 따로 두므로 (threading.local) 생성 경로에 락이
+# 없다. 스레드 슬롯은 스레드가 처음 ID 를 만들 때 itertools.count 로
+# 받고, 노드는 기본값이 PID 라 여러 프로세스가 동시에 만들어도 겹치지 않는다.
+
+EPOCH_MS = 1704067200000  # 2024-01-01 00:00:00 UTC
+PREFIX = "UNIVERSE-"
+
+TIME_BITS, NODE_BITS, SLOT_BITS, SEQ_BITS = 44, 22, 16, 12
+SEQ_MASK = (1 << SEQ_BITS) - 1
+SLOT_SHIFT = SEQ_BITS
+NODE_SHIFT = SLOT_SHIFT + SLOT_BITS
+TIME_SHIFT = NODE_SHIFT + NODE_BITS
+WIDTH = (TIME_SHIFT + TIME_BITS + 3) // 4  # 16진수 자릿수
+MARKER = 1 << (WIDTH * 4 - 1)  # 예전 주문번호보다 뒤에 정렬되도록
+
+
+class OrderIdGenerator:
+    def __init__(self, node=None):
+        self._reset(os.getpid() if node is None else node)
+        if node is None and hasattr(os, "register_at_fork"):
+            # fork 된 자식 프로세스는 자기 PID 를 노드로 다시 잡는다
+            os.register_at_fork(after_in_child=lambda: self._reset(os.getpid()))
+
+    def _reset(self, node):
+        self.node = node & ((1 << NODE_BITS) - 1)
+        self._slots = itertools.count()
+        self._local = threading.local()
+
+    def _state(self):
+        state = getattr(self._local, "state", None)
+        if state is None:
+            slot = next(self._slots) & ((1 << SLOT_BITS) - 1)
+            base = (self.node << NODE_SHIFT) | (slot << SLOT_SHIFT)
+            state = self._local.state = [base, -1, 0]  # [base, last_ms, seq]
+        return state
+
+    def next_int(self):
+        state = self._state()
+        now = time.time_ns() // 1_000_000 - EPOCH_MS
+        if now > state[1]:
+            state[1] = now
+            state[2] = 0
+        else:
+            # 같은 밀리초 (또는 시계가 뒤로 감): 시퀀스 증가, 넘치면 다음 밀리초로
+            state[2] = (state[2] + 1) & SEQ_MASK
+            if state[2] == 0:
+                state[1] += 1
+        return (state[1] << TIME_SHIFT) | state[0] | state[2]
+
+    def next_id(self):
+        return f"{PREFIX}{MARKER | self.next_int():0{WIDTH}X}"
+
+    def next_ids(self, n):
+        """묶음 주문용: 연속된 ID n 개"""
+        next_int = self.next_int
+        return [f"{PREFIX}{MARKER | next_int():0{WIDTH}X}" for _ in range(n)]
+
+
+def order_id_time(order_num):
+    """주문번호에 담긴 생성 시각. 예전 형식(UNIVERSE-<unix초>)도 지원"""
+    body = order_num[len(PREFIX):] if order_num.startswith(PREFIX) else order_num
+    if len(body) == WIDTH:
+        ms = ((int(body, 16) >> TIME_SHIFT) & ((1 << TIME_BITS) - 1)) + EPOCH_MS
+        return datetime.fromtimestamp(ms / 1000)
+    return datetime.fromtimestamp(int(body))
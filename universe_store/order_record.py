@@ -0,0 +1,306 @@
+"""주문 레코드 (스키마 버전 2) 와 마이그레이션 도구
+
+    python -m universe_store.order_record migrate orders_history.json
+    python -m universe_store.order_record migrate orders_history.jsonl
+    python -m universe_store.order_record migrate orders_history.db
+    python -m universe_store.order_record migrate orders_archive
+
+예전 주문(버전 1)은 자유 형식 dict 라서 주문일이 "%Y-%m-%d %H:%M:%S" 문자열,
+가격이 "50,000,000원" 문자열, 상태가 이모지 라벨이었다. 버전 2 는
+    {"v": 2, "order_num", "item", "address", "delivery_request", "state",
+     "price_krw": 정수, "ts": epoch 초, "status": 상태 코드, "customer": 고객 키, "extra": {...}}
+이고, 읽으면 __slots__ 레코드 Order 가 된다. 주문일/가격 문자열/상태 라벨은
+화면에 쓸 때만 만든다. 버전 1 줄도 그대로 읽히지만 (주문일을 strptime) migrate
+로 한 번 바꿔 두면 읽을 때 문자열 파싱이 없다.
+
+migrate 는 파일을 한 건씩 읽어 바로 쓰므로 메모리에는 주문 한 건(묶음)만 올라온다.
+JSON 배열 파일은 원본을 <파일>.v1 로 남기고, JSONL / SQLite / 보관소는 각 저장소의
+잠금 안에서 바꾼다 (앱이 켜져 있어도 됨).
+"""
+import argparse
+import enum
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from .catalog import format_krw
+
+SCHEMA_VERSION = 2
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+STATUS_SHIPPING = "배송 중 🚀"
+STATUS_DELIVERED = "배송 완료 ✨"
+
+
+class OrderStatus(enum.IntEnum):
+    SHIPPING = 1
+    DELIVERED = 2
+
+    @property
+    def label(self):
+        return _STATUS_LABELS[self]
+
+    @classmethod
+    def of(cls, value):
+        """라벨 / 코드 / OrderStatus -> OrderStatus (없으면 배송 중)"""
+        if value is None:
+            return cls.SHIPPING
+        if isinstance(value, str):
+            try:
+                return _LABEL_STATUS[value]
+            except KeyError:
+                raise ValueError(f"알 수 없는 주문 상태: {value}") from None
+        return cls(value)
+
+
+_STATUS_LABELS = {OrderStatus.SHIPPING: STATUS_SHIPPING, OrderStatus.DELIVERED: STATUS_DELIVERED}
+_LABEL_STATUS = {label: status for status, label in _STATUS_LABELS.items()}
+
+# 버전 1 dict 에서 레코드 필드로 옮기는 키. 나머지 키는 extra 에 그대로 둔다
+_V1_KEYS = {"order_num", "item", "address", "delivery_request", "state", "price", "price_krw", "date", "status",
+            "customer"}
+_TEXT_FIELDS = ("order_num", "item", "address", "delivery_request", "state", "customer")
+
+
+def parse_date(date):
+    return int(datetime.strptime(date, DATE_FORMAT).timestamp())
+
+
+def format_date(ts):
+    return datetime.fromtimestamp(ts).strftime(DATE_FORMAT)
+
+
+def _price_from_text(price):
+    digits = re.sub(r"[^0-9]", "", price or "")
+    return int(digits) if digits else 0
+
+
+# ==========================================
+# 주문 레코드
+# ==========================================
+class Order:
+    """주문 한 건. 예전 코드가 쓰던 order["date"] / order.get("price") 같은 dict 식 읽기도
+    되고, 그때 주문일/가격/상태는 버전 1 과 같은 문자열로 돌려준다"""
+
+    __slots__ = ("order_num", "item", "address", "delivery_request", "state", "price_krw", "ts", "status",
+                 "customer", "extra")
+
+    def __init__(self, order_num, item, address, delivery_request, state, price_krw, ts,
+                 status=OrderStatus.SHIPPING, customer=None, extra=None):
+        self.order_num = order_num
+        self.item = item
+        self.address = address
+        self.delivery_request = delivery_request
+        self.state = state
+        self.price_krw = price_krw
+        self.ts = ts
+        self.status = status
+        self.customer = customer  # 주문한 고객 키 (예전 주문은 None)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """버전 2 dict, 버전 1 dict, Order 모두 받는다"""
+        if isinstance(data, Order):
+            return data
+        if data.get("v") == SCHEMA_VERSION:
+            return cls(data["order_num"], data["item"], data.get("address"), data.get("delivery_request"),
+                       data.get("state"), data["price_krw"], data["ts"], OrderStatus(data["status"]),
+                       data.get("customer"), data.get("extra"))
+        price_krw = data.get("price_krw")
+        extra = {k: v for k, v in data.items() if k not in _V1_KEYS}
+        return cls(data["order_num"], data["item"], data.get("address"), data.get("delivery_request"),
+                   data.get("state"),
+                   int(price_krw) if price_krw is not None else _price_from_text(data.get("price")),
+                   parse_date(data["date"]), OrderStatus.of(data.get("status")), data.get("customer") or None,
+                   extra or None)
+
+    def to_dict(self):
+        """저장용 버전 2 dict"""
+        data = {"v": SCHEMA_VERSION}
+        for field in _TEXT_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        data["price_krw"] = self.price_krw
+        data["ts"] = self.ts
+        data["status"] = int(self.status)
+        if self.extra:
+            data["extra"] = self.extra
+        return data
+
+    def to_legacy(self):
+        """버전 1 모양 dict (내보내기 / 화면용)"""
+        return {key: self[key] for key in self.keys()}
+
+    # ---------- 화면용 값 ----------
+    @property
+    def date(self):
+        return format_date(self.ts)
+
+    @property
+    def price(self):
+        return format_krw(self.price_krw)
+
+    @property
+    def status_label(self):
+        return self.status.label
+
+    # ---------- dict 식 읽기 ----------
+    def __getitem__(self, key):
+        if key == "date":
+            return self.date
+        if key == "price":
+            return self.price
+        if key == "status":
+            return self.status.label
+        if key in _V1_KEYS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        keys = [f for f in _TEXT_FIELDS if getattr(self, f) is not None]
+        keys += ["price", "price_krw", "date", "status"]
+        if self.extra:
+            keys += list(self.extra)
+        return keys
+
+    def __eq__(self, other):
+        if not isinstance(other, Order):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"Order({self.order_num!r}, {self.item!r}, {self.date}, {self.status.name})"
+
+
+def encode_order(order):
+    """저장소 한 줄 (버전 2 JSON)"""
+    return json.dumps(Order.from_dict(order).to_dict(), ensure_ascii=False)
+
+
+def decode_order(line):
+    return Order.from_dict(json.loads(line))
+
+
+def is_current(data):
+    return data.get("v") == SCHEMA_VERSION
+
+
+# ==========================================
+# JSON 배열 스트리밍
+# ==========================================
+def iter_json_array(f, chunk_size=1 << 16):
+    """JSON 배열 파일(텍스트)의 원소를 하나씩 읽는다. 파일 전체를 메모리에 올리지 않음"""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf, pos = buf[pos:] + chunk, 0
+        eof = not chunk
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    fill()
+    skip(" \t\r\n\ufeff")
+    if buf[pos:pos + 1] != "[":
+        raise ValueError("JSON 배열 파일이 아닙니다")
+    pos += 1
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError("JSON 배열이 닫히지 않았습니다")
+        if buf[pos] == "]":
+            return
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buf) and not eof:  # 숫자처럼 끝이 잘렸을 수 있는 값
+                fill()
+                continue
+            break
+        pos = end
+        yield value
+
+
+# ==========================================
+# 마이그레이션
+# ==========================================
+def migrate_json_file(path, backup=True):
+    """orders_history.json (주문 배열) 을 버전 2 배열로 바꾼다. 바꾼 건수를 돌려준다"""
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for data in iter_json_array(src):
+            out.write(",\n" if count else "\n")
+            out.write(encode_order(data))
+            count += 1
+        out.write("\n]\n")
+        out.flush()
+        os.fsync(out.fileno())
+    if backup:
+        os.replace(path, path + ".v1")
+    os.replace(tmp_path, path)
+    return count
+
+
+def migrate(path, batch_size=1000):
+    """경로 종류(JSON 배열 / JSONL 로그 / SQLite / 보관소 디렉터리)에 맞춰 버전 2 로 바꾼다"""
+    if os.path.isdir(path):
+        from .order_archive import OrderArchive
+        return OrderArchive(path).upgrade()
+    if path.endswith(".json"):
+        return migrate_json_file(path)
+    if path.endswith(".jsonl"):
+        from .order_store import JsonlOrderStore
+        return JsonlOrderStore(path).upgrade()
+    from .order_store import SqliteOrderStore
+    return SqliteOrderStore(path).upgrade(batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m universe_store.order_record")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("paths", nargs="+", help="orders_history.json / .jsonl / .db / 보관소 디렉터리")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"파일이 없습니다: {path}")
+        count = migrate(path, args.batch_size)
+        print(f"{path}: {count}건을 버전 {SCHEMA_VERSION} 로 바꿈", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
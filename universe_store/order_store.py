@@ -0,0 +1,526 @@
+import json
+import os
+import sqlite3
+import struct
+import threading
+
+from .durable import GroupCommit, file_lock, fsync_dir
+from .order_record import (Order, OrderStatus, decode_order, encode_order, is_current, iter_json_array,
+                           parse_date)
+
+# ==========================================
+# 주문 로그 (append-only JSONL + 오프셋 인덱스)
+# ==========================================
+# 주문 한 건 = JSON 한 줄 (order_record 의 버전 2 레코드). 인덱스 파일(.idx)에는
+# 각 줄의 시작 바이트 오프셋이 8바이트 little-endian 정수로 순서대로 저장되므로,
+# 주문 추가는 두 파일 끝에 한 번씩 쓰는 O(1) 작업이고 최근 N건 조회는 인덱스
+# 끝부분만 읽으면 된다.
+# 로그는 고치지 않으므로 배송 상태 변경은 별도 파일(.status)에
+# {"order_num", "status": 상태 코드} 줄로 덧붙이고 읽을 때 덮어씌운다. 예외는 보관소로
+# 옮긴 주문을 지우는 remove 로, 남길 주문만 새 파일에 써서 통째로 바꾼다.
+#
+# 쓰기는 모두 잠금 파일(.lock)의 fcntl 잠금 안에서 하므로 여러 프로세스가 같이
+# 써도 줄이 섞이거나 오프셋이 어긋나지 않는다. 로그는 쓴 뒤 fsync 해야 append 가
+# 돌아오고 (group_commit_ms 를 주면 동시에 들어온 주문을 fsync 한 번으로 묶음), 인덱스는
+# 로그로 다시 만들 수 있어서 fsync 하지 않는다. 쓰다가 죽어서 끝에 남은 반쪽
+# 줄은 (확정되지 않은 주문) 다음 쓰기가 잠금 안에서 잘라내고 인덱스도 맞춘다.
+
+_OFFSET = struct.Struct("<Q")
+
+
+class JsonlOrderStore:
+    def __init__(self, path="orders_history.jsonl", legacy_path=None, fsync=True, group_commit_ms=None):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.status_path = path + ".status"
+        self.lock_path = path + ".lock"
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._status_lock = threading.Lock()  # 상태 기록 이어 읽기 (읽기 스레드끼리)
+        self._status = {}
+        self._status_size = 0
+        self._status_ino = None
+        self._commit = GroupCommit(self._write_lines, None if group_commit_ms is None else group_commit_ms / 1000)
+        with self._lock, file_lock(self.lock_path):
+            if legacy_path:
+                migrate_json_array(legacy_path, self)
+            _truncate_torn_tail(self.path)
+            _truncate_torn_tail(self.status_path)
+            self._check_index()
+
+    # ---------- 쓰기 ----------
+    def append(self, order):
+        self.append_many([order])
+
+    def append_many(self, orders):
+        """여러 주문을 로그/인덱스 파일에 각각 한 번의 write 로 덧붙이고, 로그가
+        디스크에 확정된 뒤에 돌아온다"""
+        self._commit.submit([(encode_order(order) + "\n").encode("utf-8") for order in orders])
+
+    def _write_lines(self, lines):
+        with self._lock, file_lock(self.lock_path):
+            # 다른 프로세스가 쓰다가 죽었으면 반쪽 줄을 잘라내고 인덱스를 맞춘 뒤에 덧붙임
+            _truncate_torn_tail(self.path)
+            self._check_index()
+            with open(self.path, "ab") as log, open(self.index_path, "ab") as idx:
+                offset = log.seek(0, os.SEEK_END)
+                offsets = []
+                for line in lines:
+                    offsets.append(_OFFSET.pack(offset))
+                    offset += len(line)
+                log.write(b"".join(lines))
+                if self.fsync:
+                    log.flush()
+                    os.fsync(log.fileno())
+                idx.write(b"".join(offsets))
+
+    def update_status(self, order_nums, from_status, to_status):
+        """상태 변경 기록을 덧붙이고 실제로 바뀐 주문번호 목록을 돌려준다
+        (다른 프로세스의 기록까지 읽은 뒤 잠금 안에서 확인하므로 주문마다 한 번만 바뀜)"""
+        from_status, to_status = OrderStatus.of(from_status), OrderStatus.of(to_status)
+        with self._lock, file_lock(self.lock_path):
+            _truncate_torn_tail(self.status_path)
+            statuses = self._statuses()
+            changed = [n for n in order_nums if statuses.get(n, from_status) == from_status]
+            if changed:
+                with open(self.status_path, "ab") as f:
+                    f.write(b"".join(
+                        (json.dumps({"order_num": n, "status": int(to_status)}) + "\n").encode("utf-8")
+                        for n in changed))
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            return changed
+
+    def remove(self, order_nums):
+        """주문을 지운다 (보관소로 옮긴 뒤). 로그/인덱스/상태 기록을 남길 주문만으로 새로 쓴다"""
+        drop = set(order_nums)
+        if not drop or not os.path.exists(self.path):
+            return
+        with self._lock, file_lock(self.lock_path):
+            statuses = self._statuses()
+            tmp_log, tmp_status = self.path + ".tmp", self.status_path + ".tmp"
+            with open(self.path, "rb") as src, open(tmp_log, "wb") as log:
+                for line in src:
+                    if line.endswith(b"\n") and line.strip() and json.loads(line).get("order_num") not in drop:
+                        log.write(line)
+                log.flush()
+                os.fsync(log.fileno())
+            with open(tmp_status, "wb") as f:
+                for order_num, status in statuses.items():
+                    if order_num not in drop:
+                        record = {"order_num": order_num, "status": int(status)}
+                        f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            # 상태 기록을 먼저 바꿈: 그 사이에 죽어도 남은 주문의 상태는 그대로 읽힘
+            os.replace(tmp_status, self.status_path)
+            os.replace(tmp_log, self.path)
+            fsync_dir(self.path)
+            self._rebuild_index()
+
+    def upgrade(self):
+        """버전 1 주문 줄을 버전 2 로 바꿔 로그를 새로 쓴다 (remove 와 같은 방식). 바꾼 줄 수를 돌려준다"""
+        if not os.path.exists(self.path):
+            return 0
+        with self._lock, file_lock(self.lock_path):
+            _truncate_torn_tail(self.path)
+            tmp_log = self.path + ".tmp"
+            changed = 0
+            with open(self.path, "rb") as src, open(tmp_log, "wb") as log:
+                for line in src:
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if not is_current(data):
+                        line = (encode_order(data) + "\n").encode("utf-8")
+                        changed += 1
+                    log.write(line)
+                log.flush()
+                os.fsync(log.fileno())
+            if not changed:
+                os.remove(tmp_log)
+                return 0
+            os.replace(tmp_log, self.path)
+            fsync_dir(self.path)
+            self._rebuild_index()
+            return changed
+
+    def _statuses(self):
+        # 다른 프로세스가 덧붙인 상태 기록까지 이어서 읽는다. 파일이 통째로 바뀌었으면
+        # (다른 프로세스의 remove) 처음부터 다시 읽음. 여러 스레드가 같은 위치부터 이어
+        # 읽으면 읽은 위치가 두 번 더해지므로 잠금 안에서 읽는다
+        with self._status_lock:
+            try:
+                st = os.stat(self.status_path)
+            except FileNotFoundError:
+                return self._status
+            if st.st_ino != self._status_ino:
+                self._status, self._status_size, self._status_ino = {}, 0, st.st_ino
+            if st.st_size > self._status_size:
+                size = self._status_size
+                with open(self.status_path, "rb") as f:
+                    f.seek(size)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        record = json.loads(line)
+                        self._status[record["order_num"]] = OrderStatus.of(record["status"])  # 예전 줄은 라벨
+                        size += len(line)
+                self._status_size = size
+            return self._status
+
+    def _load(self, line, statuses):
+        order = decode_order(line)
+        status = statuses.get(order.order_num)
+        if status is not None:
+            order.status = status
+        return order
+
+    # ---------- 읽기 ----------
+    def count(self):
+        if not os.path.exists(self.index_path):
+            return 0
+        return os.path.getsize(self.index_path) // _OFFSET.size
+
+    def version(self):
+        """저장소가 바뀔 때마다 달라지는 값. 덧붙이기는 크기로, remove 는 로그 파일이
+        바뀌는 것(inode)으로 알 수 있다"""
+        if not os.path.exists(self.path):
+            return 0
+        size = sum(os.path.getsize(p) for p in (self.path, self.status_path) if os.path.exists(p))
+        return (os.stat(self.path).st_ino, size)
+
+    def iter_orders(self):
+        """오래된 주문부터 한 줄씩 스트리밍"""
+        if not os.path.exists(self.path):
+            return
+        statuses = self._statuses()  # 줄마다 상태 파일을 stat 하지 않도록 시작할 때 한 번
+        with open(self.path, "rb") as log:
+            for line in log:
+                if line.endswith(b"\n") and line.strip():
+                    yield self._load(line, statuses)
+
+    def load_all(self):
+        return list(self.iter_orders())
+
+    def pending_orders(self, status):
+        status = OrderStatus.of(status)
+        return [order for order in self.iter_orders() if order.status == status]
+
+    def archivable(self, status, before_date, limit):
+        """status 이고 주문일이 before_date 보다 이른 주문 limit 건 (오래된 순)"""
+        status, before = OrderStatus.of(status), parse_date(before_date)
+        orders = []
+        for order in self.iter_orders():
+            if order.status == status and order.ts < before:
+                orders.append(order)
+                if len(orders) >= limit:
+                    break
+        return orders
+
+    def get_many(self, order_nums):
+        """주문번호 목록 순서대로 (없는 번호는 빠짐). 주문번호 색인이 없어 로그를 훑는다"""
+        wanted = set(order_nums)
+        found = {}
+        for order in self.iter_orders():
+            if order.order_num in wanted:
+                found[order.order_num] = order
+        return [found[n] for n in order_nums if n in found]
+
+    def tail(self, n):
+        """최근 n건 (오래된 순)"""
+        total = self.count()
+        if n <= 0 or total == 0:
+            return []
+        start = max(0, total - n)
+        with open(self.index_path, "rb") as idx:
+            idx.seek(start * _OFFSET.size)
+            first = _OFFSET.unpack(idx.read(_OFFSET.size))[0]
+        statuses = self._statuses()
+        with open(self.path, "rb") as log:
+            log.seek(first)
+            return [self._load(line, statuses) for line in log if line.endswith(b"\n") and line.strip()]
+
+    # ---------- 인덱스 관리 ----------
+    def _check_index(self):
+        """로그와 인덱스가 어긋나 있으면 (중단된 쓰기, 인덱스 유실) 다시 만든다"""
+        if not os.path.exists(self.path):
+            return
+        log_size = os.path.getsize(self.path)
+        total = self.count()
+        if total == 0:
+            if log_size:
+                self._rebuild_index()
+            return
+        with open(self.index_path, "rb") as idx:
+            idx.seek((total - 1) * _OFFSET.size)
+            last = _OFFSET.unpack(idx.read(_OFFSET.size))[0]
+        with open(self.path, "rb") as log:
+            log.seek(last)
+            line = log.readline()
+        if not line.endswith(b"\n") or last + len(line) != log_size:
+            self._rebuild_index()
+
+    def rebuild_index(self):
+        with self._lock, file_lock(self.lock_path):
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        # 잠금은 호출하는 쪽에서 (flock 은 같은 프로세스에서도 다시 잡으면 멈춤)
+        tmp_path = self.index_path + ".tmp"
+        with open(self.path, "rb") as log, open(tmp_path, "wb") as idx:
+            offset = 0
+            for line in log:
+                if line.endswith(b"\n") and line.strip():
+                    idx.write(_OFFSET.pack(offset))
+                offset += len(line)
+        os.replace(tmp_path, self.index_path)
+
+
+def _truncate_torn_tail(path):
+    """마지막 줄이 줄바꿈 없이 끝나면 (쓰다가 죽음) 그 반쪽 줄을 잘라낸다"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = size
+        while pos > 0:
+            step = min(65536, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            cut = chunk.rfind(b"\n")
+            if cut >= 0:
+                pos = pos - step + cut + 1
+                break
+            pos -= step
+        f.truncate(pos)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ==========================================
+# 기존 orders_history.json 마이그레이션
+# ==========================================
+def migrate_json_array(legacy_path, store):
+    """JSON 배열 파일을 버전 2 JSONL 로그로 한 번만 옮기고 원본은 .migrated 로 남긴다.
+    배열을 한 건씩 읽어 바로 쓰므로 파일 크기와 관계없이 메모리는 일정"""
+    if not os.path.exists(legacy_path) or os.path.exists(store.path):
+        return 0
+    tmp_log = store.path + ".tmp"
+    tmp_idx = store.index_path + ".tmp"
+    count = 0
+    with open(legacy_path, "r", encoding="utf-8") as f, open(tmp_log, "wb") as log, open(tmp_idx, "wb") as idx:
+        for order in iter_json_array(f):
+            idx.write(_OFFSET.pack(log.tell()))
+            log.write((encode_order(order) + "\n").encode("utf-8"))
+            count += 1
+        log.flush()
+        os.fsync(log.fileno())
+    os.replace(tmp_idx, store.index_path)
+    os.replace(tmp_log, store.path)
+    fsync_dir(store.path)
+    os.replace(legacy_path, legacy_path + ".migrated")
+    return count
+
+
+# ==========================================
+# SQLite 주문 저장소 (WAL)
+# ==========================================
+# WAL 모드에서는 한 세션이 쓰는 동안에도 다른 세션의 읽기가 막히지 않는다.
+# 연결은 스레드마다 따로 열고 (Streamlit 은 세션별 스크립트 스레드),
+# 쓰기는 한 트랜잭션 INSERT 한 번이라 동시 주문이 서로를 덮어쓰지 않는다.
+# fsync=True 면 synchronous=FULL 로 커밋마다 WAL 을 디스크에 확정하고,
+# group_commit_ms 를 주면 동시에 들어온 주문을 한 트랜잭션(= fsync 한 번)으로 묶는다.
+# data 는 버전 2 레코드 JSON, date / status 열은 조회/정렬용으로 예전 형식(문자열, 라벨) 그대로.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_num TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    status    TEXT,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_order_num ON orders(order_num);
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(date);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+"""
+
+_INSERT = "INSERT INTO orders (order_num, date, status, data) VALUES (?, ?, ?, ?)"
+_BUMP_VERSION = "UPDATE meta SET value = value + 1 WHERE key = 'version'"
+
+
+class SqliteOrderStore:
+    def __init__(self, path="orders_history.db", legacy_log=None, legacy_path=None, fsync=True,
+                 group_commit_ms=None):
+        self.path = path
+        self.fsync = fsync
+        self._local = threading.local()
+        self._commit = GroupCommit(self._insert_rows, None if group_commit_ms is None else group_commit_ms / 1000)
+        conn = self._conn()
+        with conn:
+            conn.executescript(_SCHEMA)
+        if legacy_log or legacy_path:
+            self._import_legacy(legacy_log, legacy_path)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            self._local.conn = conn
+        return conn
+
+    # ---------- 쓰기 ----------
+    def append(self, order):
+        self.append_many([order])
+
+    def append_many(self, orders):
+        self._commit.submit([_to_row(order) for order in orders])
+
+    def _insert_rows(self, rows):
+        conn = self._conn()
+        with conn:
+            conn.executemany(_INSERT, rows)
+            conn.execute(_BUMP_VERSION)
+
+    def update_status(self, order_nums, from_status, to_status):
+        """from_status 인 주문만 to_status 로 바꾸고 실제로 바뀐 주문번호 목록을 돌려준다
+        (여러 프로세스가 같은 주문을 동시에 처리해도 한 번만 바뀜)"""
+        from_status, to_status = OrderStatus.of(from_status), OrderStatus.of(to_status)
+        changed = []
+        conn = self._conn()
+        with conn:
+            for order_num in order_nums:
+                # data 가 아직 버전 1 인 주문은 라벨로
+                cur = conn.execute(
+                    "UPDATE orders SET status = ?, data = json_set(data, '$.status', "
+                    "CASE WHEN json_extract(data, '$.v') = 2 THEN ? ELSE ? END) "
+                    "WHERE order_num = ? AND status = ?",
+                    (to_status.label, int(to_status), to_status.label, order_num, from_status.label),
+                )
+                if cur.rowcount:
+                    changed.append(order_num)
+            if changed:
+                conn.execute(_BUMP_VERSION)
+        return changed
+
+    def remove(self, order_nums):
+        """주문을 지운다 (보관소로 옮긴 뒤). 한 트랜잭션"""
+        order_nums = list(order_nums)
+        conn = self._conn()
+        with conn:
+            for i in range(0, len(order_nums), 500):
+                chunk = order_nums[i:i + 500]
+                conn.execute(f"DELETE FROM orders WHERE order_num IN ({','.join('?' * len(chunk))})", chunk)
+            conn.execute(_BUMP_VERSION)
+
+    def upgrade(self, batch_size=1000):
+        """data 가 버전 1 인 행을 batch_size 건씩 (한 트랜잭션씩) 버전 2 로 바꾼다. 바꾼 행 수를 돌려준다"""
+        conn = self._conn()
+        changed, last = 0, 0
+        while True:
+            rows = conn.execute(
+                "SELECT seq, data FROM orders WHERE seq > ? AND json_extract(data, '$.v') IS NULL "
+                "ORDER BY seq LIMIT ?", (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return changed
+            with conn:
+                conn.executemany("UPDATE orders SET data = ? WHERE seq = ?",
+                                 [(encode_order(json.loads(data)), seq) for seq, data in rows])
+                conn.execute(_BUMP_VERSION)
+            changed += len(rows)
+            last = rows[-1][0]
+
+    # ---------- 읽기 ----------
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def version(self):
+        """쓰기 트랜잭션마다 1씩 증가 (페이지 캐시 무효화용)"""
+        return self._conn().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def iter_orders(self, chunk_size=500):
+        cur = self._conn().execute("SELECT data FROM orders ORDER BY seq")
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield decode_order(data)
+
+    def load_all(self):
+        return list(self.iter_orders())
+
+    def pending_orders(self, status):
+        rows = self._conn().execute(
+            "SELECT data FROM orders WHERE status = ? ORDER BY date", (OrderStatus.of(status).label,)
+        )
+        return [decode_order(data) for (data,) in rows]
+
+    def archivable(self, status, before_date, limit):
+        """status 이고 주문일이 before_date 보다 이른 주문 limit 건 (오래된 순)"""
+        rows = self._conn().execute(
+            "SELECT data FROM orders WHERE status = ? AND date < ? ORDER BY date LIMIT ?",
+            (OrderStatus.of(status).label, before_date, limit),
+        )
+        return [decode_order(data) for (data,) in rows]
+
+    def tail(self, n):
+        rows = self._conn().execute(
+            "SELECT data FROM orders ORDER BY seq DESC LIMIT ?", (n,)
+        ).fetchall()
+        return [decode_order(data) for (data,) in reversed(rows)]
+
+    def get_many(self, order_nums):
+        """주문번호 목록 순서대로 (없는 번호는 빠짐)"""
+        if not order_nums:
+            return []
+        rows = self._conn().execute(
+            f"SELECT order_num, data FROM orders WHERE order_num IN ({','.join('?' * len(order_nums))})",
+            list(order_nums),
+        )
+        found = {order_num: decode_order(data) for order_num, data in rows}
+        return [found[n] for n in order_nums if n in found]
+
+    # ---------- 마이그레이션 ----------
+    def _import_legacy(self, legacy_log, legacy_path):
+        """JSONL 로그 또는 JSON 배열 파일을 처음 한 번만 가져온다. 보관소 정리가 저장소를
+        비울 수 있어서 주문 수가 아니라 meta 의 legacy_imported 표시로 판단한다
+        (표시가 생기기 전의 DB 는 한 번이라도 쓴 적이 있으면(version > 0) 가져온 것으로 본다)"""
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if row is None and self.version() == 0:
+            self._copy_legacy(legacy_log, legacy_path)
+        if row is None:
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('legacy_imported', 1)")
+
+    def _copy_legacy(self, legacy_log, legacy_path):
+        if legacy_log:
+            source = JsonlOrderStore(legacy_log, legacy_path=legacy_path)
+            batch = []
+            for order in source.iter_orders():
+                batch.append(order)
+                if len(batch) >= 1000:
+                    self.append_many(batch)
+                    batch = []
+            if batch:
+                self.append_many(batch)
+
+
+def _to_row(order):
+    order = Order.from_dict(order)
+    return (order.order_num, order.date, order.status.label, json.dumps(order.to_dict(), ensure_ascii=False))
@@ -0,0 +1,155 @@
+import itertools
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from . import metrics
+from .customer_shards import CustomerShards
+from .order_archive import ArchiveCompactor, OrderArchive
+from .order_id import OrderIdGenerator
+from .order_record import Order
+from .order_store import JsonlOrderStore, SqliteOrderStore
+from .sales_rollup import SalesRollup
+from .search_index import SearchIndex
+from .settings import (ANALYTICS_DB, ARCHIVE_GRACE, ARCHIVE_INTERVAL, CUSTOMER_SHARD_COUNT, CUSTOMER_SHARDS,
+                       GROUP_COMMIT_MS, ORDER_BACKEND, ORDER_FSYNC, ORDERS_ARCHIVE, ORDERS_DB,
+                       ORDERS_FILE, ORDERS_LOG, SEARCH_INDEX, SHARD_FANOUT_WORKERS)
+
+metrics.describe("save_order_seconds", "주문 저장 시간 (저장소 + 매출 집계 + 검색 색인 + 고객 샤드)")
+metrics.describe("history_page_load_seconds", "주문 내역 한 페이지 읽기 (scope: 고객 / 전체)")
+metrics.describe("history_search_seconds", "주문 내역 검색 한 페이지 (scope: 고객 / 전체)")
+
+# ==========================================
+# 데이터 저장/불러오기
+# ==========================================
+@st.cache_resource
+def get_order_store():
+    # 최초 1회 기존 orders_history.json / .jsonl 을 새 저장소로 마이그레이션.
+    # 동시에 들어온 주문은 GROUP_COMMIT_MS 안에서 모아 fsync 한 번으로 저장
+    if ORDER_BACKEND == "jsonl":
+        return JsonlOrderStore(ORDERS_LOG, legacy_path=ORDERS_FILE, fsync=ORDER_FSYNC,
+                               group_commit_ms=GROUP_COMMIT_MS)
+    return SqliteOrderStore(ORDERS_DB, legacy_log=ORDERS_LOG, legacy_path=ORDERS_FILE, fsync=ORDER_FSYNC,
+                            group_commit_ms=GROUP_COMMIT_MS)
+
+@st.cache_resource
+def get_order_archive():
+    return OrderArchive(ORDERS_ARCHIVE)
+
+@st.cache_resource
+def get_archive_compactor():
+    # 배송 완료 주문을 주기적으로 압축 세그먼트로 옮겨 저장소에는 배송 중인 주문만 남김.
+    # 고객 샤드에는 옮긴 주문이 그대로 남고 (고객별 전체 내역), 빠진 주문 / 상태만 맞춤
+    return ArchiveCompactor(get_order_store(), get_order_archive(), interval=ARCHIVE_INTERVAL,
+                            grace=ARCHIVE_GRACE, on_archived=get_customer_shards().record_archived).start()
+
+def iter_order_history():
+    """보관된 주문 + 저장소 주문 전체 (대체로 오래된 순). 집계 재계산/내보내기용"""
+    return itertools.chain(get_order_archive().iter_orders(), get_order_store().iter_orders())
+
+def get_orders(order_nums):
+    """주문번호로 찾기 (저장소 먼저, 없으면 보관소)"""
+    found = {order.order_num: order for order in get_order_store().get_many(order_nums)}
+    missing = [n for n in order_nums if n not in found]
+    if missing:
+        found.update((order.order_num, order) for order in get_order_archive().get_many(missing))
+    return [found[n] for n in order_nums if n in found]
+
+@st.cache_resource
+def get_sales_rollup():
+    # 매출 집계 표가 비어 있으면 (처음 켤 때) 기존 주문 이력으로 한 번 채움
+    rollup = SalesRollup(ANALYTICS_DB)
+    if get_order_store().count() or get_order_archive().count():
+        rollup.rebuild(iter_order_history(), only_if_empty=True)
+    return rollup
+
+@st.cache_resource
+def get_search_index():
+    # 색인 파일이 없으면 (처음 켤 때) 기존 주문 이력으로 한 번 만듦
+    index = SearchIndex(SEARCH_INDEX)
+    if get_order_store().count() or get_order_archive().count():
+        index.build(iter_order_history())
+    return index
+
+@st.cache_resource
+def get_customer_shards():
+    # 샤드가 비어 있으면 (처음 켤 때) 기존 주문 이력을 고객별로 한 번 나눠 담음.
+    # 이미 있으면 저장소 주문만 다시 맞춰 봄 (샤드 쓰기가 실패했던 주문 채우기. 저장소에는
+    # 배송 중 / 최근 주문만 있어 금방 끝나고, 보관소로 옮겨지는 주문은 정리 때 맞춤).
+    # 예전 버전이 보관하며 비워 둔 본문은 처음 한 번 보관소에서 되살림
+    shards = CustomerShards(CUSTOMER_SHARDS, shard_count=CUSTOMER_SHARD_COUNT, workers=SHARD_FANOUT_WORKERS,
+                            fsync=ORDER_FSYNC)
+    if shards.is_empty():
+        if get_order_store().count() or get_order_archive().count():
+            shards.backfill(iter_order_history())
+        shards.restore_bodies(())  # 비운 본문이 있을 수 없음
+    else:
+        shards.restore_bodies(get_order_archive().iter_orders())
+        shards.backfill(get_order_store().iter_orders())
+    return shards
+
+@st.cache_resource
+def get_order_id_generator():
+    return OrderIdGenerator()
+
+def _save(orders, retry):
+    # retry: 주문 처리가 저장 뒤 오류로 다시 실행된 경우라 이미 저장소에 있는 주문번호는
+    # 건너뜀. 처음 저장하는 주문은 방금 만든 주문번호라 찾아보지 않음 (JSONL 저장소의
+    # get_many 는 로그 전체를 읽음). 고객 샤드는 중복을 스스로 건너뛰므로 매번 넣어,
+    # 지난번에 샤드 쓰기만 실패했어도 채워짐
+    store = get_order_store()
+    new = orders
+    if retry:
+        saved = {order.order_num for order in store.get_many([order.order_num for order in orders])}
+        new = [order for order in orders if order.order_num not in saved]
+    if new:
+        store.append_many(new)
+        get_sales_rollup().record_orders(new)
+        get_search_index().add(new)
+    get_customer_shards().append_many(orders)
+
+def save_order(order, retry=False):
+    with metrics.timer("save_order_seconds", batch="single"):
+        _save([Order.from_dict(order)], retry)
+
+def save_orders(orders, retry=False):
+    # 묶음 주문: 저장소 쓰기 한 번 (SQLite 한 트랜잭션 / JSONL write 한 번)
+    with metrics.timer("save_order_seconds", batch="cart"):
+        _save([Order.from_dict(order) for order in orders], retry)
+
+# ==========================================
+# 주문 내역 (페이지 단위 조회)
+# ==========================================
+def history_rows(orders):
+    # 주문일은 epoch 초로 저장되어 있어 문자열을 파싱하지 않음
+    rows = []
+    for order in orders:
+        order_time = datetime.fromtimestamp(order.ts)
+        rows.append((order, order_time, order_time + timedelta(hours=3)))
+    return rows
+
+@st.cache_data(max_entries=256)
+def load_customer_page(customer, customer_version, page_size, cursor):
+    # 고객 버전(이 고객의 주문 추가 / 배송 완료 때 증가)이 캐시 키라서 다른 고객의
+    # 주문은 캐시를 깨지 않고, 읽는 양도 이 고객 샤드의 한 페이지뿐
+    with metrics.timer("history_page_load_seconds", scope="customer"):
+        orders, next_cursor = get_customer_shards().page(customer, page_size, cursor)
+        return history_rows(orders), next_cursor
+
+def search_customer_page(customer, query, page_size, cursor):
+    # 이 고객의 주문만 훑음 (비용은 고객 주문 수에 비례)
+    with metrics.timer("history_search_seconds", scope="customer"):
+        orders, next_cursor = get_customer_shards().search(customer, query, page_size, cursor)
+        return history_rows(orders), next_cursor
+
+def load_all_customers_page(page_size, cursor):
+    # 운영자용 전체 주문: 샤드마다 최신 page_size 건을 병렬로 읽어 주문일순으로 합침
+    with metrics.timer("history_page_load_seconds", scope="all"):
+        orders, next_cursor = get_customer_shards().recent(page_size, cursor)
+        return history_rows(orders), next_cursor
+
+def search_history_page(query, page_size, cursor):
+    # 운영자용 전체 검색: 색인에서 주문번호만 찾고 (최신순) 해당 주문만 저장소에서 꺼냄
+    with metrics.timer("history_search_seconds", scope="all"):
+        order_nums, next_cursor = get_search_index().search(query, page_size, cursor)
+        return history_rows(get_orders(order_nums)), next_cursor
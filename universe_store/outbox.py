@@ -0,0 +1,187 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+from .telegram_client import PermanentTelegramError
+
+# ==========================================
+# 텔레그램 발송 대기열 (outbox)
+# ==========================================
+# 주문 처리 스레드는 메시지를 SQLite 대기열에 넣기만 하고 바로 돌아간다.
+# 백그라운드 워커가 대기열을 순서대로 비우며 (접수 → 배송 시작 → 영수증
+# 순서 유지), 실패하면 지수 백오프로 다시 시도한다. 대기열이 파일에
+# 남아 있으므로 서버를 재시작해도 보내지 못한 메시지는 이어서 발송된다.
+# 다시 보내도 성공할 수 없는 메시지(PermanentTelegramError)는 바로 dead 로 돌리고
+# 다음 메시지로 넘어가, 한 통 때문에 대기열 전체가 멈추지 않는다.
+#
+# 같은 대기열 파일을 여러 프로세스(Streamlit 서버 여러 개)가 비울 수 있으므로,
+# 보내기 전에 조건부 UPDATE (pending -> sending, owner = 이 워커) 로 행을 가져오고
+# 실제로 가져온 행만 보낸다. 보내다가 프로세스가 죽어 sending 으로 남은 행은
+# claim_timeout 초 뒤 다시 pending 으로 돌린다 (그 경우에만 두 번 갈 수 있음).
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload     TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    next_try_at REAL NOT NULL,
+    created_at  REAL NOT NULL,
+    last_error  TEXT,
+    state       TEXT NOT NULL DEFAULT 'pending',
+    coalesce_key TEXT,
+    owner       TEXT,
+    claimed_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(state, next_try_at);
+"""
+
+
+class Outbox:
+    def __init__(self, path, send, max_attempts=8, base_delay=1.0, max_delay=300.0, poll_interval=1.0,
+                 claim_timeout=300.0):
+        """send(payload) 는 실패 시 예외를 던지는 실제 발송 함수"""
+        self.path = path
+        self.send = send
+        self.owner = uuid.uuid4().hex  # 이 워커가 가져간 행 표시
+        self.claim_timeout = claim_timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for column, kind in (("coalesce_key", "TEXT"), ("owner", "TEXT"), ("claimed_at", "REAL")):
+                if column not in columns:  # 이전 버전에서 만든 대기열
+                    conn.execute(f"ALTER TABLE outbox ADD COLUMN {column} {kind}")
+        self._worker = None
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- 생산자 ----------
+    def enqueue(self, payload, key=None):
+        """key: 같은 key 의 메시지는 DigestOutbox 가 한 덩어리로 합친다 (보통 주문번호)"""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO outbox (payload, next_try_at, created_at, coalesce_key) VALUES (?, ?, ?, ?)",
+                (json.dumps(payload, ensure_ascii=False), now, now, key),
+            )
+        self._wakeup.set()
+
+    def pending_count(self):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM outbox WHERE state IN ('pending', 'sending')"
+        ).fetchone()[0]
+
+    # ---------- 워커 ----------
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except sqlite3.Error:
+                pass
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def drain(self, limit=50):
+        """대기열 앞에서부터 순서대로 보낸다. 실패하거나 재시도 시각 전이면 이번 회차는 멈춘다
+        (다른 프로세스가 먼저 가져간 행을 만나도 멈춤: 순서를 지키려고 그쪽이 이어서 보냄)"""
+        conn = self._conn()
+        self._reclaim_stale()
+        rows = conn.execute(
+            "SELECT id, payload, attempts, next_try_at FROM outbox "
+            "WHERE state = 'pending' ORDER BY id LIMIT ?",
+            (limit,),
+        ).fetchall()
+        sent = 0
+        now = time.time()
+        for row_id, payload, attempts, next_try_at in rows:
+            if self._stop.is_set() or next_try_at > now or not self._claim([row_id], now):
+                break
+            try:
+                self.send(json.loads(payload))
+            except PermanentTelegramError as e:
+                self._mark_dead(row_id, attempts + 1, e)
+                continue
+            except Exception as e:
+                self._retry_later(row_id, attempts + 1, e)
+                break
+            with conn:
+                conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+            sent += 1
+        return sent
+
+    def _claim(self, row_ids, now):
+        """row_ids 를 모두 이 워커 몫으로 표시한다 (한 트랜잭션). 이미 다른 워커가 가져갔거나
+        재시도 시각 전인 행이 하나라도 있으면 아무것도 표시하지 않고 False"""
+        conn = self._conn()
+        with conn:
+            cur = conn.executemany(
+                "UPDATE outbox SET state = 'sending', owner = ?, claimed_at = ? "
+                "WHERE id = ? AND state = 'pending' AND next_try_at <= ?",
+                [(self.owner, now, row_id, now) for row_id in row_ids])
+            if cur.rowcount != len(row_ids):
+                conn.rollback()
+                return False
+        return True
+
+    def _release(self, row_ids):
+        """가져갔지만 보내지 않은 행을 대기열로 되돌린다 (보낸 / 실패 처리한 행은 그대로)"""
+        conn = self._conn()
+        with conn:
+            conn.executemany("UPDATE outbox SET state = 'pending', owner = NULL "
+                             "WHERE id = ? AND owner = ? AND state = 'sending'",
+                             [(row_id, self.owner) for row_id in row_ids])
+
+    def _reclaim_stale(self):
+        # 보내다가 죽은 워커가 남긴 행
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE outbox SET state = 'pending', owner = NULL "
+                         "WHERE state = 'sending' AND claimed_at < ?", (time.time() - self.claim_timeout,))
+
+    def _mark_dead(self, row_id, attempts, error):
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE outbox SET attempts = ?, last_error = ?, state = 'dead', owner = NULL WHERE id = ?",
+                         (attempts, str(error)[:500], row_id))
+
+    def _retry_later(self, row_id, attempts, error):
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        delay *= random.uniform(0.8, 1.2)
+        state = "dead" if attempts >= self.max_attempts else "pending"
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_try_at = ?, last_error = ?, state = ?, owner = NULL "
+                "WHERE id = ?",
+                (attempts, time.time() + delay, str(error)[:500], state, row_id),
+            )
@@ -0,0 +1,131 @@
+import streamlit as st
+
+from universe_store import metrics
+from universe_store.checkout_flow import get_admission
+from universe_store.export import available_formats, export_bytes, guess_format, import_orders, read_orders
+from universe_store.notifier import get_delivery_scheduler, get_outbox, get_telegram_client
+from universe_store.orders import (get_archive_compactor, get_customer_shards, get_order_archive, get_order_store,
+                                   get_sales_rollup, get_search_index, iter_order_history)
+from universe_store.ui import is_admin
+
+# ==========================================
+# 운영 지표 페이지 (숨김)
+# ==========================================
+def render_admin_page():
+    st.title("🛠️ 운영 지표")
+    
+    telegram_stats = get_telegram_client().snapshot()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("텔레그램 대기열", get_outbox().pending_count())
+    col2.metric("텔레그램 서킷", telegram_stats['circuit'], f"오류 {telegram_stats['errors']}")
+    col3.metric("배송 완료 대기", get_delivery_scheduler().pending_count())
+    
+    st.subheader("🚦 주문 처리 입장 제한")
+    admission_stats = get_admission().snapshot()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("진행 중", f"{admission_stats['active']} / {admission_stats['max_active']}",
+                f"입장 {admission_stats['admitted']}")
+    col2.metric("대기 중", f"{admission_stats['waiting']} / {admission_stats['max_queue']}",
+                f"대기 진입 {admission_stats['queued']}")
+    col3.metric("거절", admission_stats['rejected'], f"만료 {admission_stats['expired']}")
+    col4.metric("연타 제한", admission_stats['rate_limited'])
+    
+    st.subheader("⏱️ 구간별 소요 시간")
+    histograms, counters = metrics.REGISTRY.snapshot()
+    st.dataframe([
+        {
+            "지표": name,
+            "라벨": ", ".join(f"{k}={v}" for k, v in labels),
+            "횟수": count,
+            "평균(ms)": round(total / count * 1000, 2) if count else 0,
+            "p50≤(ms)": p50 * 1000,
+            "p95≤(ms)": p95 * 1000,
+            "p99≤(ms)": p99 * 1000,
+        }
+        for (name, labels), (count, total, p50, p95, p99) in sorted(histograms.items())
+    ], use_container_width=True)
+    
+    st.subheader("🔢 카운터")
+    counter_rows = [{"지표": name, "라벨": ", ".join(f"{k}={v}" for k, v in labels), "값": str(value)}
+                    for (name, labels), value in sorted(counters.items())]
+    counter_rows += [{"지표": f"telegram_{k}", "라벨": "", "값": str(v)} for k, v in telegram_stats.items()]
+    outbox = get_outbox()
+    if hasattr(outbox, "snapshot"):  # digest 모드: 알림 수 대비 실제 API 호출 수
+        counter_rows += [{"지표": f"telegram_digest_{k}", "라벨": "", "값": str(v)}
+                         for k, v in outbox.snapshot().items()]
+    st.dataframe(counter_rows, use_container_width=True)
+    
+    st.subheader("📄 Prometheus")
+    prometheus_text = metrics.REGISTRY.render_prometheus()
+    st.download_button("metrics.txt 내려받기", prometheus_text, file_name="metrics.txt", mime="text/plain")
+    with st.expander("텍스트 보기"):
+        st.code(prometheus_text, language="text")
+    
+    st.subheader("📤 주문 내보내기 / 가져오기")
+    export_format = st.selectbox("형식", available_formats(), key="export_format")
+    # 누를 때만 저장소를 묶음 단위로 읽어 만듦 (파일 전체가 메모리에 올라옴. 큰 내보내기는 CLI 로)
+    st.download_button(f"orders.{export_format} 내려받기",
+                       lambda: export_bytes(iter_order_history(), export_format),
+                       file_name=f"orders.{export_format}", on_click="ignore")
+    uploaded = st.file_uploader("백필 파일 가져오기", type=available_formats())
+    if uploaded is not None and st.button("📥 가져오기"):
+        try:
+            count, skipped = import_orders(read_orders(uploaded, guess_format(uploaded.name)),
+                                           get_order_store(), get_sales_rollup(), get_search_index().path,
+                                           shards=get_customer_shards())
+        except ValueError as e:
+            st.error(f"가져오기 실패: {e}")
+        else:
+            get_delivery_scheduler().load_pending()  # 가져온 배송 중 주문도 완료 예약
+            st.success(f"{count:,}건을 가져왔습니다." + (f" (이미 있는 주문 {skipped:,}건 건너뜀)" if skipped else ""))
+    
+    st.subheader("🗄️ 주문 보관소")
+    archive_stats = get_order_archive().stats()
+    compactor = get_archive_compactor()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("저장소 주문", get_order_store().count(), "배송 중 + 최근 완료")
+    col2.metric("보관 주문", archive_stats['orders'], f"세그먼트 {archive_stats['segments']}개")
+    col3.metric("보관 용량", f"{archive_stats['bytes'] / 1e6:.1f}MB", f"{archive_stats['ratio']:.1f}배 압축")
+    col4.metric("정리 실행", compactor.stats['runs'], f"오류 {compactor.stats['errors']}")
+    st.caption(f"마지막 정리: {compactor.stats['last_run'] or '-'} · 지금까지 {compactor.stats['moved']:,}건 보관")
+    if st.button("🧹 지금 정리"):
+        st.success(f"{compactor.run_now():,}건을 보관소로 옮겼습니다.")
+    
+    st.subheader("👥 고객별 주문 샤드")
+    shards = get_customer_shards()
+    shard_stats = shards.stats()  # 샤드마다 스레드 하나씩 병렬로 읽음
+    col1, col2, col3 = st.columns(3)
+    col1.metric("고객", shards.customer_count(), f"샤드 {shards.shard_count}개")
+    col2.metric("샤드 주문", sum(s['orders'] for s in shard_stats),
+                f"배송 중 {sum(s['shipping'] for s in shard_stats):,}")
+    col3.metric("샤드 용량", f"{sum(s['bytes'] for s in shard_stats) / 1e6:.1f}MB",
+                f"최대 샤드 {max(s['orders'] for s in shard_stats):,}건")
+    with st.expander("샤드별 / 주문 많은 고객"):
+        st.dataframe([{"샤드": s['shard'], "고객": s['customers'], "주문": s['orders'],
+                       "배송 중": s['shipping'], "용량(KB)": round(s['bytes'] / 1024)} for s in shard_stats], use_container_width=True)
+        st.dataframe([{"고객": customer, "주문": orders} for customer, orders in shards.top_customers()],
+                     use_container_width=True)
+    
+    st.subheader("🔬 샘플링 프로파일러")
+    profiler = metrics.PROFILER
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("⏹️ 중지" if profiler.running else "▶️ 시작", use_container_width=True):
+            if profiler.running:
+                profiler.stop()
+            else:
+                profiler.start()
+            st.rerun()
+    with col2:
+        if st.button("🧹 초기화", use_container_width=True):
+            profiler.clear()
+    with col3:
+        st.download_button("collapsed stacks", profiler.collapsed(), file_name="profile.txt",
+                           use_container_width=True)
+    st.caption(f"{'실행 중' if profiler.running else '꺼짐'} · 샘플 {profiler.total}개")
+    if profiler.total:
+        st.dataframe([{"위치": where, "샘플": n, "비율": f"{n / profiler.total:.1%}"}
+                      for where, n in profiler.top_functions()], use_container_width=True)
+
+if is_admin():
+    render_admin_page()
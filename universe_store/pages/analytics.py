@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from universe_store.analytics import SalesCube
+from universe_store.catalog import format_krw
+from universe_store.orders import get_sales_rollup, iter_order_history
+from universe_store.sales_rollup import order_hour
+from universe_store.ui import is_admin
+
+# ==========================================
+# 매출 분석 페이지 (숨김)
+# ==========================================
+# 주문 이력이 아니라 시간 x 상품 집계 표만 읽으므로 주문이 아무리 쌓여도
+# 화면을 그리는 비용은 고른 기간의 길이에만 비례한다.
+RANGES = {
+    "최근 24시간": (1, 1),
+    "최근 7일": (7, 24),
+    "최근 30일": (30, 24),
+    "전체": (None, 24),
+}
+
+@st.cache_resource
+def get_sales_cube():
+    return SalesCube(get_sales_rollup())
+
+def hour_label(hour, bucket_hours):
+    start = datetime(1970, 1, 1) + timedelta(hours=hour)
+    return start.strftime("%m-%d %H시" if bucket_hours == 1 else "%Y-%m-%d")
+
+def render_analytics_page():
+    st.title("📊 매출 분석")
+    
+    cube = get_sales_cube()
+    span = cube.span()
+    if span is None:
+        st.info("아직 집계할 주문이 없습니다.")
+        return
+    
+    range_name = st.radio("기간", list(RANGES), horizontal=True)
+    days, bucket_hours = RANGES[range_name]
+    now_hour = order_hour(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    if bucket_hours == 1:
+        start_hour, end_hour = now_hour - 23, now_hour + 1
+    else:
+        end_hour = (now_hour // 24 + 1) * 24
+        start_hour = (span[0] // 24) * 24 if days is None else end_hour - days * 24
+    summary = cube.summary(start_hour, end_hour, bucket_hours)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("주문 수", f"{summary['orders']:,}")
+    col2.metric("매출", format_krw(summary['revenue']))
+    col3.metric("배송 중", f"{summary['pending']:,}")
+    col4.metric("배송 완료", f"{summary['delivered']:,}")
+    
+    st.subheader("💰 상품별 매출")
+    by_item = sorted(summary['by_item'].items(), key=lambda kv: kv[1][1], reverse=True)
+    if by_item:
+        st.bar_chart({"상품": [name for name, _ in by_item], "매출": [won for _, (_, won) in by_item]},
+                     x="상품", y="매출", horizontal=True)
+        st.dataframe([{"상품": name, "주문 수": n, "매출": format_krw(won)} for name, (n, won) in by_item],
+                     use_container_width=True)
+    
+    st.subheader("🕒 시간별 주문 수" if bucket_hours == 1 else "📅 일별 주문 수")
+    st.bar_chart({
+        "시각": [hour_label(hour, bucket_hours) for hour, _, _ in summary['series']],
+        "주문 수": [n for _, n, _ in summary['series']],
+    }, x="시각", y="주문 수")
+    
+    stats = cube.snapshot()
+    st.caption(f"집계 행 {stats['rows']:,}개 · 상품 {stats['items']}종 · "
+               f"갱신 {stats['incremental']}회 · 재적재 {stats['reloads']}회")
+    if st.button("🔄 주문 이력으로 다시 집계"):
+        get_sales_rollup().rebuild(iter_order_history())
+        st.rerun()
+
+if is_admin():
+    render_analytics_page()
@@ -0,0 +1,95 @@
+import time
+
+import streamlit as st
+
+from universe_store.catalog import format_krw
+from universe_store.checkout import advance
+from universe_store.shop import clear_cart, get_cart, remove_from_cart
+from universe_store.ui import timed_region
+
+# ==========================================
+# 장바구니 페이지
+# ==========================================
+@st.fragment
+@timed_region
+def render_cart_contents():
+    cart = get_cart()
+    
+    if not cart.items:
+        st.info("장바구니가 비어 있습니다. 상품을 담아주세요! 🛒")
+        return
+    
+    st.markdown(f"**장바구니 상품: {len(cart)}개**")
+    st.markdown("---")
+    
+    for idx, item in enumerate(cart.items):
+        col1, col2, col3 = st.columns([3, 2, 1])
+        
+        with col1:
+            st.markdown(f"### {item['product']}")
+            st.caption(f"담은 시간: {item['date_added']}")
+        
+        with col2:
+            st.markdown(f"**가격:** {item['price_display']}")
+        
+        with col3:
+            st.button("🗑️ 삭제", key=f"remove_{idx}", on_click=remove_from_cart, args=(idx,))
+        
+        st.markdown("---")
+    
+    cart_totals = cart.totals
+    st.markdown(f"### 💰 총 금액: {cart_totals.total_display}")
+    for product_name, quantity in cart_totals.quantities.items():
+        st.caption(f"{product_name} × {quantity} = {format_krw(cart_totals.sums[product_name])}")
+    st.info("우주 배송은 무료입니다! ✨")
+    
+    st.subheader("🚚 배송 정보")
+    address = st.text_input("🏠 받으실 곳", placeholder=" ", key="cart_address")
+    delivery_request = st.text_input("📝 배송요청사항", placeholder=" ", key="cart_delivery_request")
+    receiver_state = st.selectbox("💫 현재 마음 상태",
+                                 ["이미 받은 안도감", "감사하는 마음", "이미 완료", "평온한 확신"],
+                                 key="cart_receiver_state")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("🗑️ 장바구니 비우기", use_container_width=True, on_click=clear_cart)
+    
+    with col2:
+        if st.button("🎊 전체 주문하기", type="primary", use_container_width=True):
+            if not address:
+                st.error("❌ 배송지를 입력해주세요!")
+            else:
+                order_input = {
+                    "items": list(cart.items),
+                    "address": address,
+                    "delivery_request": delivery_request if delivery_request else "없음",
+                    "state": receiver_state,
+                }
+                # 상품 수와 관계없이 주문 처리 연출은 한 번만
+                from universe_store.checkout_flow import request_checkout
+                if request_checkout('cart_checkout', order_input):
+                    st.rerun()
+
+st.title("🛍️ 장바구니")
+
+cart_checkout = st.session_state.get('cart_checkout')
+
+if cart_checkout is not None:
+    # 주문 처리 모듈(저장소, 텔레그램)은 실제로 주문할 때만 불러옴
+    from universe_store.checkout_flow import (admission_waiter, checkout_runner, finalize_cart_checkout,
+                                              render_cart_order_complete)
+    
+    advance(cart_checkout, time.time())
+    if cart_checkout['phase'] == 'queued':
+        admission_waiter('cart_checkout')
+    elif cart_checkout['phase'] == 'running':
+        checkout_runner('cart_checkout')
+    else:
+        if cart_checkout['phase'] == 'done':
+            finalize_cart_checkout(cart_checkout)
+        render_cart_order_complete(cart_checkout)
+        if st.button("🛒 계속 쇼핑하기"):
+            del st.session_state.cart_checkout
+            st.rerun()
+else:
+    render_cart_contents()
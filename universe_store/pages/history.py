@@ -0,0 +1,180 @@
+from datetime import datetime
+
+import streamlit as st
+
+from universe_store.customer_shards import LEGACY_CUSTOMER
+from universe_store.delivery_scheduler import STATUS_DELIVERED
+from universe_store.orders import (get_customer_shards, load_all_customers_page, load_customer_page,
+                                   search_customer_page, search_history_page)
+from universe_store.settings import HISTORY_PAGE_SIZES, TRACKER_TICK
+from universe_store.shop import get_customer_key
+from universe_store.ui import is_admin, timed_region
+
+# ==========================================
+# 주문 내역 페이지
+# ==========================================
+def reset_history_pages():
+    st.session_state.history_cursors = [None]
+
+def toggle_history_order(order_num):
+    key = f"history_open_{order_num}"
+    st.session_state[key] = not st.session_state.get(key, False)
+
+def delivery_status(order_time, delivery_time, current_time):
+    if current_time >= delivery_time:
+        return 100, f"✨ 타임라인 배송 완료 ({delivery_time.strftime('%Y-%m-%d %H:%M')})"
+    elapsed = (current_time - order_time).total_seconds()
+    total = (delivery_time - order_time).total_seconds()
+    return int((elapsed / total) * 100), "🚀 배송 중"
+
+def render_order_detail(order, delivery_time, current_time, progress):
+    st.markdown(f"""
+    ### 📋 주문 상세 정보
+    
+    **주문번호:** {order['order_num']}  
+    **상품명:** {order['item']}  
+    **배송지:** {order.get('address', '-')}  
+    **배송요청사항:** {order.get('delivery_request', '없음')}  
+    **마음 상태:** {order.get('state', '-')}  
+    **결제 금액:** {order['price']}  
+    **주문일:** {order['date']}  
+    
+    ---
+    
+    ### 🚀 배송 진행 상황
+    """)
+    
+    # 배송 단계 진행바
+    st.progress(progress)
+    
+    # 배송 단계
+    delivery_stages = [
+        ("✅ 주문 접수 완료", True),
+        ("✅ 우주 창고 출발", progress >= 20),
+        ("✅ 양자 터널 통과", progress >= 40),
+        ("✅ 현실화 프로세스", progress >= 60),
+        ("✅ 타임라인 배송 완료", progress >= 100)
+    ]
+    
+    for stage, completed in delivery_stages:
+        if completed:
+            st.success(stage)
+        else:
+            st.info(stage)
+    
+    if progress < 100:
+        remaining_time = delivery_time - current_time
+        hours = int(remaining_time.total_seconds() // 3600)
+        minutes = int((remaining_time.total_seconds() % 3600) // 60)
+        st.warning(f"⏰ 예상 배송 완료까지: {hours}시간 {minutes}분")
+    else:
+        st.success("🎉 배송이 완료되었습니다!")
+        
+        if order.get('status') == STATUS_DELIVERED:
+            st.caption("📨 배송 완료 알림이 텔레그램으로 발송되었습니다.")
+
+def render_order_row(idx, order, order_time, delivery_time, current_time, live=False):
+    progress, status_text = delivery_status(order_time, delivery_time, current_time)
+    is_open = st.session_state.get(f"history_open_{order['order_num']}", False)
+    
+    # 목록에는 요약만, 진행바/단계 위젯은 펼친 주문만 그림
+    with st.container(border=True):
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(f"📦 **{order['item']}** - {status_text}")
+            if live and not is_open:
+                st.progress(progress)
+        with col2:
+            st.button("접기" if is_open else "상세 보기", key=f"open_{idx}",
+                      on_click=toggle_history_order, args=(order['order_num'],),
+                      use_container_width=True)
+        if is_open:
+            render_order_detail(order, delivery_time, current_time, progress)
+
+@st.fragment
+@timed_region
+def render_history_row(idx, order, order_time, delivery_time):
+    render_order_row(idx, order, order_time, delivery_time, datetime.now())
+
+@st.fragment(run_every=TRACKER_TICK)
+@timed_region
+def live_tracker(rows):
+    # 배송 중인 주문만 TRACKER_TICK 마다 다시 그림. 배송 완료 주문은 아래 목록에
+    # 한 번 그려진 뒤 그대로 있으므로, 갱신 비용은 배송 중인 주문 수에만 비례
+    current_time = datetime.now()
+    if any(delivery_time <= current_time for _, _, _, delivery_time in rows):
+        st.rerun()  # 배송이 끝난 주문을 완료 목록으로 옮김 (주문마다 한 번)
+    st.caption(f"🛰️ 배송 중인 주문 {len(rows)}건 · {TRACKER_TICK}초마다 자동 갱신")
+    for idx, order, order_time, delivery_time in rows:
+        render_order_row(idx, order, order_time, delivery_time, current_time, live=True)
+
+st.title("📦 주문 내역")
+
+# 보고 있는 고객의 샤드만 읽는다. 운영자는 전체 고객 주문을 볼 수 있음
+shards = get_customer_shards()
+customer = get_customer_key()
+all_customers = is_admin() and st.toggle("🛠️ 전체 고객 주문 보기", key='history_all_customers',
+                                         on_change=reset_history_pages)
+# 고객 구분 전에 들어온 주문은 주인을 알 수 없어 예전처럼 누구나 볼 수 있게 따로 보여 줌
+legacy_orders = 0 if all_customers else shards.count(LEGACY_CUSTOMER)
+if legacy_orders and st.toggle(f"🗂️ 예전 주문 보기 (고객 구분 전 {legacy_orders}건)", key='history_legacy',
+                               on_change=reset_history_pages):
+    customer = LEGACY_CUSTOMER
+if all_customers:
+    total_orders = sum(s['orders'] for s in shards.stats())
+else:
+    total_orders = shards.count(customer)
+
+if not total_orders:
+    st.info("아직 주문 내역이 없습니다. 첫 주문을 시작해보세요! 🛒")
+else:
+    st.markdown(f"**총 {total_orders}개의 주문**")
+    
+    if 'history_cursors' not in st.session_state:
+        st.session_state.history_cursors = [None]
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        query = st.text_input("🔍 주문 검색", placeholder="상품명, 배송지, 배송요청사항, 주문번호",
+                              key='history_query', on_change=reset_history_pages)
+    with col2:
+        page_size = st.selectbox("페이지당 주문 수", HISTORY_PAGE_SIZES,
+                                 key='history_page_size', on_change=reset_history_pages)
+    live = st.toggle("🛰️ 실시간 배송 추적", value=True, key='history_live')
+    cursors = st.session_state.history_cursors
+    if all_customers:
+        if query.strip():
+            rows, next_cursor = search_history_page(query, page_size, cursors[-1])
+        else:
+            rows, next_cursor = load_all_customers_page(page_size, cursors[-1])
+    elif query.strip():
+        rows, next_cursor = search_customer_page(customer, query, page_size, cursors[-1])
+    else:
+        rows, next_cursor = load_customer_page(customer, shards.version(customer), page_size, cursors[-1])
+    
+    st.markdown("---")
+    
+    if query.strip() and not rows:
+        st.info("검색 결과가 없습니다.")
+    
+    current_time = datetime.now()
+    in_flight = [(idx, order, order_time, delivery_time)
+                 for idx, (order, order_time, delivery_time) in enumerate(rows)
+                 if live and delivery_time > current_time]
+    if in_flight:
+        live_tracker(in_flight)
+    tracked = {idx for idx, _, _, _ in in_flight}
+    for idx, (order, order_time, delivery_time) in enumerate(rows):
+        if idx not in tracked:
+            render_history_row(idx, order, order_time, delivery_time)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ 이전", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"{len(cursors)} 페이지")
+    with col3:
+        if st.button("다음 ▶", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
@@ -0,0 +1,33 @@
+import streamlit as st
+
+from universe_store.shop import add_to_cart, get_catalog
+from universe_store.ui import timed_region
+
+# ==========================================
+# 홈 페이지
+# ==========================================
+@st.fragment
+@timed_region
+def render_product_card(idx, product):
+    st.markdown(product.card_html, unsafe_allow_html=True)
+    
+    if st.button(f"🛒 장바구니 담기", key=f"cart_{idx}", use_container_width=True):
+        add_to_cart(product)
+        st.success(f"✅ 장바구니에 추가되었습니다!")
+
+st.title("🌌 Universe Fulfillment Center")
+st.markdown("### ✨ 당신이 원하는 모든 것, 이미 준비되어 있습니다")
+
+st.info("💫 **오늘의 특가:** 모든 상품 우주 무료배송 | 🎁 첫 주문 고객 특별 선물")
+
+st.markdown("---")
+st.subheader("🔥 베스트셀러 Top 14")
+
+cols = st.columns(3)
+for idx, product in enumerate(list(get_catalog())[:14]):
+    with cols[idx % 3]:
+        render_product_card(idx, product)
+
+st.markdown("---")
+
+st.info("💡 **주문하려면 왼쪽 사이드바에서 '🛒 주문하기' 메뉴를 선택하세요!**")
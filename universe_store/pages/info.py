@@ -0,0 +1,34 @@
+import streamlit as st
+
+# ==========================================
+# 이용안내 페이지
+# ==========================================
+st.title("ℹ️ Universe Store 이용 안내")
+st.markdown("""
+## 🌌 Universe Store란?
+
+당신이 원하는 모든 것이 이미 우주 창고에 준비되어 있습니다.
+주문만 하면, 시공간을 초월한 배송이 시작됩니다.
+
+---
+
+## 📋 이용 방법
+
+1. **상품 선택:** 원하는 것을 명확하게 선택하세요
+2. **배송지 입력:** 현재의 당신 상태를 입력하세요
+3. **결제:** 이미 지불되어 있습니다 (확고한 믿음으로)
+4. **배송 대기:** 잊고 살아가세요. 자동으로 도착합니다
+
+---
+
+## 🚀 배송 정책
+
+- **배송 기간:** 이미 도착함
+- **배송 방식:** 양자 터널 직배송
+- **추적:** 믿음의 강도로 자동 업데이트
+- **환불:** 불가 (우주 법칙)
+
+---
+
+*"All is done. 이미 나의 것입니다."*
+""")
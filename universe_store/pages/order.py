@@ -0,0 +1,95 @@
+import time
+
+import streamlit as st
+
+from universe_store.checkout import advance
+from universe_store.shop import get_catalog
+
+# ==========================================
+# 주문 페이지
+# ==========================================
+CATALOG = get_catalog()
+
+st.title("🛒 주문하기")
+
+st.subheader("1️⃣ 상품 선택")
+selected_product = st.selectbox(
+    "원하는 상품을 선택하세요",
+    CATALOG.names,
+    format_func=lambda x: CATALOG[x].label
+)
+
+if "직접 입력" in selected_product:
+    desired_item = st.text_input("🎯 원하는 것을 구체적으로 입력하세요", 
+                                 placeholder=" ")
+else:
+    desired_item = selected_product
+
+st.markdown("---")
+
+st.subheader("2️⃣ 배송 정보")
+address = st.text_input("🏠 받으실 곳", 
+                       placeholder=" ")
+
+delivery_request = st.text_input("📝 배송요청사항", 
+                                placeholder=" ")
+
+receiver_state = st.selectbox("💫 현재 마음 상태", 
+                             ["이미 받은 안도감", "감사하는 마음", "이미 완료", "평온한 확신"])
+
+st.markdown("---")
+
+st.subheader("3️⃣ 결제 정보")
+payment_method = st.selectbox("💳 결제 수단", 
+                              ["KB국민카드(간편결제)", "포인트", "자동이체"])
+
+with st.expander("💳 카드 정보 입력 (보안 연결됨 🔒)"):
+    card_num = st.text_input("카드 번호", placeholder="1234-5678-9012-3456", max_chars=19)
+    col1, col2 = st.columns(2)
+    with col1:
+        expiry = st.text_input("유효기간 (MM/YY)", placeholder="12/28")
+    with col2:
+        cvv = st.text_input("CVV", type="password", placeholder="***", max_chars=3)
+
+price_display = CATALOG[selected_product].price_display
+st.info(f"💰 **결제 금액:** {price_display}")
+
+st.warning("⚠️ 이 주문은 취소할 수 없으며, 우주 법칙에 따라 반드시 배송됩니다.")
+
+st.markdown("---")
+agree = st.checkbox("위 내용을 확인했으며, 우주의 배송을 신뢰합니다 ✨")
+
+checkout_state = st.session_state.get('checkout')
+checkout_running = checkout_state is not None and checkout_state['phase'] in ('queued', 'running')
+
+if st.button("🎊 주문하기", type="primary", disabled=not agree or checkout_running, use_container_width=True):
+    if not desired_item or not address:
+        st.error("❌ 상품명과 배송지를 모두 입력해주세요!")
+    else:
+        order_input = {
+            "item": desired_item,
+            "address": address,
+            "delivery_request": delivery_request if delivery_request else "없음",
+            "state": receiver_state,
+            "payment_method": payment_method,
+            "price": price_display,
+            "price_krw": CATALOG[selected_product].price,
+        }
+        # 주문 처리 모듈(저장소, 텔레그램)은 실제로 주문할 때만 불러옴
+        from universe_store.checkout_flow import request_checkout
+        if request_checkout('checkout', order_input):
+            checkout_state = st.session_state.checkout
+
+if checkout_state is not None:
+    from universe_store.checkout_flow import (admission_waiter, checkout_runner, finalize_checkout,
+                                              render_order_complete)
+    
+    advance(checkout_state, time.time())
+    if checkout_state['phase'] == 'queued':
+        admission_waiter('checkout')
+    elif checkout_state['phase'] == 'running':
+        checkout_runner()
+    else:
+        if checkout_state['phase'] == 'done':
+            finalize_checkout(checkout_state)
+        render_order_complete(checkout_state)
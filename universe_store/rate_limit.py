@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+metrics.describe("checkout_admission_total", "주문 처리 입장 요청 결과별 횟수")
+
+# ==========================================
+# 토큰 버킷
+# ==========================================
+class TokenBucket:
+    """초당 rate 개씩 채워지고 capacity 개까지 모이는 토큰"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now=None):
+        """토큰 하나를 쓰려면 기다려야 하는 초 (0 이면 바로 쓸 수 있음)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            if now < self.blocked_until or self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def block(self, seconds, now=None):
+        """429 retry_after: 그동안 토큰을 주지 않고, 끝나면 한 통만 보낼 수 있게 한다"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.blocked_until = now + seconds
+            self.tokens = 1.0
+            self.updated = self.blocked_until
+
+
+# ==========================================
+# 주문 처리 입장 제한 (admission control)
+# ==========================================
+# 동시에 진행 중인 주문 처리(checkout)를 max_active 개로 묶는다. 자리가 없으면
+# 최대 max_queue 명까지 도착 순서대로 기다리게 하고, 대기열도 차면 거절한다.
+# 고객(세션)마다 토큰 버킷을 두어 "주문하기" 를 연달아 누르는 것도 막는다.
+#
+# 진행 중 / 대기 중인 티켓은 lease_ttl 초 안에 touch() / poll() 이 없으면 버린다
+# (주문 도중 창을 닫은 세션이 자리를 계속 차지하지 않게).
+
+ADMITTED = "admitted"
+QUEUED = "queued"
+REJECTED = "rejected"
+RATE_LIMITED = "rate_limited"
+EXPIRED = "expired"
+
+
+class AdmissionController:
+    def __init__(self, max_active, max_queue, session_rate, session_burst, lease_ttl=30.0, max_sessions=10000):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.lease_ttl = lease_ttl
+        self.max_sessions = max_sessions
+        self._active = {}  # ticket -> 마지막 touch 시각
+        self._queue = OrderedDict()  # ticket -> 마지막 poll 시각 (도착 순서)
+        self._sessions = OrderedDict()  # session_key -> TokenBucket (LRU)
+        self._lock = threading.Lock()
+        self.stats = {ADMITTED: 0, QUEUED: 0, REJECTED: 0, RATE_LIMITED: 0, EXPIRED: 0, "released": 0}
+
+    def _count(self, result, amount=1):
+        self.stats[result] += amount
+        metrics.inc("checkout_admission_total", amount, result=result)
+
+    def _session_bucket(self, session_key):
+        bucket = self._sessions.get(session_key)
+        if bucket is None:
+            bucket = self._sessions[session_key] = TokenBucket(self.session_rate, self.session_burst)
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_key)
+        return bucket
+
+    def _maintain(self, now):
+        """오래 소식 없는 티켓을 버리고, 빈 자리에 대기열 앞사람을 들인다"""
+        deadline = now - self.lease_ttl
+        expired = [t for t, seen in self._active.items() if seen < deadline]
+        expired += [t for t, seen in self._queue.items() if seen < deadline]
+        for ticket in expired:
+            self._active.pop(ticket, None)
+            self._queue.pop(ticket, None)
+        if expired:
+            self._count(EXPIRED, len(expired))
+        while self._queue and len(self._active) < self.max_active:
+            ticket, _ = self._queue.popitem(last=False)
+            self._active[ticket] = now  # 차례가 된 시각부터 lease 시작
+            self._count(ADMITTED)
+
+    def _position(self, ticket):
+        for i, queued in enumerate(self._queue):
+            if queued == ticket:
+                return i + 1
+        return 0
+
+    def acquire(self, ticket, session_key, now=None):
+        """"주문하기" 를 눌렀을 때. (결과, 값) 을 돌려준다.
+        ADMITTED: 바로 시작 · QUEUED: 값은 대기 순번 · REJECTED: 값은 대기 인원
+        RATE_LIMITED: 값은 다시 누를 수 있을 때까지 남은 초"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if ticket in self._active:
+                return ADMITTED, 0
+            if ticket in self._queue:
+                return QUEUED, self._position(ticket)
+            bucket = self._session_bucket(session_key)
+            if not bucket.take(now):  # 거절된 요청도 토큰을 쓴다 (연타 방지)
+                self._count(RATE_LIMITED)
+                return RATE_LIMITED, bucket.wait_time(now)
+            self._maintain(now)
+            if not self._queue and len(self._active) < self.max_active:
+                self._active[ticket] = now
+                self._count(ADMITTED)
+                return ADMITTED, 0
+            if len(self._queue) < self.max_queue:
+                self._queue[ticket] = now
+                self._count(QUEUED)
+                return QUEUED, len(self._queue)
+            self._count(REJECTED)
+            return REJECTED, len(self._queue)
+
+    def poll(self, ticket, now=None):
+        """대기 중인 티켓의 상태: (ADMITTED, 0) | (QUEUED, 순번) | (EXPIRED, 0)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if ticket in self._queue:
+                self._queue[ticket] = now
+            self._maintain(now)
+            if ticket in self._active:
+                self._active[ticket] = now
+                return ADMITTED, 0
+            if ticket in self._queue:
+                return QUEUED, self._position(ticket)
+            return EXPIRED, 0
+
+    def touch(self, ticket, now=None):
+        """진행 중인 주문 처리가 아직 살아 있음을 알린다"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if ticket in self._active:
+                self._active[ticket] = now
+
+    def release(self, ticket, now=None):
+        """주문 처리가 끝났거나 대기를 취소함"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._active.pop(ticket, None) is not None:
+                self.stats["released"] += 1
+            self._queue.pop(ticket, None)
+            self._maintain(now)
+
+    def snapshot(self):
+        with self._lock:
+            self._maintain(time.monotonic())
+            stats = dict(self.stats)
+            stats.update(active=len(self._active), waiting=len(self._queue),
+                         max_active=self.max_active, max_queue=self.max_queue)
+        return stats
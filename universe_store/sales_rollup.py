@@ -0,0 +1,155 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from .delivery_scheduler import STATUS_DELIVERED
+from .order_record import Order
+
+# ==========================================
+# 매출 집계 테이블 (시간 x 상품)
+# ==========================================
+# 주문을 저장할 때마다 (주문 시각의 시간 단위, 상품) 칸의 주문 수/매출/배송
+# 완료 수를 더해 둔다. 배송 완료 전환도 같은 칸의 delivered 만 1 올린다.
+# 그래서 대시보드는 주문 이력이 아니라 이 표만 읽으면 되고, 표 크기는
+# 주문 수가 아니라 (영업 시간 수 x 상품 수) 에 비례한다.
+#
+# 칸이 바뀔 때마다 그 행의 rev 를 meta 의 version 으로 찍어 두므로 읽는 쪽은
+# rev > 마지막으로 본 version 인 행만 다시 읽으면 된다 (changed_since).
+# 전체 재집계(rebuild) 는 epoch 를 올려서 읽는 쪽이 처음부터 다시 읽게 한다.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales_hourly (
+    hour      INTEGER NOT NULL,
+    item      TEXT NOT NULL,
+    orders    INTEGER NOT NULL,
+    revenue   INTEGER NOT NULL,
+    delivered INTEGER NOT NULL,
+    rev       INTEGER NOT NULL,
+    PRIMARY KEY (hour, item)
+);
+CREATE INDEX IF NOT EXISTS idx_sales_hourly_rev ON sales_hourly(rev);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', 0);
+"""
+
+_UPSERT = (
+    "INSERT INTO sales_hourly (hour, item, orders, revenue, delivered, rev) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(hour, item) DO UPDATE SET orders = orders + excluded.orders, "
+    "revenue = revenue + excluded.revenue, delivered = delivered + excluded.delivered, rev = excluded.rev"
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def order_hour(date):
+    """주문일 문자열 -> 1970-01-01 부터 센 (현지 시각 기준) 시간 번호. hour // 24 가 날짜"""
+    return int((datetime.strptime(date, "%Y-%m-%d %H:%M:%S") - _EPOCH).total_seconds()) // 3600
+
+
+def ts_hour(ts):
+    """epoch 초 -> order_hour 와 같은 시간 번호 (문자열 파싱 없이)"""
+    return int((datetime.fromtimestamp(ts) - _EPOCH).total_seconds()) // 3600
+
+
+def order_price(order):
+    """원 단위 정수 가격. price_krw 가 없는 예전 주문만 가격 문자열을 읽는다"""
+    price = order.get("price_krw")
+    if price is None:
+        digits = re.sub(r"[^0-9]", "", order.get("price", ""))
+        price = int(digits) if digits else 0
+    return price
+
+
+class SalesRollup:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- 쓰기 ----------
+    def _apply(self, conn, cells):
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        conn.executemany(_UPSERT, [
+            (hour, item, orders, revenue, delivered, version)
+            for (hour, item), (orders, revenue, delivered) in cells.items()
+        ])
+
+    @staticmethod
+    def _cells(orders, delivered_only=False):
+        cells = {}
+        for order in orders:
+            # 저장소에서 읽은 주문은 Order, 배송 완료 알림은 {"date", "item"} dict
+            hour = ts_hour(order.ts) if isinstance(order, Order) else order_hour(order["date"])
+            key = (hour, order["item"])
+            n, revenue, delivered = cells.get(key, (0, 0, 0))
+            if delivered_only:
+                cells[key] = (n, revenue, delivered + 1)
+            else:
+                cells[key] = (n + 1, revenue + order_price(order),
+                              delivered + (order.get("status") == STATUS_DELIVERED))
+        return cells
+
+    def record_orders(self, orders):
+        """새로 저장한 주문을 더한다 (한 트랜잭션)"""
+        cells = self._cells(orders)
+        if cells:
+            conn = self._conn()
+            with conn:
+                self._apply(conn, cells)
+
+    def record_delivered(self, orders):
+        """배송 완료로 바뀐 주문 ({"date", "item"}) 을 delivered 에 더한다"""
+        cells = self._cells(orders, delivered_only=True)
+        if cells:
+            conn = self._conn()
+            with conn:
+                self._apply(conn, cells)
+
+    def rebuild(self, orders, batch_size=5000, only_if_empty=False):
+        """주문 이력 전체로 다시 집계. only_if_empty 면 표가 비어 있을 때만 (첫 실행)"""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if only_if_empty and conn.execute("SELECT 1 FROM sales_hourly LIMIT 1").fetchone():
+                return False
+            conn.execute("DELETE FROM sales_hourly")
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'epoch'")
+            batch = []
+            for order in orders:
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    self._apply(conn, self._cells(batch))
+                    batch = []
+            if batch:
+                self._apply(conn, self._cells(batch))
+        return True
+
+    # ---------- 읽기 ----------
+    def version(self):
+        """(epoch, version). epoch 이 바뀌면 처음부터, version 만 바뀌면 바뀐 행만 읽으면 된다"""
+        rows = dict(self._conn().execute("SELECT key, value FROM meta WHERE key IN ('epoch', 'version')"))
+        return rows["epoch"], rows["version"]
+
+    def changed_since(self, version):
+        """rev > version 인 행: (hour, item, orders, revenue, delivered)"""
+        return self._conn().execute(
+            "SELECT hour, item, orders, revenue, delivered FROM sales_hourly WHERE rev > ? ORDER BY hour",
+            (version,),
+        ).fetchall()
@@ -0,0 +1,207 @@
+import json
+import os
+import pickle
+import threading
+import unicodedata
+from array import array
+
+# ==========================================
+# 주문 검색 색인 (글자 2-gram 역색인)
+# ==========================================
+# 한글은 띄어쓰기 단위가 길고 조사가 붙어서 단어 단위 색인으로는 "우주구"로
+# "우주구청" 을 못 찾는다. 그래서 상품명/배송지/배송요청사항/주문번호를 소문자,
+# NFKC 정규화한 뒤 공백으로 자른 조각마다 연속한 두 글자(2-gram)를 색인한다.
+#
+# 색인 파일(.search)은 {"order_num", "text"} 줄을 덧붙이기만 하는 로그이고,
+# 줄 순서가 곧 문서 번호다. 여러 프로세스가 같이 써도 각자 파일 끝에서부터
+# 이어 읽으므로 문서 번호가 프로세스마다 같다. 시작할 때 로그 전체를 다시
+# 토큰화하지 않도록 snapshot_every 건마다 색인 전체를 .snap 파일로 저장한다.
+#
+# 문서 번호는 저장 순서라서 posting 목록은 항상 오름차순이다. 검색은 검색어
+# 2-gram 들의 posting 교집합을 구한 뒤 최신 문서부터 원문에 검색어가 그대로
+# 들어 있는지 확인해서 (2-gram 이 흩어져 있는 경우를 거름) limit 개를 채운다.
+
+FIELDS = ("item", "address", "delivery_request", "order_num")
+SEARCH_WINDOW = 4096  # 첫 검색 구간 (문서 수). 모자라면 4배씩 넓힘
+
+
+def normalize(text):
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def bigrams(text):
+    keys = set()
+    for token in text.split():
+        for i in range(len(token) - 1):
+            keys.add(token[i:i + 2])
+    return keys
+
+
+def order_text(order):
+    return normalize(" ".join(str(order.get(field) or "") for field in FIELDS))
+
+
+def _doc_lines(orders):
+    return "".join(
+        json.dumps({"order_num": o["order_num"], "text": order_text(o)}, ensure_ascii=False) + "\n"
+        for o in orders
+    ).encode("utf-8")
+
+
+def append_docs(path, orders):
+    """색인 로그에 한 번의 write 로 덧붙이기만 한다 (메모리에 색인을 올리지 않는 CLI 가져오기용)"""
+    with open(path, "ab") as f:
+        f.write(_doc_lines(orders))
+
+
+class SearchIndex:
+    def __init__(self, path, snapshot_every=10000):
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self.order_nums = []
+        self.texts = []
+        self.postings = {}
+        self._offset = 0
+        self._snapshot_docs = 0
+        self._load_snapshot()
+        self.refresh()
+
+    # ---------- 쓰기 ----------
+    def add(self, orders):
+        """새 주문을 색인 로그에 덧붙인다 (메모리 반영은 refresh 에서 로그 순서대로)"""
+        append_docs(self.path, orders)
+        self.refresh()
+
+    def build(self, orders, batch_size=5000):
+        """색인 로그가 아직 없을 때만 기존 주문 이력으로 만든다 (다른 프로세스와 경쟁해도 한 번만)"""
+        if os.path.exists(self.path):
+            return False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            batch = []
+            for order in orders:
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    f.write(_doc_lines(batch))
+                    batch = []
+            f.write(_doc_lines(batch))
+        try:
+            os.link(tmp_path, self.path)  # 이미 있으면 실패 -> 먼저 만든 쪽을 씀
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+        self.refresh()
+        return True
+
+    # ---------- 로그 읽기 ----------
+    def refresh(self):
+        """다른 세션/프로세스가 덧붙인 색인 줄을 이어서 읽는다"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size <= self._offset:
+            return
+        with self._lock:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    doc = json.loads(line)
+                    self._index(doc["order_num"], doc["text"])
+                    self._offset += len(line)
+            if len(self.order_nums) - self._snapshot_docs >= self.snapshot_every:
+                self._save_snapshot()
+
+    def _index(self, order_num, text):
+        doc_id = len(self.order_nums)
+        self.order_nums.append(order_num)
+        self.texts.append(text)
+        postings = self.postings
+        for key in bigrams(text):
+            posting = postings.get(key)
+            if posting is None:
+                posting = postings[key] = array("I")
+            posting.append(doc_id)
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        log_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if snapshot["offset"] > log_size:
+            return  # 로그를 새로 만들었으면 버림
+        self.order_nums = snapshot["order_nums"]
+        self.texts = snapshot["texts"]
+        self.postings = snapshot["postings"]
+        self._offset = snapshot["offset"]
+        self._snapshot_docs = len(self.order_nums)
+
+    def _save_snapshot(self):
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "offset": self._offset, "order_nums": self.order_nums,
+                "texts": self.texts, "postings": self.postings,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_docs = len(self.order_nums)
+
+    # ---------- 검색 ----------
+    def __len__(self):
+        return len(self.order_nums)
+
+    def search(self, query, limit=20, before=None):
+        """검색어의 모든 조각이 들어 있는 주문번호를 최신순으로 limit 개.
+        before 는 직전 페이지가 돌려준 커서 (문서 번호). (주문번호 목록, 다음 커서) 를 돌려준다"""
+        self.refresh()
+        terms = normalize(query).split()
+        if not terms:
+            return [], None
+        keys = set()
+        for term in terms:
+            keys.update(bigrams(term))
+        with self._lock:
+            end = len(self.order_nums) if before is None else before
+            lists = None
+            if keys:
+                lists = sorted((self.postings.get(key) for key in keys), key=lambda p: len(p or ()))
+                if not lists[0]:
+                    return [], None
+            # 최신 문서 구간부터 교집합을 구하고, 결과가 모자라면 구간을 넓혀 더 오래된 쪽으로
+            results = []
+            window = SEARCH_WINDOW
+            while end > 0:
+                start = max(0, end - window)
+                candidates = _intersect(lists, start, end) if lists else range(start, end)
+                for pos in range(len(candidates) - 1, -1, -1):
+                    doc_id = int(candidates[pos])
+                    text = self.texts[doc_id]
+                    if all(term in text for term in terms):
+                        results.append(self.order_nums[doc_id])
+                        if len(results) == limit:
+                            return results, (doc_id if doc_id > 0 else None)
+                end = start
+                window *= 4
+            return results, None
+
+
+def _intersect(lists, start, end):
+    """길이 순으로 정렬한 posting 들의 교집합 중 [start, end) 문서 번호 (오름차순 배열).
+    array 버퍼를 복사 없이 NumPy 로 보고, 가장 짧은 목록부터 searchsorted 로 거른다.
+    버퍼를 보는 배열은 이 함수 안에서만 쓰므로 호출하는 쪽 잠금 안에서 끝난다"""
+    import numpy as np
+
+    first = np.frombuffer(lists[0], dtype=f"u{lists[0].itemsize}")
+    lo, hi = np.searchsorted(first, [start, end])
+    candidates = first[lo:hi].copy()
+    for posting in lists[1:]:
+        if not len(candidates):
+            break
+        other = np.frombuffer(posting, dtype=f"u{posting.itemsize}")
+        pos = np.minimum(np.searchsorted(other, candidates), len(other) - 1)
+        candidates = candidates[other[pos] == candidates]
+    return candidates
@@ -0,0 +1,42 @@
+import os
+
+import streamlit as st
+
+# ==========================================
+# 사용자 설정
+# ==========================================
+# 프로세스당 한 번만 읽는다 (모듈은 첫 import 때만 실행). secrets.toml 을
+# 바꿨으면 앱을 다시 시작해야 반영된다.
+TELEGRAM_TOKEN = st.secrets["TELEGRAM_TOKEN"]
+CHAT_ID = st.secrets["CHAT_ID"]
+TELEGRAM_API_URL = st.secrets.get("TELEGRAM_API_URL")  # 비우면 api.telegram.org, 부하 테스트 시 로컬 스텁 주소
+ORDERS_FILE = "orders_history.json"
+ORDERS_LOG = "orders_history.jsonl"
+ORDERS_DB = "orders_history.db"
+ORDER_BACKEND = st.secrets.get("ORDER_BACKEND", "sqlite")  # "sqlite" | "jsonl"
+ORDER_FSYNC = st.secrets.get("ORDER_FSYNC", True)  # 주문 저장마다 디스크에 확정 (끄면 빠르지만 전원 장애 시 유실 가능)
+GROUP_COMMIT_MS = 0  # 동시에 들어온 주문을 fsync 한 번으로 묶을 때 리더가 더 기다리는 시간 (None: 묶지 않음)
+SEARCH_INDEX = (ORDERS_LOG if ORDER_BACKEND == "jsonl" else ORDERS_DB) + ".search"  # 저장소 옆에 둠
+ORDERS_ARCHIVE = "orders_archive"  # 배송 완료 주문 압축 세그먼트 디렉터리
+ARCHIVE_INTERVAL = 600  # 보관소 정리 주기 (초)
+ARCHIVE_GRACE = 3600  # 배송 완료 후 저장소에 더 두는 시간 (초)
+CUSTOMER_SHARDS = "orders_by_customer"  # 고객별 주문 샤드 디렉터리 (주문 내역 페이지용)
+CUSTOMER_SHARD_COUNT = 16  # 샤드 파일 수 (이미 배정된 고객은 바꿔도 원래 샤드에 남음)
+SHARD_FANOUT_WORKERS = 8  # 운영자 조회 때 샤드를 동시에 읽는 스레드 수
+OUTBOX_DB = "telegram_outbox.db"
+TELEGRAM_DIGEST_WINDOW = st.secrets.get("TELEGRAM_DIGEST_WINDOW", 2.0)  # 알림을 모아 합쳐 보내는 시간 (초, 0: 한 통씩)
+CARTS_DB = "carts.db"
+ANALYTICS_DB = "sales_rollup.db"
+CART_TTL = 7 * 24 * 3600  # 장바구니 보관 기간 (초)
+CART_CACHE_SIZE = 1000  # 메모리에 올려 둘 장바구니 수
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+ADMIN_TOKEN = st.secrets.get("ADMIN_TOKEN", "")  # 비어 있으면 운영 지표 페이지 비활성
+CHECKOUT_PROFILE = st.secrets.get("CHECKOUT_PROFILE", "demo")  # "demo" | "fast" | "instant"
+CHECKOUT_TICK = 0.5  # 주문 처리 fragment 재실행 주기 (초)
+CHECKOUT_MAX_ACTIVE = st.secrets.get("CHECKOUT_MAX_ACTIVE", 50)  # 동시에 진행할 주문 처리 수 (넘치면 대기)
+CHECKOUT_MAX_QUEUE = st.secrets.get("CHECKOUT_MAX_QUEUE", 200)  # 대기열 길이 (차면 거절)
+CHECKOUT_SESSION_RATE = 1 / 20  # 고객당 "주문하기" 토큰 충전 속도 (초당)
+CHECKOUT_SESSION_BURST = 3  # 고객당 연달아 누를 수 있는 횟수
+CHECKOUT_LEASE_TTL = 30  # 소식 없는 진행/대기 세션의 자리를 비우기까지 (초)
+HISTORY_PAGE_SIZES = [10, 20, 50]
+TRACKER_TICK = 10  # 주문 내역 실시간 배송 추적 갱신 주기 (초)
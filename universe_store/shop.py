@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from .cart_store import CartStore
+from .catalog import CatalogLoader
+from .settings import CART_CACHE_SIZE, CART_TTL, CARTS_DB, CATALOG_FILE
+
+# ==========================================
+# 인기 상품 카탈로그
+# ==========================================
+@st.cache_resource
+def get_catalog_loader():
+    # catalog.json 이 바뀌면 다음 실행 때 자동으로 다시 읽음
+    return CatalogLoader(CATALOG_FILE)
+
+def get_catalog():
+    return get_catalog_loader().get()
+
+# ==========================================
+# 장바구니 (서버 저장)
+# ==========================================
+@st.cache_resource
+def get_cart_store():
+    return CartStore(CARTS_DB, ttl=CART_TTL, max_cached=CART_CACHE_SIZE)
+
+def get_customer_key():
+    # 로그인 사용자면 계정, 아니면 URL 에 남겨 둔 장바구니 토큰 (재접속해도 유지)
+    if 'customer_key' not in st.session_state:
+        if getattr(st.user, "is_logged_in", False):
+            st.session_state.customer_key = f"user:{st.user.email}"
+        else:
+            if 'cid' not in st.query_params:
+                st.query_params['cid'] = uuid.uuid4().hex
+            st.session_state.customer_key = f"cid:{st.query_params['cid']}"
+    elif st.session_state.customer_key.startswith("cid:") and 'cid' not in st.query_params:
+        # 페이지를 옮기면 query string 이 지워지므로 토큰을 다시 붙여 둠
+        st.query_params['cid'] = st.session_state.customer_key[4:]
+    return st.session_state.customer_key
+
+def get_cart():
+    return get_cart_store().get(get_customer_key())
+
+def add_to_cart(product):
+    cart = get_cart()
+    cart.add({
+        'product': product.name,
+        'price': product.price,
+        'price_display': product.price_display,
+        'date_added': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    })
+    get_cart_store().save(get_customer_key(), cart)
+
+def remove_from_cart(index):
+    cart = get_cart()
+    cart.remove(index)
+    get_cart_store().save(get_customer_key(), cart)
+
+def clear_cart():
+    cart = get_cart()
+    cart.clear()
+    get_cart_store().save(get_customer_key(), cart)
@@ -0,0 +1,172 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ==========================================
+# 텔레그램 HTTP 클라이언트
+# ==========================================
+# 프로세스 전체가 requests.Session 하나를 공유해 keep-alive 연결을 재사용하고
+# (매 메시지마다 TCP/TLS 핸드셰이크를 하지 않음), 모든 요청에 연결/읽기
+# 타임아웃을 건다. 연속 실패가 쌓이면 서킷 브레이커가 열려 일정 시간
+# 동안은 네트워크에 나가지 않고 바로 실패한다. 429(요청 한도 초과)는 장애가
+# 아니므로 서킷 실패로 세지 않고 retry_after 를 담은 RateLimitedError 로 알린다.
+# 그 밖의 4xx (마크다운 파싱 실패 400, 봇 차단 403 등)는 그 메시지를 다시 보내도
+# 성공할 수 없으므로 서킷 실패로 세지 않고 PermanentTelegramError 로 알린다
+# (outbox 는 재시도하지 않고 바로 버림). 401/404 는 토큰/주소 설정 문제라 모든
+# 메시지가 실패하므로 일반 실패로 둔다.
+
+TELEGRAM_API = "https://api.telegram.org"
+
+
+class TelegramError(Exception):
+    pass
+
+
+class CircuitOpenError(TelegramError):
+    pass
+
+
+class PermanentTelegramError(TelegramError):
+    """다시 보내도 성공할 수 없는 요청 (4xx)"""
+
+
+class RateLimitedError(TelegramError):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(resp.headers.get("Retry-After", 1))
+    except ValueError:
+        return 1.0
+
+
+def _is_permanent(status_code):
+    return 400 <= status_code < 500 and status_code not in (401, 404, 429)
+
+
+def _description(resp):
+    try:
+        return resp.json()["description"]
+    except (ValueError, KeyError, TypeError):
+        return resp.text[:200]
+
+
+class CircuitBreaker:
+    """closed → (연속 실패 failure_threshold 회) → open → (reset_timeout 후) half-open"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        # half-open 상태에서는 시험 요청 하나만 통과시키고 다시 타이머를 건다
+        with self._lock:
+            state = self.state
+            if state == "half-open":
+                self.opened_at = time.monotonic()
+                return True
+            return state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class TelegramClient:
+    def __init__(self, token, base_url=TELEGRAM_API, connect_timeout=3.0, read_timeout=10.0,
+                 pool_size=10, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self.stats = {
+            "sent": 0,
+            "errors": 0,
+            "rejected": 0,
+            "rate_limited": 0,
+            "invalid": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+        }
+
+    def send_message(self, payload):
+        """payload: sendMessage 파라미터 dict. 실패하면 TelegramError"""
+        return self.call("sendMessage", payload)
+
+    def call(self, method, payload):
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError("telegram circuit open")
+
+        url = f"{self.base_url}/bot{self.token}/{method}"
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(url, data=payload, timeout=self.timeout)
+            if resp.status_code != 429 and not _is_permanent(resp.status_code):
+                resp.raise_for_status()
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            self._count("errors", time.perf_counter() - start)
+            raise TelegramError(str(e)) from e
+        if resp.status_code == 429:
+            self._count("rate_limited", time.perf_counter() - start)
+            retry_after = _retry_after(resp)
+            raise RateLimitedError(f"telegram rate limited (retry after {retry_after}s)", retry_after)
+        if _is_permanent(resp.status_code):
+            self.breaker.record_success()  # 서버는 정상 응답
+            self._count("invalid", time.perf_counter() - start)
+            raise PermanentTelegramError(f"{resp.status_code}: {_description(resp)}")
+
+        self.breaker.record_success()
+        self._count("sent", time.perf_counter() - start)
+        return resp.json()
+
+    def _count(self, key, latency=None):
+        with self._lock:
+            self.stats[key] += 1
+            if latency is not None:
+                self.stats["latency_total"] += latency
+                self.stats["latency_max"] = max(self.stats["latency_max"], latency)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+        calls = stats["sent"] + stats["errors"] + stats["rate_limited"] + stats["invalid"]
+        stats["latency_avg"] = stats["latency_total"] / calls if calls else 0.0
+        stats["circuit"] = self.breaker.state
+        return stats
+
+    def close(self):
+        self.session.close()
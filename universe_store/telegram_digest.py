@@ -0,0 +1,218 @@
+import json
+import time
+from collections import OrderedDict
+
+from .outbox import Outbox
+from .rate_limit import TokenBucket
+from .telegram_client import PermanentTelegramError, RateLimitedError
+
+# ==========================================
+# 텔레그램 알림 묶어 보내기 (digest)
+# ==========================================
+# 주문 한 건에 알림이 세 통(접수, 배송 시작, 영수증) 생기고 모두 같은 CHAT_ID 로
+# 가서, 주문이 몰리면 채팅방당 전송 한도(초당 1통, 그룹은 분당 20통)에 걸려
+# 429 가 난다. DigestOutbox 는 대기열의 메시지를 채팅방별로 모아, 같은 주문(key)
+# 의 메시지는 한 덩어리로, 여러 주문은 한 통의 digest 로 합쳐 보낸다. 합친
+# 메시지가 텔레그램 길이 제한(4096자)을 넘으면 줄 단위로 나눈다.
+#
+# 채팅방의 가장 오래된 메시지가 window 초를 기다렸으면 그 채팅방에 쌓인 메시지를
+# 모두 합쳐 보낸다. 보내는 속도는 채팅방별 / 봇 전체 토큰 버킷으로 맞추므로,
+# 토큰이 없는 동안 쌓인 메시지는 다음 토큰에 한 통으로 나간다 (부하가 클수록
+# 많이 묶임). 429 를 받으면 retry_after 동안 그 채팅방을 쉬었다가 보내고,
+# 재시도 횟수에는 세지 않는다. 그 밖의 이유로 합친 메시지가 실패하면 (사용자가
+# 입력한 _ * 때문에 마크다운 파싱 400 등) 담긴 메시지를 한 통씩 다시 보내서
+# 실패한 메시지만 재시도 / 폐기한다.
+#
+# 여러 프로세스가 같은 대기열을 비울 때는 채팅방마다 보낼 메시지 전체를 한 번에
+# 가져가고 (Outbox._claim), 못 가져가면 그 채팅방은 건너뛴다. 한 덩어리가 여러 통에
+# 걸치는 경우도 있어 통 단위가 아니라 채팅방 단위로 가져간다. 보내지 못하고 남은
+# 행은 회차가 끝날 때 되돌린다.
+
+MAX_MESSAGE_LENGTH = 4096
+GLOBAL_RATE = 30.0  # 봇 전체 초당 메시지
+
+
+def chat_rate_limit(chat_id):
+    """채팅방별 초당 메시지 한도 (음수 ID 는 그룹/채널: 분당 20통)"""
+    return 20 / 60 if str(chat_id).startswith("-") else 1.0
+
+
+def _split_lines(text, limit):
+    """limit 자를 넘는 덩어리를 줄 단위로 나눈다 (마크다운 굵게 표시가 줄 안에서 끝나므로)"""
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _digest_text(blocks):
+    if len(blocks) == 1:
+        return blocks[0]
+    return f"📬 **Universe Store 알림 {len(blocks)}건**\n\n" + "\n\n".join(blocks)
+
+
+def merge_messages(entries, max_length=MAX_MESSAGE_LENGTH):
+    """entries: [(key, text)] (보낸 순서). 보낼 메시지 [(text, 담긴 entry 번호 목록)] 를 돌려준다.
+    같은 key 의 메시지는 붙여서 한 덩어리, 덩어리들은 길이 제한 안에서 한 통으로 합친다.
+    덩어리가 여러 통에 걸치면 entry 번호는 마지막 통에 붙는다 (그 통까지 가야 보낸 것)"""
+    blocks = OrderedDict()
+    for i, (key, text) in enumerate(entries):
+        parts, indexes = blocks.setdefault(key if key is not None else ("", i), ([], []))
+        parts.append(text.strip())
+        indexes.append(i)
+
+    limit = max_length - 64  # digest 머리말 자리
+    messages, texts, ids, size = [], [], [], 0
+    for parts, indexes in blocks.values():
+        for chunk in _split_lines("\n\n".join(parts), limit):
+            if texts and size + len(chunk) + 2 > limit:
+                messages.append((_digest_text(texts), ids))
+                texts, ids, size = [], [], 0
+            texts.append(chunk)
+            size += len(chunk) + 2
+        ids.extend(indexes)
+    if texts:
+        messages.append((_digest_text(texts), ids))
+    return messages
+
+
+class DigestOutbox(Outbox):
+    def __init__(self, path, send, window=2.0, global_rate=GLOBAL_RATE, chat_burst=3,
+                 max_length=MAX_MESSAGE_LENGTH, chat_rate=chat_rate_limit, **kwargs):
+        """window: 채팅방의 첫 메시지를 보내기 전에 더 모으는 시간 (초).
+        chat_rate(chat_id): 채팅방별 초당 전송 한도"""
+        super().__init__(path, send, **kwargs)
+        self.window = window
+        self.max_length = max_length
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self._buckets = {}
+        self.poll_interval = min(self.poll_interval, max(window / 2, 0.05))
+        self.stats = {"messages": 0, "calls": 0, "rate_limited": 0}
+
+    def _bucket(self, chat_id):
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(self.chat_rate(chat_id), self.chat_burst)
+        return bucket
+
+    def drain(self, limit=1000):
+        """채팅방별로 모아 합쳐 보낸다. 보낸(대기열에서 지운) 메시지 수를 돌려준다"""
+        conn = self._conn()
+        self._reclaim_stale()
+        rows = conn.execute(
+            "SELECT id, payload, attempts, next_try_at, created_at, coalesce_key FROM outbox "
+            "WHERE state = 'pending' ORDER BY id LIMIT ?",
+            (limit,),
+        ).fetchall()
+        now = time.time()
+        chats = OrderedDict()
+        for row in rows:
+            payload = json.loads(row[1])
+            chats.setdefault(str(payload.get("chat_id")), []).append((row, payload))
+
+        sent = 0
+        for chat_id, entries in chats.items():
+            if self._stop.is_set():
+                break
+            if entries[0][0][4] > now - self.window:
+                continue  # 아직 모으는 중
+            due = []
+            for row, payload in entries:  # 재시도 시각 전인 메시지부터는 순서를 지키려고 다음 회차로
+                if row[3] > now:
+                    break
+                due.append((row, payload))
+            claimed = [row[0] for row, _ in due]
+            if not due or not self._claim(claimed, now):
+                continue  # 다른 프로세스가 이 채팅방을 보내는 중
+            try:
+                sent += self._send_chat(conn, chat_id, due)
+            finally:
+                self._release(claimed)
+        return sent
+
+    def _send_chat(self, conn, chat_id, due):
+        """가져온 채팅방 메시지를 합쳐 보낸다. 보낸(대기열에서 지운) 메시지 수를 돌려준다"""
+        sent = 0
+        bucket = self._bucket(chat_id)
+        for text, indexes in merge_messages([(row[5], p["text"]) for row, p in due], self.max_length):
+            if bucket.wait_time() > 0 or self.global_bucket.wait_time() > 0:
+                break  # 토큰이 찰 때까지 더 쌓임
+            bucket.take()
+            self.global_bucket.take()
+            merged = [due[i][0] for i in indexes]
+            payload = dict(due[indexes[0]][1] if indexes else due[0][1], text=text)
+            try:
+                self.send(payload)
+            except RateLimitedError as e:
+                bucket.block(e.retry_after)
+                self.stats["rate_limited"] += 1
+                break
+            except Exception as e:
+                if len(merged) > 1:
+                    count, ok = self._send_each(bucket, [due[i] for i in indexes])
+                    sent += count
+                    if ok:
+                        continue
+                elif merged:
+                    self._fail(merged[0], e)
+                break
+            with conn:
+                conn.executemany("DELETE FROM outbox WHERE id = ?", [(row[0],) for row in merged])
+            self.stats["calls"] += 1
+            self.stats["messages"] += len(merged)
+            sent += len(merged)
+        return sent
+
+    def _fail(self, row, error):
+        if isinstance(error, PermanentTelegramError):
+            self._mark_dead(row[0], row[2] + 1, error)
+        else:
+            self._retry_later(row[0], row[2] + 1, error)
+
+    def _send_each(self, bucket, entries):
+        """합친 메시지가 실패했을 때 한 통씩 다시 보낸다. 보낸 수와 이 채팅방을 계속
+        보내도 되는지를 돌려준다. 일시적 오류가 나면 그 메시지만 재시도로 돌리고 멈춘다
+        (남은 메시지는 시도하지 않았으므로 그대로 대기)"""
+        conn = self._conn()
+        sent = 0
+        for row, payload in entries:
+            if bucket.wait_time() > 0 or self.global_bucket.wait_time() > 0:
+                return sent, False
+            bucket.take()
+            self.global_bucket.take()
+            try:
+                self.send(payload)
+            except RateLimitedError as e:
+                bucket.block(e.retry_after)
+                self.stats["rate_limited"] += 1
+                return sent, False
+            except Exception as e:
+                self._fail(row, e)
+                if not isinstance(e, PermanentTelegramError):
+                    return sent, False
+                continue
+            with conn:
+                conn.execute("DELETE FROM outbox WHERE id = ?", (row[0],))
+            self.stats["calls"] += 1
+            self.stats["messages"] += 1
+            sent += 1
+        return sent, True
+
+    def snapshot(self):
+        stats = dict(self.stats)
+        stats["messages_per_call"] = stats["messages"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
@@ -0,0 +1,118 @@
+import functools
+import time
+
+import streamlit as st
+
+from . import metrics
+from .settings import ADMIN_TOKEN
+
+metrics.describe("script_run_seconds", "페이지 스크립트 한 번 실행에 걸린 시간")
+metrics.describe("fragment_run_seconds", "프래그먼트(region) 한 번 실행에 걸린 시간")
+
+# ==========================================
+# CSS 스타일링
+# ==========================================
+STYLE = """
+<style>
+    /* 우주 배경 이미지 */
+    .stApp {
+        background-image: url('https://images.unsplash.com/photo-1465101162946-4377e57745c3?q=80&w=1178&auto=format&fit=crop&ixlib=rb-4.1.0&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D');
+        background-size: cover;
+        background-position: center;
+        background-attachment: fixed;
+    }
+    
+    /* 가독성을 위한 반투명 오버레이 */
+    .stApp::before {
+        content: '';
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background: rgba(0, 0, 0, 0.7);
+        z-index: 0;
+    }
+    
+    /* 모든 콘텐츠를 오버레이 위로 */
+    .main > div {
+        position: relative;
+        z-index: 1;
+    }
+    
+    /* 사이드바 반투명 */
+    section[data-testid="stSidebar"] {
+        background-color: rgba(0, 0, 0, 1) !important;
+    }
+    
+    section[data-testid="stSidebar"] > div {
+        background-color: transparent !important;
+    }
+    
+    /* 베스트셀러 카드 - 반투명 */
+    .product-card {
+        background: rgba(102, 126, 234, 0.15);
+        backdrop-filter: blur(10px);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        padding: 12px;
+        border-radius: 10px;
+        margin: 8px 0;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+        transition: transform 0.3s;
+    }
+    .product-card:hover {
+        transform: translateY(-5px);
+        background: rgba(102, 126, 234, 0.25);
+    }
+    .product-card h3 {
+        font-size: 1.1rem;
+        margin-bottom: 8px;
+    }
+    .product-card p {
+        font-size: 0.85rem;
+        margin: 4px 0;
+    }
+    .order-number {
+        font-size: 24px;
+        font-weight: bold;
+        color: #FFD700;
+        text-align: center;
+        padding: 20px;
+        background: rgba(26, 26, 46, 0.7);
+        backdrop-filter: blur(10px);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        border-radius: 10px;
+        margin: 20px 0;
+    }
+</style>
+"""
+
+def inject_css():
+    st.markdown(STYLE, unsafe_allow_html=True)
+
+# ==========================================
+# 부분 재실행 영역 (fragment)
+# ==========================================
+# 버튼을 눌러도 앱 전체(CSS, 사이드바, 다른 카드)가 아니라 해당 영역만 다시 실행
+def timed_region(func):
+    # 영역별 마지막 실행 시간 기록 (benchmarks/bench_reruns.py 에서 비교용으로 읽음)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            st.session_state.setdefault('region_timings', {})[func.__name__] = elapsed
+            metrics.observe("fragment_run_seconds", elapsed, region=func.__name__)
+    return wrapper
+
+# ==========================================
+# 운영 지표 페이지 접근
+# ==========================================
+def is_admin():
+    # ?admin=<ADMIN_TOKEN> 으로 한 번 접속하면 세션 동안 메뉴에 보임
+    # (페이지를 옮기면 query string 이 지워짐)
+    if not st.session_state.get('is_admin'):
+        st.session_state.is_admin = bool(ADMIN_TOKEN) and st.query_params.get('admin') == ADMIN_TOKEN
+    return st.session_state.is_admin